@@ -3,85 +3,276 @@ Master Script - Run Complete ABG Motors Analysis Pipeline
 Executes all steps from data loading to final predictions
 """
 
+import argparse
 import sys
+from contextlib import nullcontext
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
+import compiled_scorer
+import cross_validation
+import data_cache
+import data_loader
+import date_parser
+import feature_config
+import feature_engineering
+import feature_store
+import hyper_extract
+import hyperparameter_search
+import indian_market_predictor
+import market_aggregates
+import model_backends
+import model_builder
+import model_registry
+import ods_stream
+import parallel_features
+import schema
+import storage
+import tableau_export
+import uncertainty
+import validation
 from data_loader import DataLoader
 from feature_engineering import FeatureEngineer
+from feature_store import FeatureStore
 from model_builder import ModelBuilder
 from indian_market_predictor import IndianMarketPredictor
-from tableau_export import prepare_japanese_tableau_data, prepare_indian_tableau_data, create_summary_statistics
+from pipeline_dag import PipelineDAG, Step
+from storage import DEFAULT_FORMAT, EXPORT_FORMAT, FORMATS, table_path, write_table
+from tableau_export import (prepare_japanese_tableau_data, prepare_indian_tableau_data,
+                            create_summary_statistics, create_market_cube)
 
 import pandas as pd
 
 
-def main():
-    """Run complete analysis pipeline"""
-    
+# Source modules behind each kind of step; editing one re-runs its steps
+LOAD_CODE = (data_loader, data_cache, ods_stream, schema, validation, storage)
+FEATURE_CODE = (feature_engineering, feature_config, date_parser, feature_store, parallel_features, storage)
+TRAIN_CODE = (model_builder, model_backends, hyperparameter_search, cross_validation,
+              model_registry, compiled_scorer)
+PREDICT_CODE = (indian_market_predictor, market_aggregates, uncertainty, model_registry,
+                model_backends, compiled_scorer, storage)
+TABLEAU_CODE = (tableau_export, storage, hyper_extract)
+
+MODEL_FILES = ('models/logistic_regression_model.pkl', 'models/feature_scaler.pkl',
+               'models/feature_names.txt', 'models/compiled_scorer.npz', 'models/model_backend.txt')
+
+
+def build_pipeline(use_feature_store=False, n_replicates=10000, n_bootstrap=0,
+                   storage_format=DEFAULT_FORMAT, export_csv=False, hyper=False, feature_workers=None,
+                   hyper_writer=None):
+    """
+    Declare the analysis as a DAG of steps with their inputs and outputs
+
+    Japanese and Indian loading and feature preparation are independent
+    branches, and the Japanese Tableau export only needs the Japanese
+    features, so it can run alongside training and prediction. Branches
+    run on threads; the ODS parses run in worker processes so the two
+    loads overlap.
+
+    Intermediate tables (raw, processed, predictions) are written in
+    storage_format; the Tableau feeds are the final export and stay CSV,
+    with typed Hyper extracts of them alongside when hyper is set, all
+    written through hyper_writer (one shared Hyper process) when given.
+
+    feature_workers > 1 builds each market's features in that many
+    processes (see parallel_features).
+
+    Returns:
+        List of pipeline_dag.Step
+    """
+    formats = tuple(dict.fromkeys((storage_format, EXPORT_FORMAT) if export_csv else (storage_format,)))
+
+    def intermediate(stem):
+        return tuple(str(table_path(f'data/processed/{stem}', fmt)) for fmt in formats)
+
+    tableau_formats = (EXPORT_FORMAT, 'hyper') if hyper else (EXPORT_FORMAT,)
+
+    def feed(name):
+        return tuple(f'data/tableau/{name}' + (hyper_extract.HYPER_SUFFIX if fmt == 'hyper' else FORMATS[fmt].suffix)
+                     for fmt in tableau_formats)
+
+    # One loader so both load steps share the ODS cache manifest; the ODS
+    # parsers hold the GIL, so each parse runs in a worker process to let
+    # the two load branches actually overlap
+    loader = DataLoader(data_dir='data/raw', parse_in_process=True)
+
+    def load_japanese():
+        japanese_df = loader.load_japanese_data()
+        for fmt in formats:
+            loader.save(datasets=('japanese',), fmt=fmt)
+        return japanese_df
+
+    def load_indian():
+        indian_df = loader.load_indian_data()
+        for fmt in formats:
+            loader.save(datasets=('indian',), fmt=fmt)
+        return indian_df
+
+    def feature_engineer(use_feature_store, feature_workers):
+        store = None
+        if use_feature_store and FeatureStore.is_available():
+            # Reuse features of unchanged rows from the previous run
+            store = FeatureStore('data/processed/feature_store')
+        return FeatureEngineer(feature_store=store, n_workers=feature_workers)
+
+    def japanese_features(load_japanese, use_feature_store, feature_workers):
+        japanese_processed = feature_engineer(use_feature_store, feature_workers).prepare_japanese_features(
+            load_japanese
+        )
+        for fmt in formats:
+            write_table(japanese_processed, 'data/processed/japanese_processed', fmt)
+        return japanese_processed
+
+    def indian_features(load_indian, use_feature_store, feature_workers):
+        indian_processed = feature_engineer(use_feature_store, feature_workers).prepare_indian_features(
+            load_indian
+        )
+        for fmt in formats:
+            write_table(indian_processed, 'data/processed/indian_processed', fmt)
+        return indian_processed
+
+    def train(japanese_features):
+        feature_columns = FeatureEngineer(verbose=False).get_model_features()
+        builder = ModelBuilder(random_state=42)
+        builder.prepare_data(japanese_features, feature_columns, target_column='PURCHASE', test_size=0.3)
+        builder.tune_hyperparameters()
+        metrics = builder.evaluate_model()
+        builder.cross_validate(cv=5)
+        coefficients = builder.get_coefficient_interpretation()
+        builder.save_model()
+        return {'builder': builder, 'metrics': metrics, 'coefficients': coefficients}
+
+    def predict(train, indian_features, n_replicates, n_bootstrap):
+        builder = train['builder']
+        predictor = IndianMarketPredictor(model_dir='models')
+        predictor.load_model()
+        predictions = predictor.predict_indian_market(indian_features)
+        assessment = predictor.assess_market_viability(target_sales=10000)
+        simulation = None
+        if n_replicates:
+            bootstrap = None
+            if n_bootstrap:
+                bootstrap = builder.bootstrap_probabilities(
+                    indian_features[builder.feature_names], n_bootstrap=n_bootstrap
+                )
+            simulation = predictor.simulate_sales(
+                target_sales=10000, n_replicates=n_replicates, bootstrap_probabilities=bootstrap
+            )
+        predictor.segment_analysis()
+        for fmt in formats:
+            predictor.save_predictions(fmt=fmt)
+        return {'predictions': predictions, 'assessment': assessment, 'simulation': simulation}
+
+    # Tableau exports take the frames in memory instead of re-reading the tables
+    def japanese_tableau(japanese_features):
+        return prepare_japanese_tableau_data(japanese_features, tableau_formats, hyper_writer)
+
+    def indian_tableau(predict):
+        return prepare_indian_tableau_data(predict['predictions'], tableau_formats, hyper_writer)
+
+    def summary(japanese_features, predict):
+        return create_summary_statistics(japanese_features, predict['predictions'], tableau_formats,
+                                         hyper_writer)
+
+    def market_cube(japanese_tableau, indian_tableau):
+        return create_market_cube(japanese_tableau, indian_tableau, tableau_formats, hyper_writer)
+
+    return [
+        Step('load_japanese', load_japanese, title='Loading Japanese dataset',
+             inputs=('data/raw/japan dataset.ods',), outputs=intermediate('japanese_raw'),
+             code=LOAD_CODE),
+        Step('load_indian', load_indian, title='Loading Indian dataset',
+             inputs=('data/raw/indian dataset.ods',), outputs=intermediate('indian_raw'),
+             code=LOAD_CODE),
+        Step('japanese_features', japanese_features, deps=('load_japanese',),
+             title='Japanese feature engineering', outputs=intermediate('japanese_processed'),
+             code=FEATURE_CODE,
+             params={'use_feature_store': use_feature_store, 'feature_workers': feature_workers}),
+        Step('indian_features', indian_features, deps=('load_indian',),
+             title='Indian feature engineering', outputs=intermediate('indian_processed'),
+             code=FEATURE_CODE,
+             params={'use_feature_store': use_feature_store, 'feature_workers': feature_workers}),
+        Step('japanese_tableau', japanese_tableau, deps=('japanese_features',),
+             title='Japanese Tableau export', outputs=feed('japanese_market'),
+             code=TABLEAU_CODE),
+        Step('train', train, deps=('japanese_features',), title='Model training',
+             outputs=MODEL_FILES, code=TRAIN_CODE),
+        # CURRENT is an input so a registry rollback re-runs prediction
+        Step('predict', predict, deps=('train', 'indian_features'),
+             title='Indian market prediction', inputs=('models/registry/CURRENT',),
+             outputs=intermediate('indian_predictions') + ('data/tableau/indian_market_predictions.csv',),
+             code=PREDICT_CODE + (model_builder,),
+             params={'n_replicates': n_replicates, 'n_bootstrap': n_bootstrap}),
+        Step('indian_tableau', indian_tableau, deps=('predict',),
+             title='Indian Tableau export', outputs=feed('indian_market'),
+             code=TABLEAU_CODE),
+        Step('summary', summary, deps=('japanese_features', 'predict'),
+             title='Market comparison summary', outputs=feed('market_comparison_summary'),
+             code=TABLEAU_CODE),
+        Step('market_cube', market_cube, deps=('japanese_tableau', 'indian_tableau'),
+             title='Pre-aggregated market cube', outputs=feed('market_cube'),
+             code=TABLEAU_CODE),
+    ]
+
+
+def main(use_feature_store=False, n_replicates=10000, n_bootstrap=0, force=False, n_workers=None,
+         storage_format=DEFAULT_FORMAT, export_csv=False, hyper=False, feature_workers=None):
+    """
+    Run complete analysis pipeline
+
+    Steps whose inputs, parameters and code are unchanged since the last
+    run are skipped and their results reused (see pipeline_dag.PipelineDAG).
+
+    Args:
+        use_feature_store: Reuse stored features for rows unchanged since the
+            previous run and only recompute the delta (requires pyarrow)
+        n_replicates: Monte Carlo replicates for the sales uncertainty (0 skips it)
+        n_bootstrap: Optional bootstrap refits feeding the simulation, adding
+            model uncertainty to the outcome uncertainty (0, the default,
+            uses the fitted model only)
+        force: Re-run every step even when its cached result is still valid
+        n_workers: Steps run concurrently (defaults to the CPU count)
+        storage_format: Format of the intermediate tables (see storage.FORMATS)
+        export_csv: Also write the intermediate tables as CSV
+        hyper: Also write the Tableau feeds as Hyper extracts (requires tableauhyperapi)
+        feature_workers: Processes per feature engineering step (None builds in-process)
+    """
+
     print("="*70)
     print(" " * 15 + "ABG MOTORS MARKET ENTRY ANALYSIS")
     print(" " * 20 + "COMPLETE PIPELINE EXECUTION")
     print("="*70)
-    
-    # Step 1: Load Data
-    print("\n" + "="*70)
-    print("STEP 1: LOADING DATASETS")
-    print("="*70)
-    loader = DataLoader(data_dir='data/raw')
-    japanese_df = loader.load_japanese_data()
-    indian_df = loader.load_indian_data()
-    loader.save_to_csv()
-    
-    # Step 2: Feature Engineering
-    print("\n" + "="*70)
-    print("STEP 2: FEATURE ENGINEERING")
-    print("="*70)
-    fe = FeatureEngineer()
-    japanese_processed = fe.prepare_japanese_features(japanese_df)
-    indian_processed = fe.prepare_indian_features(indian_df)
-    japanese_processed.to_csv('data/processed/japanese_processed.csv', index=False)
-    indian_processed.to_csv('data/processed/indian_processed.csv', index=False)
-    
-    # Step 3: Model Building
-    print("\n" + "="*70)
-    print("STEP 3: MODEL TRAINING")
-    print("="*70)
-    feature_columns = fe.get_model_features()
-    builder = ModelBuilder(random_state=42)
-    builder.prepare_data(japanese_processed, feature_columns, target_column='PURCHASE', test_size=0.3)
-    builder.tune_hyperparameters()
-    metrics = builder.evaluate_model()
-    builder.cross_validate(cv=5)
-    coefficients = builder.get_coefficient_interpretation()
-    builder.save_model()
-    
-    # Step 4: Indian Market Prediction
-    print("\n" + "="*70)
-    print("STEP 4: INDIAN MARKET PREDICTION")
-    print("="*70)
-    predictor = IndianMarketPredictor(model_dir='models')
-    predictor.load_model()
-    predictions = predictor.predict_indian_market(indian_processed)
-    assessment = predictor.assess_market_viability(target_sales=10000)
-    predictor.segment_analysis()
-    predictor.save_predictions()
-    
-    # Step 5: Tableau Export
-    print("\n" + "="*70)
-    print("STEP 5: TABLEAU DATA EXPORT")
-    print("="*70)
-    japanese_tableau = prepare_japanese_tableau_data()
-    indian_tableau = prepare_indian_tableau_data()
-    summary = create_summary_statistics()
-    
+
+    if hyper and not hyper_extract.is_available():
+        print("\n⚠ tableauhyperapi not installed - writing CSV Tableau feeds only")
+        hyper = False
+
+    # The Tableau steps share one Hyper process, started only if one of them runs
+    with hyper_extract.HyperExtractWriter() if hyper else nullcontext() as hyper_writer:
+        dag = PipelineDAG(
+            build_pipeline(use_feature_store, n_replicates, n_bootstrap, storage_format, export_csv, hyper,
+                           feature_workers, hyper_writer),
+            cache_dir='.pipeline_cache', n_workers=n_workers, force=force
+        )
+        results = dag.run()
+
+    japanese_df = results['load_japanese']
+    indian_df = results['load_indian']
+    metrics = results['train']['metrics']
+    coefficients = results['train']['coefficients']
+    predictions = results['predict']['predictions']
+    assessment = results['predict']['assessment']
+    simulation = results['predict']['simulation']
+
     # Final Summary
     print("\n" + "="*70)
     print(" " * 25 + "ANALYSIS COMPLETE!")
     print("="*70)
-    
+
+    dag.report()
+
     print("\n📊 KEY RESULTS:")
     print(f"  • Japanese Dataset: {len(japanese_df):,} customers, {japanese_df['PURCHASE'].sum():,} purchases ({japanese_df['PURCHASE'].mean():.1%})")
     print(f"  • Indian Dataset: {len(indian_df):,} customers")
@@ -89,25 +280,48 @@ def main():
     print(f"  • Predicted Indian Purchases: {assessment['predicted_purchases']:,}")
     print(f"  • Sales Target: {assessment['target_sales']:,}")
     print(f"  • Target Achievement: {(assessment['predicted_purchases']/assessment['target_sales']*100):.0f}%")
+    if simulation is not None:
+        low, high = simulation.interval(0.9)
+        print(f"  • Simulated Sales (90% interval): {low:,.0f} - {high:,.0f}, "
+              f"P(target met) {simulation.prob_target_met:.1%}")
     print(f"  • Recommendation: {assessment['recommendation']}")
-    
+
     print("\n📁 OUTPUT FILES:")
     print("  • Model: models/logistic_regression_model.pkl")
-    print("  • Predictions: data/processed/indian_predictions.csv")
-    print("  • Tableau Data: data/tableau/*.csv")
+    print(f"  • Predictions: {table_path('data/processed/indian_predictions', storage_format)}")
+    print("  • Tableau Data: data/tableau/*.csv" + (" (+ .hyper extracts)" if hyper else ""))
     print("  • Final Report: reports/final_report.md")
-    
+
     print("\n" + "="*70)
     print(" " * 15 + "✅ ALL DELIVERABLES COMPLETED!")
     print("="*70)
-    
+
     return {
         'metrics': metrics,
         'assessment': assessment,
         'coefficients': coefficients,
-        'predictions': predictions
+        'predictions': predictions,
+        'simulation': simulation
     }
 
 
 if __name__ == "__main__":
-    results = main()
+    parser = argparse.ArgumentParser(description='ABG Motors complete analysis pipeline')
+    parser.add_argument('--force', action='store_true', help='Re-run every step, ignoring the cache')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Pipeline steps to run concurrently (default: CPU count)')
+    parser.add_argument('--format', choices=tuple(FORMATS), default=DEFAULT_FORMAT,
+                        help=f'Storage format of the intermediate tables (default: {DEFAULT_FORMAT})')
+    parser.add_argument('--csv', action='store_true',
+                        help='Also export the intermediate tables as CSV')
+    parser.add_argument('--hyper', action='store_true',
+                        help='Also write the Tableau feeds as Hyper extracts (requires tableauhyperapi)')
+    parser.add_argument('--feature-workers', type=int, default=None,
+                        help='Build features in this many processes (default: in-process)')
+    parser.add_argument('--bootstrap', type=int, default=0, metavar='N',
+                        help='Bootstrap refits of the model feeding the sales simulation '
+                             '(default: 0, outcome uncertainty only)')
+    args = parser.parse_args()
+    results = main(force=args.force, n_workers=args.workers,
+                   storage_format=args.format, export_csv=args.csv, hyper=args.hyper,
+                   feature_workers=args.feature_workers, n_bootstrap=args.bootstrap)
@@ -0,0 +1,177 @@
+"""
+Chunked I/O Module for ABG Motors Market Entry Analysis
+Reads CSV/Parquet/Arrow tables in fixed-size chunks and writes results incrementally
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+from schema import apply_schema
+from storage import SUFFIXES, ContentHash, record_write
+
+
+# Feather v2 and Arrow IPC files (see storage.FORMATS)
+ARROW_SUFFIXES = ('.feather', '.arrow')
+
+
+def _string_columns(schema):
+    """Columns that must be read as text so IDs like '0001234567' stay strings"""
+    if not schema:
+        return None
+    return {column: str for column, dtype in schema.items()
+            if not (isinstance(dtype, str) and dtype.startswith('int'))}
+
+
+def table_columns(path):
+    """Column names of a CSV, Parquet or Feather/Arrow file, read from the header/footer only"""
+    path = Path(path)
+    if path.suffix == '.parquet':
+        import pyarrow.parquet as pq
+        return list(pq.read_schema(path).names)
+    if path.suffix in ARROW_SUFFIXES:
+        import pyarrow as pa
+        return list(pa.ipc.open_file(path).schema.names)
+    if path.suffix == '.csv':
+        return list(pd.read_csv(path, nrows=0).columns)
+    raise ValueError(f"Unsupported file type: {path}")
+
+
+def iter_table_chunks(path, chunk_size=100000, schema=None, columns=None):
+    """
+    Yield a CSV, Parquet or Feather/Arrow file as DataFrame chunks
+
+    Args:
+        path: .csv, .parquet, .feather or .arrow file
+        chunk_size: Rows per chunk
+        schema: Optional dtype schema applied to each chunk
+        columns: Optional subset of columns to read
+
+    Yields:
+        pd.DataFrame chunks with a continuous RangeIndex
+    """
+    path = Path(path)
+    offset = 0
+
+    if path.suffix == '.parquet':
+        import pyarrow.parquet as pq
+        batches = (batch.to_pandas() for batch in
+                   pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns))
+    elif path.suffix in ARROW_SUFFIXES:
+        batches = _arrow_batches(path, chunk_size, columns)
+    elif path.suffix == '.csv':
+        batches = pd.read_csv(path, chunksize=chunk_size, usecols=columns,
+                              dtype=_string_columns(schema))
+    else:
+        raise ValueError(f"Unsupported file type for chunked reading: {path}")
+
+    for chunk in batches:
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield apply_schema(chunk, schema) if schema else chunk
+
+
+def _arrow_batches(path, chunk_size, columns):
+    """Frames of at most chunk_size rows, sliced zero-copy from the IPC record batches"""
+    import pyarrow as pa
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if columns is not None:
+                batch = batch.select(columns)
+            for start in range(0, batch.num_rows, chunk_size):
+                yield batch.slice(start, chunk_size).to_pandas()
+
+
+def has_missing(path, column, chunk_size=100000):
+    """Whether column has any missing value, reading only that column in chunks"""
+    return any(chunk[column].isna().any() for chunk in
+               iter_table_chunks(path, chunk_size=chunk_size, columns=[column]))
+
+
+class ChunkWriter:
+    """
+    Append DataFrame chunks to a CSV or Parquet file
+
+    CSV chunks are written with the header only on the first chunk, which
+    gives the same bytes as a single to_csv of the concatenated frame.
+    Parquet chunks become row groups of one file. Column dtypes are pinned
+    on the first chunk (overridden by dtypes), so a column inferred as int64
+    in one chunk and float64 in another is written the same way throughout.
+    Output goes to a temporary file that replaces the destination on
+    close(), so a failed run never leaves a truncated result behind; the
+    write is then recorded like storage.write_table's.
+    """
+
+    def __init__(self, path, dtypes=None):
+        """
+        Args:
+            path: Output .csv or .parquet file
+            dtypes: Optional column -> dtype for columns whose dtype can vary
+                between chunks (e.g. float64 AGE_CAR when any date is missing)
+        """
+        self.path = Path(path)
+        if self.path.suffix not in ('.csv', '.parquet'):
+            raise ValueError(f"Unsupported output file type: {self.path}")
+        self.tmp_path = self.path.with_name(self.path.name + '.tmp')
+        self.rows_written = 0
+        self.dtypes = dict(dtypes or {})
+        self._parquet_writer = None
+        self._started = False
+        self._content = None
+
+    @property
+    def started(self):
+        """Whether anything (even an empty chunk) has been written"""
+        return self._started
+
+    def write(self, df):
+        if not self._started:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.tmp_path.unlink(missing_ok=True)
+            self.dtypes = {**df.dtypes.to_dict(), **self.dtypes}
+            self._content = ContentHash(df.columns)
+
+        casts = {column: dtype for column, dtype in self.dtypes.items()
+                 if column in df.columns and df[column].dtype != dtype}
+        if casts:
+            df = df.astype(casts)
+
+        if self.path.suffix == '.csv':
+            df.to_csv(self.tmp_path, mode='a', header=not self._started, index=False)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.tmp_path, table.schema)
+            self._parquet_writer.write_table(table)
+
+        self._content.update(df)
+        self._started = True
+        self.rows_written += len(df)
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        if self._started:
+            self.tmp_path.replace(self.path)
+            record_write(self.path, SUFFIXES[self.path.suffix], self._content.hexdigest())
+
+    def abort(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        self.tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
@@ -0,0 +1,164 @@
+"""
+Compiled Scorer Module for ABG Motors Market Entry Analysis
+Pure-NumPy logistic regression scoring with the scaler folded into the weights
+"""
+
+import hashlib
+from pathlib import Path
+
+import numpy as np
+
+
+COMPILED_SCORER_FILE = 'compiled_scorer.npz'
+
+
+def source_hash(paths):
+    """SHA-256 over the bytes of the pickled artifacts a scorer is compiled from"""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
+
+
+class CompiledScorer:
+    """
+    Single-matmul scorer for the StandardScaler + LogisticRegression model
+
+    StandardScaler computes (x - mean) / scale and the model computes
+    coef . z + intercept. Both are linear, so they fold into one weight
+    vector and bias:
+
+        w = coef / scale
+        b = intercept - sum(coef * mean / scale)
+
+    Scoring is then X @ w + b followed by a sigmoid; the label is derived
+    from the probability (p > 0.5, i.e. the same sign test sklearn uses on
+    the decision function). Loading and scoring only need NumPy.
+
+    The saved artifact records a content hash of the model and scaler pkl
+    files it was compiled from (source_hash), so load_current can tell a
+    retrained model from an up-to-date npz without trusting file mtimes.
+    """
+
+    def __init__(self, weights, bias, feature_names, classes=(0, 1), dtype='float64',
+                 source_hash=None):
+        self.dtype = np.dtype(dtype)
+        self.weights = np.asarray(weights, dtype=self.dtype)
+        self.bias = self.dtype.type(bias)
+        self.feature_names = list(feature_names)
+        self.classes = np.asarray(classes)
+        self.source_hash = source_hash
+
+    @classmethod
+    def compile(cls, model, scaler, feature_names, dtype='float64'):
+        """
+        Fold a fitted StandardScaler into a fitted binary LogisticRegression
+
+        Args:
+            model: Fitted sklearn LogisticRegression (binary)
+            scaler: Fitted sklearn StandardScaler, or None if unscaled
+            feature_names: Feature order used at training time
+            dtype: 'float64' or 'float32' scoring precision
+
+        Returns:
+            CompiledScorer
+        """
+        coef = np.asarray(model.coef_, dtype='float64')
+        if coef.shape[0] != 1:
+            raise ValueError("CompiledScorer only supports binary logistic regression")
+        coef = coef[0]
+        intercept = float(np.asarray(model.intercept_)[0])
+
+        mean = np.zeros_like(coef)
+        scale = np.ones_like(coef)
+        if scaler is not None:
+            if getattr(scaler, 'mean_', None) is not None:
+                mean = np.asarray(scaler.mean_, dtype='float64')
+            if getattr(scaler, 'scale_', None) is not None:
+                scale = np.asarray(scaler.scale_, dtype='float64')
+
+        weights = coef / scale
+        bias = intercept - np.dot(weights, mean)
+        return cls(weights, bias, feature_names, classes=model.classes_, dtype=dtype)
+
+    def astype(self, dtype):
+        """Return a copy scoring at a different precision (e.g. 'float32')"""
+        return CompiledScorer(self.weights, self.bias, self.feature_names, self.classes, dtype,
+                              source_hash=self.source_hash)
+
+    def decision_function(self, X):
+        X = np.asarray(X, dtype=self.dtype)
+        return X @ self.weights + self.bias
+
+    def predict_proba(self, X):
+        """Probability of the positive class for each row"""
+        z = self.decision_function(X)
+        # exp of a non-positive argument only, so large |z| never overflows
+        e = np.exp(-np.abs(z))
+        return np.where(z >= 0, 1 / (1 + e), e / (1 + e))
+
+    def predict(self, X, probabilities=None):
+        """Class labels derived from the probabilities (computed if not given)"""
+        if probabilities is None:
+            probabilities = self.predict_proba(X)
+        return self.classes[(probabilities > 0.5).astype(np.intp)]
+
+    def score(self, X):
+        """Return (labels, probabilities) from a single pass over X"""
+        probabilities = self.predict_proba(X)
+        return self.predict(None, probabilities), probabilities
+
+    def save(self, path, source_files=None):
+        """
+        Write the scorer to an .npz file
+
+        Args:
+            path: Output path
+            source_files: Model and scaler pkl files the scorer was compiled
+                from; their content hash is stored for load_current
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if source_files is not None:
+            self.source_hash = source_hash(source_files)
+        extra = {} if self.source_hash is None else {'source_hash': np.asarray(self.source_hash)}
+        np.savez(
+            path,
+            weights=self.weights.astype('float64'),
+            bias=np.float64(self.bias),
+            feature_names=np.asarray(self.feature_names),
+            classes=self.classes,
+            **extra,
+        )
+
+    @classmethod
+    def load(cls, path, dtype='float64'):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data['weights'], data['bias'].item(), data['feature_names'].tolist(),
+                classes=data['classes'], dtype=dtype,
+                source_hash=data['source_hash'].item() if 'source_hash' in data.files else None
+            )
+
+    @classmethod
+    def load_current(cls, path, source_files, dtype='float64'):
+        """
+        Load path unless the pkl files it was compiled from have changed
+
+        Args:
+            path: compiled_scorer.npz
+            source_files: Model and scaler pkl files next to it; when none of
+                them exist (an npz deployed on its own) the npz is trusted
+            dtype: Scoring precision
+
+        Returns:
+            CompiledScorer, or None when the npz records no hash or a hash
+            that does not match the pkl files (load those instead)
+        """
+        scorer = cls.load(path, dtype=dtype)
+        source_files = [Path(f) for f in source_files]
+        if not any(f.exists() for f in source_files):
+            return scorer
+        if all(f.exists() for f in source_files) and scorer.source_hash == source_hash(source_files):
+            return scorer
+        return None
@@ -0,0 +1,149 @@
+"""
+Data Cache Module for ABG Motors Market Entry Analysis
+Content-addressed columnar cache so raw ODS sheets are parsed only once
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+
+class DatasetCache:
+    """
+    Cache parsed ODS datasets as Parquet files under data/processed
+
+    Each source file is keyed on its size, modification time and SHA-256
+    content hash. Size and mtime are checked first so an unchanged sheet is
+    never re-hashed; when either changes the file is hashed again and the
+    cached copy is only reused if the content is identical.
+    """
+
+    CACHE_VERSION = 1
+    MANIFEST_NAME = 'manifest.json'
+
+    def __init__(self, cache_dir='data/processed/cache'):
+        self.cache_dir = Path(cache_dir)
+        self.manifest_path = self.cache_dir / self.MANIFEST_NAME
+        self.manifest = self._read_manifest()
+        # Datasets may be loaded concurrently (pipeline DAG branches)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_available():
+        """Parquet support requires pyarrow; the cache is skipped without it"""
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    @staticmethod
+    def file_hash(filepath, chunk_size=1 << 20):
+        """Compute the SHA-256 digest of a file in fixed-size chunks"""
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for block in iter(lambda: f.read(chunk_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def fingerprint(self, filepath):
+        """
+        Return the cache key fields for a source file
+
+        Args:
+            filepath: Path to the source ODS file
+
+        Returns:
+            dict with size, mtime_ns and sha256
+        """
+        filepath = Path(filepath)
+        stat = filepath.stat()
+        entry = self.manifest.get(self._source_key(filepath))
+
+        if (entry is not None
+                and entry['size'] == stat.st_size
+                and entry['mtime_ns'] == stat.st_mtime_ns):
+            sha256 = entry['sha256']
+        else:
+            sha256 = self.file_hash(filepath)
+
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha256}
+
+    def load(self, filepath, reader):
+        """
+        Load a dataset from cache, parsing the source only on a miss
+
+        Args:
+            filepath: Path to the source ODS file
+            reader: Callable taking the path and returning a DataFrame
+
+        Returns:
+            (DataFrame, bool) - the data and whether it came from cache
+        """
+        filepath = Path(filepath)
+        key = self._source_key(filepath)
+        fingerprint = self.fingerprint(filepath)
+        cache_file = self._cache_file(filepath, fingerprint['sha256'])
+
+        if cache_file.exists():
+            df = pd.read_parquet(cache_file)
+            # Refresh size/mtime so a touched-but-unchanged file skips hashing next time
+            self._record(key, fingerprint, cache_file)
+            return df, True
+
+        df = reader(filepath)
+        self._write(df, cache_file)
+        self._evict(key, keep=cache_file)
+        self._record(key, fingerprint, cache_file)
+        return df, False
+
+    def clear(self):
+        """Remove all cached datasets and the manifest"""
+        for entry in self.manifest.values():
+            (self.cache_dir / entry['cache_file']).unlink(missing_ok=True)
+        self.manifest_path.unlink(missing_ok=True)
+        self.manifest = {}
+
+    def _source_key(self, filepath):
+        return str(Path(filepath).resolve())
+
+    def _cache_file(self, filepath, sha256):
+        stem = Path(filepath).stem.replace(' ', '_')
+        return self.cache_dir / f"{stem}-v{self.CACHE_VERSION}-{sha256[:16]}.parquet"
+
+    def _write(self, df, cache_file):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix('.parquet.tmp')
+        df.to_parquet(tmp_file, index=False)
+        os.replace(tmp_file, cache_file)
+
+    def _evict(self, key, keep):
+        """Delete the previous cache file for a source that has changed"""
+        entry = self.manifest.get(key)
+        if entry is not None and entry['cache_file'] != keep.name:
+            (self.cache_dir / entry['cache_file']).unlink(missing_ok=True)
+
+    def _record(self, key, fingerprint, cache_file):
+        entry = dict(fingerprint, cache_file=cache_file.name)
+        with self._lock:
+            if self.manifest.get(key) == entry:
+                return
+            self.manifest[key] = entry
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.manifest_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(self.manifest, f, indent=2)
+            os.replace(tmp_path, self.manifest_path)
+
+    def _read_manifest(self):
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
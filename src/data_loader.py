@@ -3,21 +3,134 @@ Data Loader Module for ABG Motors Market Entry Analysis
 Loads Japanese and Indian datasets from ODS format and performs initial validation
 """
 
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
 from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+from data_cache import DatasetCache
+from ods_stream import ODSStreamReader
+from schema import JAPANESE_SCHEMA, INDIAN_SCHEMA, apply_schema, memory_mb
+from storage import EXPORT_FORMAT, write_table
+from validation import VALIDATION_LEVELS, validate_dataset
+
+
+def _parse_ods_file(filepath, reader='odf', chunk_size=50000):
+    """Parse an ODS sheet with the given reader (module level so a worker process can run it)"""
+    if reader == 'stream':
+        return ODSStreamReader(filepath, chunk_size=chunk_size).read()
+    return pd.read_excel(filepath, engine='odf')
+
 
 class DataLoader:
     """Load and validate datasets for ABG Motors analysis"""
     
-    def __init__(self, data_dir='data/raw'):
+    def __init__(self, data_dir='data/raw', use_cache=True, cache_dir='data/processed/cache',
+                 reader='odf', chunk_size=50000, enforce_schema=True, validation='fast',
+                 parse_in_process=False):
+        """
+        Args:
+            data_dir: Directory containing the raw ODS files
+            use_cache: Reuse the Parquet cache of previously parsed sheets
+            cache_dir: Location of the Parquet cache
+            reader: 'odf' to parse with pandas/odfpy, 'stream' to use the
+                incremental ODSStreamReader (bounded memory)
+            chunk_size: Rows per chunk for the streaming reader
+            enforce_schema: Cast columns to the compact dtypes declared in schema.py
+            validation: 'off', 'fast' (single-pass profile kept silently in
+                japanese_report / indian_report; see validate(verbose=True)
+                to print it) or 'full' (profile plus detailed printed
+                diagnostics)
+            parse_in_process: Parse ODS files in a worker process. Both
+                readers are pure Python and hold the GIL, so loads running on
+                different threads (pipeline branches) only parse in parallel
+                this way; cache reads and writes stay in this process
+        """
+        if reader not in ('odf', 'stream'):
+            raise ValueError(f"reader must be 'odf' or 'stream', got {reader!r}")
+        if validation not in VALIDATION_LEVELS:
+            raise ValueError(f"validation must be one of {VALIDATION_LEVELS}, got {validation!r}")
         self.data_dir = Path(data_dir)
+        self.reader = reader
+        self.chunk_size = chunk_size
+        self.enforce_schema = enforce_schema
+        self.validation = validation
+        self.parse_in_process = parse_in_process
         self.japanese_data = None
         self.indian_data = None
+        self.japanese_report = None
+        self.indian_report = None
+        self.cache = None
+        
+        if use_cache:
+            if DatasetCache.is_available():
+                self.cache = DatasetCache(cache_dir)
+            else:
+                print("⚠ pyarrow not installed - ODS cache disabled")
+        
+    def _read_ods(self, filepath):
+        """
+        Read an ODS sheet, reusing the columnar cache when the source is unchanged
+        
+        Args:
+            filepath: Path to the ODS file
+            
+        Returns:
+            pd.DataFrame: Parsed sheet
+        """
+        if self.cache is None:
+            return self._parse_ods(filepath)
         
+        df, cache_hit = self.cache.load(filepath, self._parse_ods)
+        if cache_hit:
+            print(f"  (loaded from cache - ODS parsing skipped)")
+        else:
+            print(f"  (parsed ODS and refreshed cache in {self.cache.cache_dir})")
+        return df
+        
+    def _apply_schema(self, df, schema):
+        """Enforce the declared dtype schema and report the memory saved"""
+        if not self.enforce_schema:
+            return df
+        
+        before = memory_mb(df)
+        df = apply_schema(df, schema)
+        print(f"  Memory: {before:.1f} MB -> {memory_mb(df):.1f} MB (compact schema)")
+        return df
+    
+    def _parse_ods(self, filepath):
+        """Parse an ODS sheet with the configured reader"""
+        if not self.parse_in_process:
+            return _parse_ods_file(filepath, self.reader, self.chunk_size)
+        # spawn, not fork: the caller may be one of several pipeline threads
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            return pool.submit(_parse_ods_file, filepath, self.reader, self.chunk_size).result()
+    
+    def iter_chunks(self, filename, chunk_size=None, sheet_name=0, schema=None):
+        """
+        Stream an ODS sheet as DataFrame chunks without loading it whole
+        
+        Args:
+            filename: ODS file name inside data_dir
+            chunk_size: Rows per chunk (defaults to the loader's chunk_size)
+            sheet_name: Sheet index or name
+            schema: Optional dtype schema (e.g. INDIAN_SCHEMA) applied to each chunk
+            
+        Yields:
+            pd.DataFrame chunks with a continuous RangeIndex
+        """
+        filepath = self.data_dir / filename
+        reader = ODSStreamReader(
+            filepath, sheet_name=sheet_name, chunk_size=chunk_size or self.chunk_size
+        )
+        for chunk in reader.iter_chunks():
+            yield apply_schema(chunk, schema) if schema else chunk
+    
     def load_japanese_data(self, filename='japan dataset.ods'):
         """
         Load Japanese dataset (training data)
@@ -31,7 +144,7 @@ class DataLoader:
         
         try:
             # Load ODS file
-            self.japanese_data = pd.read_excel(filepath, engine='odf')
+            self.japanese_data = self._apply_schema(self._read_ods(filepath), JAPANESE_SCHEMA)
             
             # Display basic info
             print(f"\n✓ Japanese dataset loaded successfully!")
@@ -60,7 +173,7 @@ class DataLoader:
         
         try:
             # Load ODS file
-            self.indian_data = pd.read_excel(filepath, engine='odf')
+            self.indian_data = self._apply_schema(self._read_ods(filepath), INDIAN_SCHEMA)
             
             # Display basic info
             print(f"\n✓ Indian dataset loaded successfully!")
@@ -78,79 +191,79 @@ class DataLoader:
     
     def _validate_japanese_data(self):
         """Validate Japanese dataset structure and quality"""
-        print("\n" + "="*60)
-        print("JAPANESE DATASET VALIDATION")
-        print("="*60)
-        
-        # Check for missing values
-        missing = self.japanese_data.isnull().sum()
-        print(f"\nMissing Values:")
-        print(missing)
-        
-        # Check data types
-        print(f"\nData Types:")
-        print(self.japanese_data.dtypes)
-        
-        # Basic statistics
-        print(f"\nBasic Statistics:")
-        print(self.japanese_data.describe())
-        
-        # Target variable distribution
-        if 'PURCHASE' in self.japanese_data.columns:
-            purchase_dist = self.japanese_data['PURCHASE'].value_counts()
-            purchase_rate = self.japanese_data['PURCHASE'].mean()
-            print(f"\nTarget Variable (PURCHASE) Distribution:")
-            print(purchase_dist)
-            print(f"Purchase Rate: {purchase_rate:.2%}")
-        
-        # Gender distribution
-        if 'GENDER' in self.japanese_data.columns:
-            print(f"\nGender Distribution:")
-            print(self.japanese_data['GENDER'].value_counts())
+        self.japanese_report = validate_dataset(
+            self.japanese_data, level=self.validation, dataset='Japanese', target_column='PURCHASE'
+        )
     
     def _validate_indian_data(self):
         """Validate Indian dataset structure and quality"""
-        print("\n" + "="*60)
-        print("INDIAN DATASET VALIDATION")
-        print("="*60)
-        
-        # Check for missing values
-        missing = self.indian_data.isnull().sum()
-        print(f"\nMissing Values:")
-        print(missing)
+        self.indian_report = validate_dataset(
+            self.indian_data, level=self.validation, dataset='Indian'
+        )
+    
+    def validate(self, level='fast', verbose=False):
+        """
+        Validate the loaded datasets on demand
         
-        # Check data types
-        print(f"\nData Types:")
-        print(self.indian_data.dtypes)
+        Useful when loading with validation='off' and diagnostics are only
+        needed later (or not at all).
         
-        # Basic statistics
-        print(f"\nBasic Statistics:")
-        print(self.indian_data.describe())
+        Args:
+            level: 'fast' or 'full'
+            verbose: Print each report's one-line summary
+            
+        Returns:
+            dict of dataset name -> ValidationReport
+        """
+        reports = {}
+        if self.japanese_data is not None:
+            reports['japanese'] = self.japanese_report = validate_dataset(
+                self.japanese_data, level=level, dataset='Japanese', target_column='PURCHASE'
+            )
+        if self.indian_data is not None:
+            reports['indian'] = self.indian_report = validate_dataset(
+                self.indian_data, level=level, dataset='Indian'
+            )
+        if verbose:
+            for report in reports.values():
+                print(f"  Validation: {report.summary()}")
+        return reports
+    
+    def save(self, output_dir='data/processed', datasets=('japanese', 'indian'), fmt=None):
+        """
+        Save loaded datasets as japanese_raw / indian_raw tables
         
-        # Gender distribution
-        if 'GENDER' in self.indian_data.columns:
-            print(f"\nGender Distribution:")
-            print(self.indian_data['GENDER'].value_counts())
+        Args:
+            output_dir: Destination directory
+            datasets: Which loaded datasets to write ('japanese', 'indian')
+            fmt: Storage format (see storage.FORMATS; defaults to Parquet,
+                which keeps the schema dtypes that CSV would lose)
         
-        # Check DT_MAINT format
-        if 'DT_MAINT' in self.indian_data.columns:
-            print(f"\nDT_MAINT Sample Values:")
-            print(self.indian_data['DT_MAINT'].head(10))
-    
-    def save_to_csv(self, output_dir='data/processed'):
-        """Save loaded datasets to CSV format for easier processing"""
+        Returns:
+            dict of dataset name -> written path
+        """
         output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
+        written = {}
         
-        if self.japanese_data is not None:
-            japanese_csv = output_path / 'japanese_raw.csv'
-            self.japanese_data.to_csv(japanese_csv, index=False)
-            print(f"\n✓ Japanese data saved to: {japanese_csv}")
+        if self.japanese_data is not None and 'japanese' in datasets:
+            written['japanese'] = write_table(self.japanese_data, output_path / 'japanese_raw', fmt)
+            print(f"\n✓ Japanese data saved to: {written['japanese']}")
         
-        if self.indian_data is not None:
-            indian_csv = output_path / 'indian_raw.csv'
-            self.indian_data.to_csv(indian_csv, index=False)
-            print(f"✓ Indian data saved to: {indian_csv}")
+        if self.indian_data is not None and 'indian' in datasets:
+            written['indian'] = write_table(self.indian_data, output_path / 'indian_raw', fmt)
+            print(f"✓ Indian data saved to: {written['indian']}")
+        
+        return written
+    
+    def save_to_csv(self, output_dir='data/processed', datasets=('japanese', 'indian')):
+        """
+        Save loaded datasets to CSV format for export
+        
+        Args:
+            output_dir: Destination directory
+            datasets: Which loaded datasets to write ('japanese', 'indian')
+        """
+        return self.save(output_dir, datasets, fmt=EXPORT_FORMAT)
     
     def get_data_summary(self):
         """Get summary comparison of both datasets"""
@@ -182,8 +295,8 @@ def main():
     print("ABG MOTORS - DATA LOADING MODULE")
     print("="*60)
     
-    # Initialize loader
-    loader = DataLoader(data_dir='data/raw')
+    # Initialize loader (full diagnostics when run standalone)
+    loader = DataLoader(data_dir='data/raw', validation='full')
     
     # Load datasets
     japanese_df = loader.load_japanese_data()
@@ -192,8 +305,8 @@ def main():
     # Get summary
     loader.get_data_summary()
     
-    # Save to CSV
-    loader.save_to_csv()
+    # Save for the feature engineering step
+    loader.save()
     
     print("\n" + "="*60)
     print("DATA LOADING COMPLETED SUCCESSFULLY!")
@@ -0,0 +1,139 @@
+"""
+Date Parser Module for ABG Motors Market Entry Analysis
+Parses DT_MAINT strings once per unique value with fixed fast-path formats
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from feature_config import FAST_PATH_FORMATS, EXCEL_EPOCH, EXCEL_SERIAL_RANGE
+
+
+@dataclass
+class DateParseReport:
+    """Summary of how the values were parsed"""
+    rows: int = 0
+    unique_values: int = 0
+    fast_path_rows: dict = field(default_factory=dict)
+    slow_path_rows: int = 0
+    slow_path_values: list = field(default_factory=list)
+    failed_rows: int = 0
+    failed_values: list = field(default_factory=list)
+
+    def summary(self):
+        fast = ', '.join(f"{name}: {count:,}" for name, count in self.fast_path_rows.items())
+        return (f"{self.rows:,} rows ({self.unique_values:,} unique) - fast path [{fast}], "
+                f"slow path: {self.slow_path_rows:,}, failed: {self.failed_rows:,}")
+
+
+class MaintenanceDateParser:
+    """
+    Parse date strings by unique value
+
+    Values are factorized so each distinct string is parsed once. Uniques
+    are tried against FAST_PATH_FORMATS and Excel serial numbers with
+    explicit formats; only what remains goes to pandas' per-element
+    format='mixed' inference (the slow path). A digit string is an Excel
+    serial only if format='mixed' cannot read it, so every string pandas
+    parses gets the same date it would from pd.to_datetime(format='mixed'). Parsed uniques are mapped back
+    to rows with a single take on the factorized codes.
+    """
+
+    def __init__(self, formats=FAST_PATH_FORMATS, errors='raise', sample_size=10):
+        """
+        Args:
+            formats: Ordered (name, strftime format) pairs for the fast path
+            errors: 'raise' to fail on unparsable values, 'coerce' to return NaT
+            sample_size: Number of slow-path/failed values kept in the report
+        """
+        if errors not in ('raise', 'coerce'):
+            raise ValueError(f"errors must be 'raise' or 'coerce', got {errors!r}")
+        self.formats = formats
+        self.errors = errors
+        self.sample_size = sample_size
+        self.report = None
+
+    def parse(self, values):
+        """
+        Parse an array-like of dates
+
+        Args:
+            values: Series or array of date strings, numbers or datetimes
+
+        Returns:
+            pd.Series of datetime64 values aligned with the input
+        """
+        index = values.index if isinstance(values, pd.Series) else None
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        uniques = np.asarray(uniques, dtype=object)
+        report = DateParseReport(rows=len(codes), unique_values=len(uniques))
+        row_counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+        parsed = np.full(len(uniques), np.datetime64('NaT'), dtype='datetime64[ns]')
+        pending = np.ones(len(uniques), dtype=bool)
+
+        # Values that are already dates need no parsing
+        is_datetime = np.array([isinstance(v, (pd.Timestamp, np.datetime64)) or
+                                hasattr(v, 'year') for v in uniques], dtype=bool)
+        if is_datetime.any():
+            parsed[is_datetime] = pd.to_datetime(uniques[is_datetime]).to_numpy('datetime64[ns]')
+            report.fast_path_rows['datetime'] = int(row_counts[is_datetime].sum())
+            pending &= ~is_datetime
+
+        strings = pd.Series(uniques, dtype=object).astype(str).str.strip().to_numpy(dtype=object)
+
+        for name, fmt in self.formats:
+            if not pending.any():
+                break
+            attempt = pd.to_datetime(strings[pending], format=fmt, errors='coerce').to_numpy('datetime64[ns]')
+            hit = ~np.isnat(attempt)
+            targets = np.flatnonzero(pending)[hit]
+            parsed[targets] = attempt[hit]
+            pending[targets] = False
+            report.fast_path_rows[name] = int(row_counts[targets].sum())
+
+        if pending.any():
+            targets = np.flatnonzero(pending)
+            serials = pd.to_numeric(strings[targets], errors='coerce')
+            low, high = EXCEL_SERIAL_RANGE
+            hit = np.isfinite(serials) & (serials >= low) & (serials <= high)
+            # Digit strings pandas reads as dates ('2018' -> 2018-01-01,
+            # '20180420') keep that meaning and go to the slow path; only
+            # numbers and digit strings pandas rejects (e.g. '43210') are serials
+            text = hit & np.array([isinstance(value, str) for value in uniques[targets]], dtype=bool)
+            if text.any():
+                as_dates = pd.to_datetime(pd.Series(strings[targets[text]]), format='mixed', errors='coerce')
+                hit[np.flatnonzero(text)[as_dates.notna().to_numpy()]] = False
+            if hit.any():
+                days = pd.to_timedelta(serials[hit], unit='D')
+                parsed[targets[hit]] = (pd.Timestamp(EXCEL_EPOCH) + days).to_numpy('datetime64[ns]')
+                pending[targets[hit]] = False
+            report.fast_path_rows['Excel serial'] = int(row_counts[targets[hit]].sum())
+
+        if pending.any():
+            targets = np.flatnonzero(pending)
+            report.slow_path_rows = int(row_counts[targets].sum())
+            report.slow_path_values = list(strings[targets[:self.sample_size]])
+            attempt = pd.to_datetime(pd.Series(strings[targets]), format='mixed', errors='coerce')
+            attempt = attempt.to_numpy('datetime64[ns]')
+            hit = ~np.isnat(attempt)
+            parsed[targets[hit]] = attempt[hit]
+
+            failed = targets[~hit]
+            if len(failed):
+                report.failed_rows = int(row_counts[failed].sum())
+                report.failed_values = list(strings[failed[:self.sample_size]])
+                if self.errors == 'raise':
+                    self.report = report
+                    raise ValueError(
+                        f"Could not parse {report.failed_rows} date values, e.g. {report.failed_values}"
+                    )
+
+        self.report = report
+
+        result = np.full(len(codes), np.datetime64('NaT'), dtype='datetime64[ns]')
+        valid = codes >= 0
+        result[valid] = parsed[codes[valid]]
+        return pd.Series(result, index=index, name=getattr(values, 'name', None))
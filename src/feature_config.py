@@ -0,0 +1,24 @@
+"""
+Feature Configuration Module for ABG Motors Market Entry Analysis
+Shared feature constants with no pandas dependency (used by batch and online scoring)
+"""
+
+from datetime import datetime
+
+
+# Date the Indian DT_MAINT values are measured against
+REFERENCE_DATE = datetime(2019, 7, 1)  # July 1, 2019
+
+# AGE_CAR segment boundaries in days: <200, 200-360, 360-500, >500
+AGE_CAR_THRESHOLDS = (200, 360, 500)
+
+# DT_MAINT fast-path formats tried in order; M/D/YYYY is what the Indian extract uses
+FAST_PATH_FORMATS = (
+    ('M/D/YYYY', '%m/%d/%Y'),
+    ('ISO', '%Y-%m-%d'),
+)
+
+# Excel/LibreOffice serial day 0
+EXCEL_EPOCH = datetime(1899, 12, 30)
+# Serials outside this range (1900-01-01 .. 2173-10-14) are not treated as dates
+EXCEL_SERIAL_RANGE = (1, 100000)
@@ -3,23 +3,98 @@ Feature Engineering Module for ABG Motors Market Entry Analysis
 Handles AGE_CAR segmentation and feature transformations
 """
 
+import argparse
+import hashlib
+import inspect
+import sys
+
 import pandas as pd
 import numpy as np
-from datetime import datetime
 from pathlib import Path
 
+import date_parser
+import feature_config
+from feature_config import AGE_CAR_THRESHOLDS, REFERENCE_DATE
+from date_parser import MaintenanceDateParser
+from profiling import StageProfiler
+from chunked_io import iter_table_chunks, table_columns, has_missing, ChunkWriter
+from schema import JAPANESE_SCHEMA, INDIAN_SCHEMA, apply_schema
+from storage import DEFAULT_FORMAT, EXPORT_FORMAT, FORMATS, read_table, write_table
+
+
+def feature_code_version():
+    """Hash of the source that computes feature values (this module, date parsing, config)"""
+    digest = hashlib.sha256()
+    for module in (sys.modules[__name__], date_parser, feature_config):
+        digest.update(Path(inspect.getsourcefile(module)).read_bytes())
+    return digest.hexdigest()
+
 
 class FeatureEngineer:
     """Feature engineering for ABG Motors analysis"""
     
-    def __init__(self):
-        self.reference_date = datetime(2019, 7, 1)  # July 1, 2019
+    def __init__(self, age_car_thresholds=AGE_CAR_THRESHOLDS, copy_free=True, profile=False, verbose=True,
+                 feature_store=None, n_workers=None):
+        """
+        Args:
+            age_car_thresholds: AGE_CAR segment boundaries in days
+            copy_free: Build all derived columns into one output frame
+                (build_features) instead of chaining copying helpers
+            profile: Record per-stage time, peak memory and allocations (both
+                paths use the same stage names, so the reports compare)
+            verbose: Print per-step diagnostics (disabled per chunk in process_file)
+            feature_store: Optional FeatureStore; when set, prepare_*_features
+                only recompute rows that are new or changed since the last run
+            n_workers: Build features in this many processes over memory-mapped
+                arrays (see parallel_features); None or 1 builds in-process
+        """
+        self.reference_date = REFERENCE_DATE  # July 1, 2019
+        self.age_car_thresholds = np.sort(np.asarray(age_car_thresholds, dtype='float64'))
+        self.date_parser = MaintenanceDateParser()
+        self.copy_free = copy_free
+        self.profile = profile
+        self.verbose = verbose
+        self.feature_store = feature_store
+        self.n_workers = n_workers
+        self.profiler = None
         
-    def create_age_car_segments(self, df, age_car_column='AGE_CAR'):
+    def segment_codes(self, days):
+        """
+        Map days since maintenance to 1-based segment codes
+        
+        Uses a single np.searchsorted over the sorted thresholds, so a value
+        equal to a threshold falls into the higher segment (same as the
+        original "< 200 / < 360 / < 500" rules). NaN sorts past every
+        threshold and lands in the last segment, as before.
+        
+        Args:
+            days: Array-like of AGE_CAR values
+            
+        Returns:
+            np.ndarray of int8 segment codes (1..len(thresholds)+1)
+        """
+        days = np.asarray(days, dtype='float64')
+        return (np.searchsorted(self.age_car_thresholds, days, side='right') + 1).astype(np.int8)
+    
+    def segment_one_hot(self, codes):
+        """
+        One-hot encode segment codes without pd.get_dummies
+        
+        Args:
+            codes: int8 segment codes from segment_codes()
+            
+        Returns:
+            dict of SEGMENT_<n> -> boolean array, one entry per segment
+        """
+        n_segments = len(self.age_car_thresholds) + 1
+        one_hot = np.arange(1, n_segments + 1, dtype=np.int8) == np.asarray(codes)[:, None]
+        return {f'SEGMENT_{i + 1}': one_hot[:, i] for i in range(n_segments)}
+    
+    def create_age_car_segments(self, df, age_car_column='AGE_CAR', one_hot=False):
         """
         Create 4 categorical segments from AGE_CAR (days since last maintenance)
         
-        Segments:
+        Segments (default thresholds 200/360/500):
             1: < 200 days
             2: 200-360 days
             3: 360-500 days
@@ -28,29 +103,41 @@ class FeatureEngineer:
         Args:
             df: DataFrame with AGE_CAR column
             age_car_column: Name of the column containing days since maintenance
+            one_hot: Also add SEGMENT_1..SEGMENT_n indicator columns
             
         Returns:
             DataFrame with new AGE_CAR_SEGMENT column
         """
         df = df.copy()
         
-        def segment_age_car(days):
-            if days < 200:
-                return 1
-            elif days < 360:
-                return 2
-            elif days < 500:
-                return 3
-            else:
-                return 4
+        codes = self.segment_codes(df[age_car_column].to_numpy())
+        df['AGE_CAR_SEGMENT'] = codes
         
-        df['AGE_CAR_SEGMENT'] = df[age_car_column].apply(segment_age_car)
+        if one_hot:
+            for column, values in self.segment_one_hot(codes).items():
+                df[column] = values
         
-        print(f"\nAGE_CAR Segmentation Distribution:")
-        print(df['AGE_CAR_SEGMENT'].value_counts().sort_index())
+        self._print_segment_distribution(codes)
         
         return df
     
+    def _print_segment_distribution(self, codes):
+        if not self.verbose:
+            return
+        counts = np.bincount(codes, minlength=len(self.age_car_thresholds) + 2)[1:]
+        distribution = pd.Series(
+            counts, index=pd.Index(np.arange(1, len(counts) + 1), name='AGE_CAR_SEGMENT'), name='count'
+        )
+        print(f"\nAGE_CAR Segmentation Distribution:")
+        print(distribution[distribution > 0])
+    
+    def create_segment_dummies(self, df):
+        """Add SEGMENT_1..SEGMENT_n indicator columns from AGE_CAR_SEGMENT"""
+        df = df.copy()
+        for column, values in self.segment_one_hot(df['AGE_CAR_SEGMENT'].to_numpy()).items():
+            df[column] = values
+        return df
+    
     def convert_indian_dates_to_age_car(self, df, date_column='DT_MAINT'):
         """
         Convert Indian dataset DT_MAINT to AGE_CAR (days since maintenance)
@@ -65,24 +152,42 @@ class FeatureEngineer:
         """
         df = df.copy()
         
-        # Convert string dates to datetime
-        df[date_column] = pd.to_datetime(df[date_column], format='mixed')
+        df[date_column], df['AGE_CAR'] = self._dates_to_age_car(df[date_column])
+        
+        return df
+    
+    def _dates_to_age_car(self, dates):
+        """
+        Parse maintenance dates and compute days until the reference date
+        
+        Returns:
+            (parsed dates Series, int64 AGE_CAR array with negatives set to 0)
+        """
+        # Convert string dates to datetime (each distinct string parsed once)
+        parsed = self.date_parser.parse(dates)
+        if self.verbose:
+            print(f"\nDT_MAINT parsing: {self.date_parser.report.summary()}")
+            if self.date_parser.report.slow_path_rows:
+                print(f"  Slow-path samples: {self.date_parser.report.slow_path_values}")
         
         # Calculate days difference
-        df['AGE_CAR'] = (self.reference_date - df[date_column]).dt.days
+        age_car = (self.reference_date - parsed).dt.days.to_numpy()
         
-        print(f"\nIndian Dataset - AGE_CAR Statistics:")
-        print(df['AGE_CAR'].describe())
+        if self.verbose:
+            print(f"\nIndian Dataset - AGE_CAR Statistics:")
+            print(pd.Series(age_car, name='AGE_CAR').describe())
         
         # Check for any negative values (maintenance after reference date)
-        negative_count = (df['AGE_CAR'] < 0).sum()
-        if negative_count > 0:
+        negative = age_car < 0
+        negative_count = negative.sum()
+        if negative_count > 0 and self.verbose:
             print(f"\n⚠ Warning: {negative_count} records have maintenance dates after July 1, 2019")
             print("These will be handled appropriately.")
-            # Set negative values to 0 (very recent maintenance)
-            df.loc[df['AGE_CAR'] < 0, 'AGE_CAR'] = 0
+        # Set negative values to 0 (very recent maintenance)
+        if negative_count > 0:
+            age_car = np.where(negative, 0, age_car)
         
-        return df
+        return parsed, age_car
     
     def encode_gender(self, df):
         """One-hot encode GENDER column"""
@@ -91,6 +196,95 @@ class FeatureEngineer:
         df['GENDER_F'] = (df['GENDER'] == 'F').astype(int)
         return df
     
+    @staticmethod
+    def _gender_indicator(gender, label):
+        """int8 indicator for one GENDER label, using category codes when available"""
+        if isinstance(gender.dtype, pd.CategoricalDtype):
+            categories = gender.cat.categories
+            if label not in categories:
+                return np.zeros(len(gender), dtype=np.int8)
+            return (gender.cat.codes.to_numpy() == categories.get_loc(label)).astype(np.int8)
+        return (gender.to_numpy() == label).astype(np.int8)
+    
+    def build_features(self, df, date_column=None):
+        """
+        Build every derived column in one pass and assemble the output once
+        
+        Input columns are referenced, not copied; derived columns are computed
+        as standalone arrays and the result frame is constructed a single
+        time. The output matches the chained helpers column for column
+        (GENDER_M/GENDER_F are int8 instead of int64).
+        
+        Args:
+            df: Raw Japanese or Indian DataFrame
+            date_column: Date column to convert to AGE_CAR (Indian data), or
+                None when AGE_CAR is already present
+            
+        Returns:
+            DataFrame with AGE_CAR, AGE_CAR_SEGMENT, GENDER_M/F and SEGMENT_n
+        """
+        profiler = self.profiler or StageProfiler(enabled=False)
+        columns = {name: df[name] for name in df.columns}
+        
+        if date_column is not None:
+            with profiler.stage('dates'):
+                columns[date_column], columns['AGE_CAR'] = self._dates_to_age_car(df[date_column])
+        
+        with profiler.stage('segments'):
+            codes = self.segment_codes(columns['AGE_CAR'])
+            columns['AGE_CAR_SEGMENT'] = codes
+            self._print_segment_distribution(codes)
+        
+        with profiler.stage('gender'):
+            columns['GENDER_M'] = self._gender_indicator(df['GENDER'], 'M')
+            columns['GENDER_F'] = self._gender_indicator(df['GENDER'], 'F')
+        
+        with profiler.stage('one_hot'):
+            columns.update(self.segment_one_hot(codes))
+        
+        with profiler.stage('assemble'):
+            result = pd.DataFrame(columns, index=df.index)
+        
+        return result
+    
+    def _store_config(self):
+        """Settings that change feature values; a change invalidates the feature store"""
+        return {
+            'age_car_thresholds': self.age_car_thresholds.tolist(),
+            'reference_date': self.reference_date.isoformat(),
+            'code_version': feature_code_version(),
+        }
+    
+    def _build_features(self, df, date_column=None):
+        """build_features, spread over n_workers processes when configured"""
+        if not self.n_workers or self.n_workers == 1:
+            return self.build_features(df, date_column=date_column)
+        # Imported here: parallel_features imports this module
+        from parallel_features import ParallelFeatureEngineer
+        result = ParallelFeatureEngineer(
+            n_workers=self.n_workers, age_car_thresholds=self.age_car_thresholds
+        ).build_features(df, date_column=date_column)
+        self._print_segment_distribution(result['AGE_CAR_SEGMENT'].to_numpy())
+        return result
+    
+    def _build(self, df, market, date_column=None):
+        """build_features, going through the feature store when one is configured"""
+        if self.feature_store is None:
+            return self._build_features(df, date_column=date_column)
+        return self.feature_store.update(
+            df, market, lambda delta: self._build_features(delta, date_column=date_column),
+            config=self._store_config()
+        )
+    
+    def _start_profiling(self):
+        self.profiler = StageProfiler(enabled=self.profile)
+    
+    def _finish_profiling(self, title):
+        if self.profiler is not None:
+            path = 'copy-free' if self.copy_free else 'legacy'
+            self.profiler.print_report(f'{title} ({path})')
+            self.profiler.stop()
+    
     def prepare_japanese_features(self, df):
         """
         Complete feature engineering for Japanese dataset
@@ -105,17 +299,26 @@ class FeatureEngineer:
         print("JAPANESE DATASET - FEATURE ENGINEERING")
         print("="*60)
         
-        df = df.copy()
-        
-        # Create AGE_CAR segments
-        df = self.create_age_car_segments(df, 'AGE_CAR')
-        
-        # Encode gender
-        df = self.encode_gender(df)
-        
-        # Create dummy variables for AGE_CAR_SEGMENT
-        segment_dummies = pd.get_dummies(df['AGE_CAR_SEGMENT'], prefix='SEGMENT')
-        df = pd.concat([df, segment_dummies], axis=1)
+        self._start_profiling()
+        if self.copy_free:
+            df = self._build(df, 'japanese')
+        else:
+            profiler = self.profiler
+            with profiler.stage('copy'):
+                df = df.copy()
+            
+            # Create AGE_CAR segments
+            with profiler.stage('segments'):
+                df = self.create_age_car_segments(df, 'AGE_CAR')
+            
+            # Encode gender
+            with profiler.stage('gender'):
+                df = self.encode_gender(df)
+            
+            # Create dummy variables for AGE_CAR_SEGMENT
+            with profiler.stage('one_hot'):
+                df = self.create_segment_dummies(df)
+        self._finish_profiling('JAPANESE FEATURE STAGES')
         
         print(f"\n✓ Japanese features prepared!")
         print(f"  Final shape: {df.shape}")
@@ -137,20 +340,30 @@ class FeatureEngineer:
         print("INDIAN DATASET - FEATURE ENGINEERING")
         print("="*60)
         
-        df = df.copy()
-        
-        # Convert DT_MAINT to AGE_CAR
-        df = self.convert_indian_dates_to_age_car(df, 'DT_MAINT')
-        
-        # Create AGE_CAR segments
-        df = self.create_age_car_segments(df, 'AGE_CAR')
-        
-        # Encode gender
-        df = self.encode_gender(df)
-        
-        # Create dummy variables for AGE_CAR_SEGMENT
-        segment_dummies = pd.get_dummies(df['AGE_CAR_SEGMENT'], prefix='SEGMENT')
-        df = pd.concat([df, segment_dummies], axis=1)
+        self._start_profiling()
+        if self.copy_free:
+            df = self._build(df, 'indian', date_column='DT_MAINT')
+        else:
+            profiler = self.profiler
+            with profiler.stage('copy'):
+                df = df.copy()
+            
+            # Convert DT_MAINT to AGE_CAR
+            with profiler.stage('dates'):
+                df = self.convert_indian_dates_to_age_car(df, 'DT_MAINT')
+            
+            # Create AGE_CAR segments
+            with profiler.stage('segments'):
+                df = self.create_age_car_segments(df, 'AGE_CAR')
+            
+            # Encode gender
+            with profiler.stage('gender'):
+                df = self.encode_gender(df)
+            
+            # Create dummy variables for AGE_CAR_SEGMENT
+            with profiler.stage('one_hot'):
+                df = self.create_segment_dummies(df)
+        self._finish_profiling('INDIAN FEATURE STAGES')
         
         print(f"\n✓ Indian features prepared!")
         print(f"  Final shape: {df.shape}")
@@ -158,6 +371,73 @@ class FeatureEngineer:
         
         return df
     
+    def process_file(self, source, destination, market='indian', chunk_size=100000):
+        """
+        Out-of-core feature engineering for files larger than memory
+        
+        Streams a raw CSV or Parquet file through date conversion,
+        segmentation and gender encoding in fixed-size chunks and appends
+        each processed chunk to the destination, so memory is bounded by
+        chunk_size. A CSV destination is byte-identical to writing the
+        in-memory prepare_*_features result with to_csv(index=False): AGE_CAR
+        is pinned to float64 for every chunk when any DT_MAINT is missing
+        (found with a pass over that column only), and an empty source
+        still gets the header (or Parquet schema).
+        
+        Args:
+            source: Raw .csv or .parquet file (e.g. data/processed/indian_raw.csv)
+            destination: Output .csv or .parquet file
+            market: 'indian' (DT_MAINT -> AGE_CAR) or 'japanese'
+            chunk_size: Rows per chunk
+            
+        Returns:
+            dict with rows, chunks and the overall segment distribution
+        """
+        if market not in ('indian', 'japanese'):
+            raise ValueError(f"market must be 'indian' or 'japanese', got {market!r}")
+        schema = INDIAN_SCHEMA if market == 'indian' else JAPANESE_SCHEMA
+        date_column = 'DT_MAINT' if market == 'indian' else None
+        
+        print("\n" + "="*60)
+        print(f"{market.upper()} DATASET - CHUNKED FEATURE ENGINEERING")
+        print("="*60)
+        print(f"  Source: {source}")
+        print(f"  Chunk size: {chunk_size:,} rows")
+        
+        # Per-chunk inference would give int64 AGE_CAR in chunks without a
+        # missing date and float64 in the others
+        dtypes = {}
+        if date_column is not None:
+            missing = has_missing(source, date_column, chunk_size=chunk_size)
+            dtypes['AGE_CAR'] = 'float64' if missing else 'int64'
+        
+        segment_counts = np.zeros(len(self.age_car_thresholds) + 2, dtype=np.int64)
+        chunks = 0
+        verbose = self.verbose
+        self.verbose = False
+        try:
+            with ChunkWriter(destination, dtypes=dtypes) as writer:
+                for chunk in iter_table_chunks(source, chunk_size=chunk_size, schema=schema):
+                    processed = self.build_features(chunk, date_column=date_column)
+                    segment_counts += np.bincount(processed['AGE_CAR_SEGMENT'].to_numpy(),
+                                                  minlength=len(segment_counts))
+                    writer.write(processed)
+                    chunks += 1
+                if not writer.started:
+                    # Empty source: header/schema-only output
+                    empty = apply_schema(pd.DataFrame(columns=table_columns(source)), schema)
+                    writer.write(self.build_features(empty, date_column=date_column))
+        finally:
+            self.verbose = verbose
+        
+        distribution = {segment: int(count) for segment, count in enumerate(segment_counts) if segment > 0}
+        
+        print(f"\n✓ {market.capitalize()} features written to: {destination}")
+        print(f"  Rows: {writer.rows_written:,} in {chunks} chunks")
+        print(f"  Segment distribution: {distribution}")
+        
+        return {'rows': writer.rows_written, 'chunks': chunks, 'segment_distribution': distribution}
+    
     def get_model_features(self):
         """Return list of features to use in modeling"""
         return [
@@ -171,32 +451,42 @@ class FeatureEngineer:
         ]
 
 
-def main():
+def main(argv=None):
     """Main execution function"""
+    parser = argparse.ArgumentParser(description='ABG Motors feature engineering')
+    parser.add_argument('--format', choices=tuple(FORMATS), default=DEFAULT_FORMAT,
+                        help='Storage format of the processed tables')
+    parser.add_argument('--csv', action='store_true',
+                        help='Also export the processed tables as CSV')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Build features in this many processes (default: in-process)')
+    args = parser.parse_args(argv)
+    
     print("="*60)
     print("ABG MOTORS - FEATURE ENGINEERING MODULE")
     print("="*60)
     
-    # Load raw data
-    japanese_df = pd.read_csv('data/processed/japanese_raw.csv')
-    indian_df = pd.read_csv('data/processed/indian_raw.csv')
+    # Load raw data (whichever format the data loader wrote)
+    japanese_df = read_table('data/processed/japanese_raw')
+    indian_df = read_table('data/processed/indian_raw')
     
     # Initialize feature engineer
-    fe = FeatureEngineer()
+    fe = FeatureEngineer(n_workers=args.workers)
     
     # Prepare features
     japanese_processed = fe.prepare_japanese_features(japanese_df)
     indian_processed = fe.prepare_indian_features(indian_df)
     
     # Save processed data
-    japanese_processed.to_csv('data/processed/japanese_processed.csv', index=False)
-    indian_processed.to_csv('data/processed/indian_processed.csv', index=False)
-    
+    formats = (args.format, EXPORT_FORMAT) if args.csv and args.format != EXPORT_FORMAT else (args.format,)
     print("\n" + "="*60)
     print("FEATURE ENGINEERING COMPLETED!")
     print("="*60)
-    print(f"✓ Japanese processed data saved to: data/processed/japanese_processed.csv")
-    print(f"✓ Indian processed data saved to: data/processed/indian_processed.csv")
+    for fmt in formats:
+        japanese_file = write_table(japanese_processed, 'data/processed/japanese_processed', fmt)
+        indian_file = write_table(indian_processed, 'data/processed/indian_processed', fmt)
+        print(f"✓ Japanese processed data saved to: {japanese_file}")
+        print(f"✓ Indian processed data saved to: {indian_file}")
     
     # Display feature list
     print(f"\nModel Features: {fe.get_model_features()}")
@@ -0,0 +1,172 @@
+"""
+Feature Store Module for ABG Motors Market Entry Analysis
+Incremental feature recompute keyed on ID and a hash of each raw row
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+HASH_COLUMN = '_ROW_HASH'
+
+
+class FeatureStore:
+    """
+    Persist processed features and recompute only rows that changed
+
+    Every raw row is hashed (pd.util.hash_pandas_object over all raw
+    columns, vectorized) and stored alongside its processed features in a
+    Parquet table per market. On the next run rows whose ID and hash are
+    already in the store are reused as-is; new or modified rows go through
+    the feature builder, and IDs missing from the new extract are dropped.
+    A change to the feature configuration (thresholds, reference date,
+    feature code version) or to the builder's output columns invalidates
+    the whole table.
+    """
+
+    STORE_VERSION = 2
+
+    def __init__(self, store_dir='data/processed/feature_store'):
+        self.store_dir = Path(store_dir)
+        self.last_update = None
+
+    @staticmethod
+    def is_available():
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    @staticmethod
+    def row_hashes(df):
+        """uint64 content hash per row (ID included, index ignored)"""
+        return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+    def update(self, raw_df, market, builder, config=None):
+        """
+        Return processed features for raw_df, recomputing only the delta
+
+        Args:
+            raw_df: Raw DataFrame with a unique ID column
+            market: Table name, e.g. 'japanese' or 'indian'
+            builder: Callable taking a raw DataFrame and returning its
+                processed DataFrame (e.g. FeatureEngineer.build_features)
+            config: JSON-serialisable feature settings (including a version of
+                the feature code); a change forces a full recompute
+
+        Returns:
+            Processed DataFrame in the same row order/index as raw_df
+        """
+        if raw_df['ID'].duplicated().any():
+            raise ValueError(f"{market} data has duplicate IDs; the feature store requires unique IDs")
+
+        table_path = self.store_dir / f'{market}.parquet'
+        meta_path = self.store_dir / f'{market}.json'
+        metadata = {'version': self.STORE_VERSION, 'config': config,
+                    'raw_columns': {column: str(dtype) for column, dtype in raw_df.dtypes.items()}}
+
+        hashes = self.row_hashes(raw_df)
+        stored = self._read(table_path, meta_path, metadata)
+
+        if stored is not None:
+            positions = pd.Index(stored['ID']).get_indexer(raw_df['ID'])
+            known = positions >= 0
+            unchanged = known.copy()
+            unchanged[known] = stored[HASH_COLUMN].to_numpy()[positions[known]] == hashes[known]
+            deleted = len(stored) - int(known.sum())
+        else:
+            positions = np.full(len(raw_df), -1)
+            known = unchanged = np.zeros(len(raw_df), dtype=bool)
+            deleted = 0
+
+        changed_rows = np.flatnonzero(~unchanged)
+        kept_rows = np.flatnonzero(unchanged)
+
+        self.last_update = {
+            'market': market,
+            'rows': len(raw_df),
+            'reused': len(kept_rows),
+            'new': int((~known).sum()),
+            'changed': int((known & ~unchanged).sum()),
+            'deleted': deleted,
+        }
+
+        if len(changed_rows) == 0 and deleted == 0:
+            result = stored.iloc[positions].drop(columns=HASH_COLUMN)
+            result.index = raw_df.index
+            self._report()
+            return result
+
+        if len(changed_rows):
+            computed = builder(raw_df.iloc[changed_rows])
+            if len(kept_rows) and list(computed.columns) != list(stored.columns.drop(HASH_COLUMN)):
+                # The builder's output changed shape; stored rows are stale
+                print(f"  Feature store columns changed - rebuilding {table_path.name}")
+                changed_rows = np.arange(len(raw_df))
+                kept_rows = changed_rows[:0]
+                computed = builder(raw_df)
+                self.last_update.update(reused=0, changed=int(known.sum()))
+            computed[HASH_COLUMN] = hashes[changed_rows]
+
+        if not len(kept_rows):
+            combined = computed.reset_index(drop=True)
+        elif not len(changed_rows):
+            combined = stored.iloc[positions[kept_rows]].reset_index(drop=True)
+        else:
+            kept = stored.iloc[positions[kept_rows]]
+            combined = pd.concat([kept, computed], ignore_index=True)
+            order = np.argsort(np.concatenate([kept_rows, changed_rows]), kind='stable')
+            combined = combined.iloc[order].reset_index(drop=True)
+
+        self._write(combined, table_path, meta_path, metadata)
+
+        result = combined.drop(columns=HASH_COLUMN)
+        result.index = raw_df.index
+        self._report()
+        return result
+
+    def clear(self, market=None):
+        """Delete one market's table, or every table when market is None"""
+        pattern = f'{market}.*' if market else '*'
+        for path in self.store_dir.glob(pattern):
+            if path.suffix in ('.parquet', '.json'):
+                path.unlink()
+
+    def _read(self, table_path, meta_path, metadata):
+        if not table_path.exists() or not meta_path.exists():
+            return None
+        with open(meta_path, 'r') as f:
+            saved = json.load(f)
+        output_columns = saved.pop('output_columns', None)
+        if saved != metadata:
+            print(f"  Feature store config changed - rebuilding {table_path.name}")
+            return None
+        stored = pd.read_parquet(table_path)
+        if output_columns is None or list(stored.columns) != output_columns + [HASH_COLUMN]:
+            print(f"  Feature store columns changed - rebuilding {table_path.name}")
+            return None
+        return stored
+
+    def _write(self, df, table_path, meta_path, metadata):
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        # Drop the metadata first so a crash mid-write forces a rebuild
+        meta_path.unlink(missing_ok=True)
+        tmp_table = table_path.with_suffix('.parquet.tmp')
+        df.to_parquet(tmp_table, index=False)
+        os.replace(tmp_table, table_path)
+        tmp_meta = meta_path.with_suffix('.json.tmp')
+        metadata = {**metadata, 'output_columns': [column for column in df.columns if column != HASH_COLUMN]}
+        with open(tmp_meta, 'w') as f:
+            json.dump(metadata, f, indent=2)
+        os.replace(tmp_meta, meta_path)
+
+    def _report(self):
+        stats = self.last_update
+        print(f"\n🗄  Feature store ({stats['market']}): {stats['rows']:,} rows - "
+              f"reused {stats['reused']:,}, new {stats['new']:,}, "
+              f"changed {stats['changed']:,}, deleted {stats['deleted']:,}")
@@ -0,0 +1,295 @@
+"""
+Hyper Extract Module for ABG Motors Market Entry Analysis
+Writes the Tableau feeds as typed .hyper extracts (requires tableauhyperapi)
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+HYPER_SUFFIX = '.hyper'
+# Schema and table name Tableau uses for extracts, so a .twbx data source can point at the file
+EXTRACT_SCHEMA = 'Extract'
+EXTRACT_TABLE = 'Extract'
+# NULL marker of the COPY staging file: unquoted empty fields stay empty strings
+NULL_MARKER = r'\N'
+
+
+def is_available():
+    """Hyper extracts need the tableauhyperapi package; CSV feeds are written without it"""
+    try:
+        import tableauhyperapi  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _hyper():
+    try:
+        import tableauhyperapi
+    except ImportError as exc:
+        raise ImportError("Hyper extracts need the tableauhyperapi package "
+                          "(pip install tableauhyperapi)") from exc
+    return tableauhyperapi
+
+
+def sql_type(dtype):
+    """
+    Hyper column type for a pandas dtype
+
+    Numbers keep their width and booleans/timestamps their type, so Tableau
+    treats them as measures/dates without parsing text. Categoricals
+    (AGE_GROUP, INCOME_QUARTILE, CONFIDENCE_CATEGORY, GENDER) and strings
+    become TEXT columns holding their labels, which Tableau makes dimensions.
+    """
+    SqlType = _hyper().SqlType
+    if pd.api.types.is_bool_dtype(dtype):
+        return SqlType.bool()
+    if pd.api.types.is_integer_dtype(dtype):
+        # Hyper integers are signed: unsigned columns need the next width up
+        size = np.dtype(dtype.numpy_dtype if hasattr(dtype, 'numpy_dtype') else dtype).itemsize
+        if pd.api.types.is_unsigned_integer_dtype(dtype):
+            size *= 2
+        if size <= 2:
+            return SqlType.small_int()
+        return SqlType.int() if size <= 4 else SqlType.big_int()
+    if pd.api.types.is_float_dtype(dtype):
+        return SqlType.double()
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return SqlType.timestamp()
+    return SqlType.text()
+
+
+def _loads_null(column):
+    """Whether COPY turns any value of column into NULL (NA, or a label equal to NULL_MARKER)"""
+    if column.isna().any():
+        return True
+    if sql_type(column.dtype) != _hyper().SqlType.text():
+        return False
+    return bool((column.astype(str) == NULL_MARKER).any())
+
+
+def table_definition(df):
+    """Extract.Extract table definition matching the columns of df"""
+    hyper = _hyper()
+    columns = [
+        hyper.TableDefinition.Column(
+            str(name), sql_type(df[name].dtype),
+            hyper.NULLABLE if _loads_null(df[name]) else hyper.NOT_NULLABLE
+        )
+        for name in df.columns
+    ]
+    return hyper.TableDefinition(hyper.TableName(EXTRACT_SCHEMA, EXTRACT_TABLE), columns)
+
+
+def _copy_source(df, path):
+    """
+    Staging CSV for Hyper's COPY (its bulk loader)
+
+    Categoricals are written as labels, booleans as true/false and NA as
+    NULL_MARKER, so empty labels load as empty strings; floats keep full
+    precision.
+    """
+    staged = {}
+    for name in df.columns:
+        column = df[name]
+        if pd.api.types.is_bool_dtype(column.dtype):
+            column = column.map({True: 'true', False: 'false'})
+        staged[name] = column
+    pd.DataFrame(staged).to_csv(path, index=False, na_rep=NULL_MARKER, date_format='%Y-%m-%d %H:%M:%S.%f')
+
+
+class HyperExtractWriter:
+    """
+    Write DataFrames as single-table Hyper extracts
+
+    One Hyper server process is started for the writer and shared by every
+    extract it writes (starting it is the expensive part), so use it as a
+    context manager around a batch of feeds. The process starts on the
+    first write, so a batch that writes nothing costs nothing, and writes
+    from several threads share it (each opens its own connection). Each
+    extract is built in a temporary file and renamed into place; data goes
+    in through COPY, Hyper's bulk path, into a table whose column types
+    come from the DataFrame dtypes (see sql_type).
+    """
+
+    def __init__(self):
+        self._open = False
+        self._process = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        _hyper()
+        self._open = True
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self):
+        with self._lock:
+            self._open = False
+            if self._process is not None:
+                self._process.close()
+                self._process = None
+
+    def _endpoint(self):
+        """Endpoint of the shared Hyper process, started on first use"""
+        with self._lock:
+            if not self._open:
+                raise RuntimeError("HyperExtractWriter must be used as a context manager")
+            if self._process is None:
+                hyper = _hyper()
+                # No telemetry, no hyperd.log in the working directory
+                self._process = hyper.HyperProcess(
+                    telemetry=hyper.Telemetry.DO_NOT_SEND_USAGE_DATA_TO_TABLEAU,
+                    parameters={'log_config': ''}
+                )
+            return self._process.endpoint
+
+    def write(self, df, path):
+        """
+        Write df (without its index) as an extract
+
+        Args:
+            df: Feed to store
+            path: Destination; the extension becomes .hyper
+
+        Returns:
+            Path of the written extract
+        """
+        endpoint = self._endpoint()
+        hyper = _hyper()
+        path = Path(path).with_suffix(HYPER_SUFFIX)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        definition = table_definition(df)
+
+        with tempfile.TemporaryDirectory(prefix='.hyper-', dir=path.parent) as staging:
+            source = Path(staging) / 'feed.csv'
+            target = Path(staging) / path.name
+            _copy_source(df, source)
+            with hyper.Connection(endpoint=endpoint, database=target,
+                                  create_mode=hyper.CreateMode.CREATE_AND_REPLACE) as connection:
+                connection.catalog.create_schema_if_not_exists(EXTRACT_SCHEMA)
+                connection.catalog.create_table(definition)
+                rows = connection.execute_command(
+                    f"COPY {definition.table_name} FROM {hyper.escape_string_literal(str(source))} "
+                    f"WITH (format csv, NULL {hyper.escape_string_literal(NULL_MARKER)}, "
+                    f"delimiter ',', header)"
+                )
+            if rows is not None and rows != len(df):
+                raise ValueError(f"Hyper loaded {rows:,} of {len(df):,} rows into {path}")
+            os.chmod(target, 0o644)
+            os.replace(target, path)
+        return path
+
+    def read(self, path):
+        """
+        Read an extract back into a DataFrame (for checks and tests)
+
+        Returns:
+            (DataFrame, {column: Hyper type name})
+        """
+        endpoint = self._endpoint()
+        hyper = _hyper()
+        table = hyper.TableName(EXTRACT_SCHEMA, EXTRACT_TABLE)
+        with hyper.Connection(endpoint=endpoint, database=Path(path)) as connection:
+            definition = connection.catalog.get_table_definition(table)
+            rows = connection.execute_list_query(f"SELECT * FROM {table}")
+        names = [column.name.unescaped for column in definition.columns]
+        types = {column.name.unescaped: str(column.type) for column in definition.columns}
+        return pd.DataFrame(rows, columns=names), types
+
+
+def write_hyper(df, path):
+    """Write a single extract (starts and stops a Hyper process)"""
+    with HyperExtractWriter() as writer:
+        return writer.write(df, path)
+
+
+def _sorted_rows(df):
+    """df in a row order that only depends on its values (NA sorts as an empty label)"""
+    keys = [np.where(df[name].isna().to_numpy(), '', df[name].astype(str).to_numpy()).astype(str)
+            for name in reversed(df.columns)]
+    return df.iloc[np.lexsort(keys)].reset_index(drop=True)
+
+
+def verify_extract(df, path, writer):
+    """
+    Compare an extract with the frame it was written from
+
+    Hyper scans tables in parallel, so rows may come back in any order;
+    both sides are sorted on the text of every column before comparing.
+
+    Returns:
+        List of mismatch descriptions (empty when the extract matches)
+    """
+    restored, _ = writer.read(path)
+    if list(restored.columns) != [str(name) for name in df.columns]:
+        return [f"columns {list(restored.columns)} != {list(df.columns)}"]
+    if len(restored) != len(df):
+        return [f"{len(restored):,} rows != {len(df):,}"]
+    df = _sorted_rows(df)
+    restored = _sorted_rows(restored)
+    problems = []
+    for name in df.columns:
+        expected = df[name]
+        actual = restored[str(name)]
+        if pd.api.types.is_datetime64_any_dtype(expected.dtype):
+            same = pd.to_datetime(actual.astype(str)).equals(expected)
+        elif pd.api.types.is_numeric_dtype(expected.dtype) or pd.api.types.is_bool_dtype(expected.dtype):
+            same = np.array_equal(actual.astype(float).to_numpy(),
+                                  expected.to_numpy(dtype=float, na_value=np.nan), equal_nan=True)
+        else:
+            # Labels; NULL comes back as a missing value
+            missing = expected.isna().to_numpy()
+            same = (np.array_equal(actual.isna().to_numpy(), missing) and
+                    (actual.astype(str).to_numpy()[~missing] == expected.astype(str).to_numpy()[~missing]).all())
+        if not same:
+            problems.append(f"column {name} differs")
+    return problems
+
+
+def main(argv=None):
+    """Convert the Tableau feeds to Hyper extracts and check them round-trip"""
+    from storage import read_table
+
+    parser = argparse.ArgumentParser(description='ABG Motors Hyper extract export')
+    parser.add_argument('feeds', nargs='*', default=[
+        'data/tableau/japanese_market', 'data/tableau/indian_market',
+        'data/tableau/market_comparison_summary',
+    ], help='Feeds to convert (any stored format, extension optional)')
+    args = parser.parse_args(argv)
+
+    print("="*60)
+    print("ABG MOTORS - HYPER EXTRACT EXPORT")
+    print("="*60)
+
+    if not is_available():
+        print("\n⚠ tableauhyperapi not installed - pip install tableauhyperapi")
+        return {}
+
+    written = {}
+    with HyperExtractWriter() as writer:
+        for feed in args.feeds:
+            df = read_table(feed)
+            path = writer.write(df, feed)
+            problems = verify_extract(df, path, writer)
+            _, types = writer.read(path)
+            written[feed] = path
+            status = "✓" if not problems else "✗ " + "; ".join(problems)
+            print(f"\n{status} {path} ({len(df):,} rows, {path.stat().st_size / 1024:,.0f} KB)")
+            for name, type_name in types.items():
+                print(f"    {name:<22} {type_name}")
+    return written
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,384 @@
+"""
+Hyperparameter Search Module for ABG Motors Market Entry Analysis
+Cached, warm-started cross-validated search over LogisticRegression settings
+"""
+
+import hashlib
+import json
+import math
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import ParameterGrid, StratifiedKFold
+from sklearn.preprocessing import StandardScaler
+
+from cross_validation import rank_roc_auc
+
+
+SEARCH_STRATEGIES = ('grid', 'halving')
+
+
+@dataclass
+class SearchResult:
+    """Structured result of LogisticRegressionSearch.fit"""
+    strategy: str
+    best_params: dict
+    best_score: float
+    results: pd.DataFrame
+    fits: int = 0
+    cache_hits: int = 0
+    seconds: float = 0.0
+    best_estimator: object = field(default=None, repr=False)
+
+
+def _roc_auc(model, X_test, y_test):
+    """ROC-AUC scorer without sklearn's per-call validation (see rank_roc_auc)"""
+    return rank_roc_auc(y_test == model.classes_[1], model.decision_function(X_test))
+
+
+def _fit_path(X, y, train, test, path, base_params, scoring, warm_start, cached, subsample):
+    """
+    Fit one fold along a path of C values (ascending), warm-starting each
+    fit from the previous solution
+
+    A warm start that stops after 0 iterations (the previous solution is
+    already within tol of optimal for the new C) is replaced by a cold fit.
+
+    Entries already in the cache are not refitted; their coefficients
+    still seed the next fit on the path.
+
+    Returns:
+        {C: {'coef', 'intercept', 'score', 'fit_time', 'n_iter'}} for the
+        entries that were fitted here
+    """
+    if subsample is not None:
+        train = train[:subsample]
+    X_train, y_train = X[train], y[train]
+    X_test, y_test = X[test], y[test]
+    scorer = _roc_auc if scoring == 'roc_auc' else get_scorer(scoring)
+
+    fitted = {}
+    model = LogisticRegression(**base_params, warm_start=warm_start)
+    for C in path:
+        if C in cached:
+            entry = cached[C]
+        else:
+            model.set_params(C=C)
+            start = time.perf_counter()
+            model.fit(X_train, y_train)
+            if warm_start and np.max(model.n_iter_) == 0:
+                # The previous solution already met tol at this C, so the
+                # solver stopped without moving; fit cold, as GridSearchCV does
+                model = LogisticRegression(**base_params, C=C, warm_start=warm_start).fit(X_train, y_train)
+            fit_time = time.perf_counter() - start
+            entry = {
+                'coef': model.coef_.copy(), 'intercept': model.intercept_.copy(),
+                'classes': model.classes_.copy(), 'score': float(scorer(model, X_test, y_test)),
+                'fit_time': fit_time, 'n_iter': int(np.max(model.n_iter_)),
+            }
+            fitted[C] = entry
+        if warm_start:
+            model.coef_ = entry['coef'].copy()
+            model.intercept_ = entry['intercept'].copy()
+            model.classes_ = entry['classes']
+    return fitted
+
+
+class LogisticRegressionSearch:
+    """
+    Cross-validated search over LogisticRegression hyperparameters
+
+    Differs from GridSearchCV in five ways. Only warm starting changes
+    fold scores: a warm-started solver stops within tol of the optimum from
+    a different starting point than a cold fit, so scores can differ in the
+    last digits and a near-tie between candidates could resolve differently
+    (pass warm_start=False for GridSearchCV's exact scores):
+
+    - Fold index arrays are computed once (the same StratifiedKFold splits
+      GridSearchCV uses for cv=<int>) and the feature matrix is converted to
+      NumPy once, then shared by every candidate.
+    - Within a fold, candidates that differ only in C are fitted in
+      ascending C order and each fit is warm-started from the previous
+      solution along the regularization path.
+    - Fold results are cached by (data hash, fold train/test indices,
+      params, the C values warm-started through), in memory and optionally
+      on disk, so re-tuning the same data with the same folds is free.
+    - With scale=True the search takes unscaled features and fits a
+      StandardScaler on each fold's training rows. The scaled fold matrices
+      are built once per fit and reused for every candidate, so no fold
+      sees scaling statistics from its own held-out rows.
+    - strategy='halving' runs successive halving: all candidates are scored
+      on a fraction of each training fold, the best 1/factor survive to the
+      next round with factor times more rows, and the last round uses the
+      full folds. This makes wide grids affordable.
+
+    The winning parameters are refitted from scratch (no warm start) on the
+    full data, exactly like GridSearchCV(refit=True); with scale=True the
+    refit sees the data scaled by a StandardScaler fitted on all of it.
+    """
+
+    def __init__(self, param_grid, cv=5, scoring='roc_auc', strategy='grid', factor=3,
+                 warm_start=True, n_jobs=1, cache_dir=None, random_state=42, max_iter=1000,
+                 scale=False):
+        """
+        Args:
+            param_grid: Dict (or list of dicts) of LogisticRegression parameters
+            cv: Number of stratified folds
+            scoring: sklearn scorer name
+            strategy: 'grid' (every candidate on the full folds) or 'halving'
+            factor: Successive halving reduction factor
+            warm_start: Warm-start along the C path within each fold
+            n_jobs: Parallel fold/path tasks (joblib semantics); 1 runs in-process
+            cache_dir: Directory to persist fold results (memory-only when None)
+            random_state: Seed for the estimator and the halving subsamples
+            max_iter: LogisticRegression max_iter
+            scale: Fit a StandardScaler inside each fold (X is unscaled)
+        """
+        if strategy not in SEARCH_STRATEGIES:
+            raise ValueError(f"strategy must be one of {SEARCH_STRATEGIES}, got {strategy!r}")
+        self.param_grid = param_grid
+        self.cv = cv
+        self.scoring = scoring
+        self.strategy = strategy
+        self.factor = factor
+        self.warm_start = warm_start
+        self.n_jobs = n_jobs
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.random_state = random_state
+        self.max_iter = max_iter
+        self.scale = scale
+        self._cache = {}
+        self._fold_X = self._fold_keys = None
+        self.folds_ = None
+        self.best_estimator_ = None
+
+    @staticmethod
+    def data_hash(X, y):
+        digest = hashlib.sha256()
+        digest.update(np.ascontiguousarray(X).tobytes())
+        digest.update(np.ascontiguousarray(y).tobytes())
+        digest.update(str(np.shape(X)).encode())
+        return digest.hexdigest()
+
+    def folds(self, X, y):
+        """Stratified fold index arrays, identical to GridSearchCV(cv=<int>)"""
+        return [(train, test) for train, test in StratifiedKFold(n_splits=self.cv).split(X, y)]
+
+    def fold_matrices(self, X):
+        """
+        Feature matrix seen by each fold
+
+        With scale=True every fold gets X transformed by a StandardScaler
+        fitted on that fold's training rows only; otherwise all folds share X.
+        """
+        if not self.scale:
+            return [X] * len(self.folds_)
+        return [StandardScaler().fit(X[train]).transform(X) for train, _ in self.folds_]
+
+    def fold_keys(self):
+        """SHA-256 of each fold's train and test index arrays, in order"""
+        keys = []
+        for train, test in self.folds_:
+            digest = hashlib.sha256()
+            digest.update(np.ascontiguousarray(train, dtype='int64').tobytes())
+            digest.update(b'|')
+            digest.update(np.ascontiguousarray(test, dtype='int64').tobytes())
+            keys.append(digest.hexdigest())
+        return keys
+
+    def fit(self, X, y, folds=None):
+        """
+        Run the search and refit the best candidate on all of X, y
+        
+        Args:
+            X, y: Training data
+            folds: Optional precomputed (train, test) index arrays to share
+                with other consumers (e.g. cross_validation.stratified_folds)
+
+        Returns:
+            SearchResult (best_estimator is also stored on self.best_estimator_)
+        """
+        if self.strategy not in SEARCH_STRATEGIES:
+            raise ValueError(f"strategy must be one of {SEARCH_STRATEGIES}, got {self.strategy!r}")
+        started = time.perf_counter()
+        X_input, y_input = X, y
+        X = np.asarray(X, dtype='float64')
+        y = np.asarray(y)
+        if folds is not None and len(folds) != self.cv:
+            raise ValueError(f"Expected {self.cv} folds, got {len(folds)}")
+        self.folds_ = list(folds) if folds is not None else self.folds(X, y)
+        data_key = self.data_hash(X, y)
+        self._fold_X = self.fold_matrices(X)
+        self._fold_keys = self.fold_keys()
+        candidates = list(ParameterGrid(self.param_grid))
+        self._fits = self._hits = 0
+
+        if self.strategy == 'grid':
+            scores = self._evaluate(X, y, data_key, range(len(candidates)), candidates, subsample=None)
+            results = self._results_frame(candidates, scores, resource=len(X))
+            survivors = list(range(len(candidates)))
+        else:
+            results, survivors, scores = self._successive_halving(X, y, data_key, candidates)
+
+        # Highest mean score wins; ties go to the earliest candidate, as in GridSearchCV
+        means = {i: np.mean([scores[i][fold]['score'] for fold in range(self.cv)]) for i in survivors}
+        best_index = max(survivors, key=lambda i: (means[i], -i))
+        best_params = candidates[best_index]
+
+        # Refit on the caller's objects so feature names carry over to the model
+        if self.scale:
+            X_scaled = StandardScaler().fit_transform(X)
+            X_input = (pd.DataFrame(X_scaled, columns=X_input.columns)
+                       if isinstance(X_input, pd.DataFrame) else X_scaled)
+        self.best_estimator_ = LogisticRegression(
+            **self._base_params(best_params), C=best_params.get('C', 1.0)
+        ).fit(X_input, y_input)
+        self._fold_X = self._fold_keys = None
+
+        return SearchResult(
+            strategy=self.strategy,
+            best_params=best_params,
+            best_score=float(means[best_index]),
+            results=results,
+            fits=self._fits,
+            cache_hits=self._hits,
+            seconds=time.perf_counter() - started,
+            best_estimator=self.best_estimator_,
+        )
+
+    def _base_params(self, params):
+        base = {key: value for key, value in params.items() if key != 'C'}
+        base.setdefault('random_state', self.random_state)
+        base.setdefault('max_iter', self.max_iter)
+        return base
+
+    def _key(self, data_key, fold, params, warm_path, subsample):
+        payload = json.dumps({
+            'data': data_key, 'fold': fold, 'fold_indices': self._fold_keys[fold],
+            'cv': self.cv, 'scoring': self.scoring,
+            'params': self._base_params(params), 'C': params.get('C', 1.0),
+            'warm_from': list(warm_path) if self.warm_start else None, 'subsample': subsample,
+            'scale': self.scale,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _cache_get(self, key):
+        if key in self._cache:
+            return self._cache[key]
+        if self.cache_dir is not None:
+            path = self.cache_dir / f'{key}.joblib'
+            if path.exists():
+                self._cache[key] = joblib.load(path)
+                return self._cache[key]
+        return None
+
+    def _cache_put(self, key, entry):
+        self._cache[key] = entry
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            joblib.dump(entry, self.cache_dir / f'{key}.joblib')
+
+    def _evaluate(self, X, y, data_key, indices, candidates, subsample):
+        """
+        Score the given candidates on every fold
+
+        Returns:
+            {candidate index: {fold: entry}}
+        """
+        # Group candidates that differ only in C into one warm-start path
+        paths = {}
+        for i in indices:
+            group = json.dumps(self._base_params(candidates[i]), sort_keys=True, default=str)
+            paths.setdefault(group, []).append(i)
+
+        tasks = []
+        keys = {}
+        for members in paths.values():
+            members = sorted(members, key=lambda i: candidates[i].get('C', 1.0))
+            base_params = self._base_params(candidates[members[0]])
+            path = [candidates[i].get('C', 1.0) for i in members]
+            for fold, (train, test) in enumerate(self.folds_):
+                fold_subsample = None if subsample is None else max(1, int(len(train) * subsample))
+                cached = {}
+                for position, (i, C) in enumerate(zip(members, path)):
+                    key = self._key(data_key, fold, candidates[i], path[:position], fold_subsample)
+                    keys[(i, fold)] = key
+                    entry = self._cache_get(key)
+                    if entry is not None:
+                        cached[C] = entry
+                        self._hits += 1
+                if len(cached) < len(path):
+                    tasks.append((members, fold, train, test, path, base_params, cached, fold_subsample))
+
+        if self.n_jobs == 1 or len(tasks) <= 1:
+            outputs = [_fit_path(self._fold_X[fold], y, train, test, path, base_params, self.scoring,
+                                 self.warm_start, cached, fold_subsample)
+                       for _, fold, train, test, path, base_params, cached, fold_subsample in tasks]
+        else:
+            outputs = Parallel(n_jobs=self.n_jobs)(
+                delayed(_fit_path)(self._fold_X[fold], y, train, test, path, base_params, self.scoring,
+                                   self.warm_start, cached, fold_subsample)
+                for _, fold, train, test, path, base_params, cached, fold_subsample in tasks
+            )
+
+        for (members, fold, *_rest), fitted in zip(tasks, outputs):
+            for i in members:
+                C = candidates[i].get('C', 1.0)
+                if C in fitted:
+                    self._cache_put(keys[(i, fold)], fitted[C])
+                    self._fits += 1
+
+        return {i: {fold: self._cache_get(keys[(i, fold)]) for fold in range(len(self.folds_))}
+                for i in indices}
+
+    def _successive_halving(self, X, y, data_key, candidates):
+        n_rounds = max(1, math.ceil(math.log(len(candidates), self.factor)) + 1) if len(candidates) > 1 else 1
+        # Training rows of each fold are shuffled once; rounds take growing prefixes
+        rng = np.random.default_rng(self.random_state)
+        self.folds_ = [(rng.permutation(train), test) for train, test in self.folds_]
+        self._fold_keys = self.fold_keys()
+
+        survivors = list(range(len(candidates)))
+        frames = []
+        for round_index in range(n_rounds):
+            fraction = float(self.factor) ** (round_index - (n_rounds - 1))
+            last = round_index == n_rounds - 1 or len(survivors) == 1
+            subsample = None if last else fraction
+            scores = self._evaluate(X, y, data_key, survivors, candidates, subsample)
+            frame = self._results_frame(
+                [candidates[i] for i in survivors], [scores[i] for i in survivors],
+                resource=len(X) if subsample is None else int(len(X) * subsample)
+            )
+            frame.insert(0, 'round', round_index)
+            frame.insert(1, 'candidate', survivors)
+            frames.append(frame)
+            if last:
+                break
+            means = {i: np.mean([scores[i][fold]['score'] for fold in range(self.cv)]) for i in survivors}
+            keep = max(1, math.ceil(len(survivors) / self.factor))
+            survivors = sorted(sorted(survivors, key=lambda i: (-means[i], i))[:keep])
+
+        return pd.concat(frames, ignore_index=True), survivors, scores
+
+    def _results_frame(self, candidates, scores, resource):
+        if isinstance(scores, dict):
+            scores = [scores[i] for i in range(len(candidates))]
+        rows = []
+        for params, folds in zip(candidates, scores):
+            fold_scores = [folds[fold]['score'] for fold in range(self.cv)]
+            rows.append({
+                'params': params,
+                'mean_score': float(np.mean(fold_scores)),
+                'std_score': float(np.std(fold_scores)),
+                'mean_fit_time': float(np.mean([folds[fold]['fit_time'] for fold in range(self.cv)])),
+                'mean_n_iter': float(np.mean([folds[fold]['n_iter'] for fold in range(self.cv)])),
+                'n_resources': resource,
+            })
+        return pd.DataFrame(rows)
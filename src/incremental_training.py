@@ -0,0 +1,236 @@
+"""
+Incremental Training Module for ABG Motors Market Entry Analysis
+Out-of-core training of the purchase model over chunked training files
+"""
+
+import hashlib
+import time
+
+import numpy as np
+from scipy.optimize import minimize
+from scipy.special import expit
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.preprocessing import StandardScaler
+
+from chunked_io import iter_table_chunks, table_columns
+from feature_engineering import FeatureEngineer
+
+
+INCREMENTAL_SOLVERS = ('lbfgs', 'sgd')
+
+
+class IncrementalTrainer:
+    """
+    Train the scaler + logistic regression without loading the training set
+
+    Pass 1 streams the file once to fit StandardScaler.partial_fit (running
+    mean/variance) and count the rows. The model is then trained with one of:
+
+    - 'lbfgs': full-batch L-BFGS where every loss/gradient evaluation is a
+      streamed pass over the chunks. It minimises the same objective as
+      LogisticRegression(C=C, solver='lbfgs'), so the result matches the
+      in-memory model up to the solver tolerance.
+    - 'sgd': SGDClassifier(loss='log_loss').partial_fit over chunks for a
+      number of epochs, rows shuffled within each chunk. Cheaper per epoch
+      for very large files, approximate.
+
+    Raw chunks (GENDER/AGE_CAR or DT_MAINT instead of model features) go
+    through FeatureEngineer.build_features first. Rows whose position hashes
+    below validation_fraction are held out and scored at the end with
+    streaming log-loss and accuracy, so memory stays bounded by chunk_size.
+    """
+
+    def __init__(self, feature_names, target_column='PURCHASE', solver='lbfgs', C=0.01,
+                 chunk_size=100000, max_epochs=100, tol=1e-6, validation_fraction=0.0,
+                 random_state=42, verbose=True):
+        """
+        Args:
+            feature_names: Model feature columns, in order
+            target_column: Binary target column
+            solver: 'lbfgs' (exact, streamed) or 'sgd' (partial_fit)
+            C: Inverse regularization strength, as in LogisticRegression
+            chunk_size: Rows per chunk
+            max_epochs: Maximum passes over the data (L-BFGS iterations for 'lbfgs')
+            tol: Convergence tolerance (gradient norm for 'lbfgs', loss change for 'sgd')
+            validation_fraction: Share of rows held out for evaluation
+            random_state: Seed for SGD and the within-chunk shuffles
+            verbose: Print progress
+        """
+        if solver not in INCREMENTAL_SOLVERS:
+            raise ValueError(f"solver must be one of {INCREMENTAL_SOLVERS}, got {solver!r}")
+        self.feature_names = list(feature_names)
+        self.target_column = target_column
+        self.solver = solver
+        self.C = C
+        self.chunk_size = chunk_size
+        self.max_epochs = max_epochs
+        self.tol = tol
+        self.validation_fraction = validation_fraction
+        self.random_state = random_state
+        self.verbose = verbose
+
+        self.scaler = None
+        self.model = None
+        self.n_rows = 0
+        self.passes = 0
+        self.history = []
+        self.validation = None
+        self.data_hash = None
+
+    def _chunks(self, source):
+        """Yield (scaled-ready feature frame, target array, training mask) per chunk"""
+        columns = table_columns(source)
+        raw = not set(self.feature_names).issubset(columns)
+        fe = FeatureEngineer(verbose=False) if raw else None
+        date_column = 'DT_MAINT' if raw and 'DT_MAINT' in columns else None
+
+        for chunk in iter_table_chunks(source, chunk_size=self.chunk_size):
+            if raw:
+                chunk = fe.build_features(chunk, date_column=date_column)
+            X = chunk[self.feature_names]
+            y = chunk[self.target_column].to_numpy()
+            yield X, y, self._training_mask(chunk.index.to_numpy())
+        self.passes += 1
+
+    def _training_mask(self, positions):
+        if not self.validation_fraction:
+            return np.ones(len(positions), dtype=bool)
+        # Multiplicative hash of the global row position: a fixed, order-free split
+        hashed = (positions.astype(np.uint64) * np.uint64(2654435761)) % np.uint64(2**32)
+        return hashed / 2**32 >= self.validation_fraction
+
+    def fit(self, source):
+        """
+        Train on a processed or raw CSV/Parquet file
+
+        Returns:
+            self
+        """
+        started = time.perf_counter()
+        self.passes = 0
+        self.history = []
+
+        # Pass 1: running mean/variance and class labels
+        self.scaler = StandardScaler()
+        classes = set()
+        self.n_rows = 0
+        digest = hashlib.sha256()
+        for X, y, train in self._chunks(source):
+            if train.any():
+                self.scaler.partial_fit(X[train])
+                classes.update(np.unique(y[train]).tolist())
+                self.n_rows += int(train.sum())
+                digest.update(np.ascontiguousarray(X[train], dtype='float64').tobytes())
+                digest.update(np.ascontiguousarray(y[train]).tobytes())
+        self.data_hash = digest.hexdigest()
+        if self.n_rows == 0:
+            raise ValueError(f"No training rows in {source}")
+        self.classes_ = np.array(sorted(classes))
+        if len(self.classes_) != 2:
+            raise ValueError(f"Expected a binary target, found classes {self.classes_.tolist()}")
+
+        if self.solver == 'lbfgs':
+            self.model = self._fit_lbfgs(source)
+        else:
+            self.model = self._fit_sgd(source)
+
+        if self.validation_fraction:
+            self.validation = self.evaluate(source)
+
+        if self.verbose:
+            print(f"\n✓ Incremental training ({self.solver}) finished: {self.n_rows:,} training rows, "
+                  f"{self.passes} passes over the data, {time.perf_counter() - started:.2f}s")
+            if self.validation:
+                print(f"  Holdout ({self.validation['rows']:,} rows): "
+                      f"log-loss {self.validation['log_loss']:.4f}, accuracy {self.validation['accuracy']:.4f}")
+        return self
+
+    def _positive(self, y):
+        return (y == self.classes_[1]).astype('float64')
+
+    def _fit_lbfgs(self, source):
+        """Full-batch L-BFGS over streamed loss/gradient evaluations"""
+        n_features = len(self.feature_names)
+
+        def loss_gradient(params):
+            # sklearn's objective divided by n: mean log-loss + ||w||^2 / (2 C n)
+            w, b = params[:-1], params[-1]
+            loss = 0.0
+            grad = np.zeros_like(params)
+            for X, y, train in self._chunks(source):
+                if not train.any():
+                    continue
+                Xs = self.scaler.transform(X[train])
+                target = self._positive(y[train])
+                z = Xs @ w + b
+                loss += np.sum(np.logaddexp(0, z) - target * z)
+                residual = expit(z) - target
+                grad[:-1] += Xs.T @ residual
+                grad[-1] += residual.sum()
+            loss = loss / self.n_rows + (w @ w) / (2 * self.C * self.n_rows)
+            grad /= self.n_rows
+            grad[:-1] += w / (self.C * self.n_rows)
+            self.history.append(loss)
+            return loss, grad
+
+        # ftol=0: stop on the gradient tolerance, not scipy's relative loss change
+        result = minimize(
+            loss_gradient, np.zeros(n_features + 1), method='L-BFGS-B', jac=True,
+            options={'maxiter': self.max_epochs, 'gtol': self.tol, 'ftol': 0.0}
+        )
+
+        model = LogisticRegression(C=self.C, max_iter=self.max_epochs, random_state=self.random_state)
+        model.coef_ = result.x[:-1].reshape(1, -1)
+        model.intercept_ = result.x[-1:].copy()
+        model.classes_ = self.classes_
+        model.n_features_in_ = n_features
+        model.n_iter_ = np.array([result.nit], dtype=np.int32)
+        return model
+
+    def _fit_sgd(self, source):
+        """SGDClassifier.partial_fit epochs with rows shuffled within each chunk"""
+        rng = np.random.default_rng(self.random_state)
+        model = SGDClassifier(loss='log_loss', penalty='l2', alpha=1 / (self.C * self.n_rows),
+                              random_state=self.random_state)
+        previous = np.inf
+        for epoch in range(self.max_epochs):
+            loss = 0.0
+            for X, y, train in self._chunks(source):
+                if not train.any():
+                    continue
+                Xs = self.scaler.transform(X[train])
+                target = y[train]
+                order = rng.permutation(len(target))
+                model.partial_fit(Xs[order], target[order], classes=self.classes_)
+                z = model.decision_function(Xs)
+                loss += np.sum(np.logaddexp(0, z) - self._positive(target) * z)
+            loss /= self.n_rows
+            self.history.append(loss)
+            if self.verbose:
+                print(f"  Epoch {epoch + 1}: mean log-loss {loss:.5f}")
+            if previous - loss < self.tol:
+                break
+            previous = loss
+        return model
+
+    def evaluate(self, source):
+        """
+        Streaming log-loss and accuracy on the held-out rows
+
+        Returns:
+            dict with rows, log_loss and accuracy
+        """
+        rows = correct = 0
+        loss = 0.0
+        for X, y, train in self._chunks(source):
+            holdout = ~train
+            if not holdout.any():
+                continue
+            z = self.model.decision_function(self.scaler.transform(X[holdout]))
+            target = self._positive(y[holdout])
+            loss += np.sum(np.logaddexp(0, z) - target * z)
+            correct += int(np.count_nonzero((z > 0) == (target == 1)))
+            rows += int(holdout.sum())
+        if rows == 0:
+            return None
+        return {'rows': rows, 'log_loss': loss / rows, 'accuracy': correct / rows}
@@ -3,21 +3,67 @@ Indian Market Predictor Module for ABG Motors Market Entry Analysis
 Applies trained model to Indian dataset and assesses market viability
 """
 
+import argparse
+
 import pandas as pd
 import numpy as np
 import joblib
 from pathlib import Path
 
+from compiled_scorer import CompiledScorer, COMPILED_SCORER_FILE
+from chunked_io import iter_table_chunks, table_columns, has_missing, ChunkWriter
+from feature_engineering import FeatureEngineer
+from market_aggregates import MarketAggregates, aggregate_predictions, group_codes
+from model_registry import ModelRegistry
+from model_backends import get_backend, read_backend
+from schema import INDIAN_SCHEMA
+from storage import EXPORT_FORMAT, read_table, write_table
+from uncertainty import simulate_purchase_totals
+
+
+SEGMENT_SECTIONS = (
+    ('AGE GROUP', 'AGE_GROUP'),
+    ('GENDER', 'GENDER'),
+    ('MAINTENANCE SEGMENT', 'AGE_CAR_SEGMENT'),
+    ('INCOME QUARTILE', 'INCOME_QUARTILE'),
+)
+TABLEAU_COLUMNS = [
+    'ID', 'CURR_AGE', 'GENDER', 'ANN_INCOME', 'AGE_CAR', 'AGE_CAR_SEGMENT',
+    'PURCHASE_PREDICTION', 'PURCHASE_PROBABILITY'
+]
+
 
 class IndianMarketPredictor:
     """Predict purchases in Indian market and assess viability"""
     
-    def __init__(self, model_dir='models'):
+    def __init__(self, model_dir='models', scorer='auto', dtype='float64', version=None):
+        """
+        Args:
+            model_dir: Directory with the saved model artifacts
+            scorer: 'compiled' (NumPy-only CompiledScorer), 'sklearn'
+                (pickled scaler + model) or 'auto' (compiled when the
+                artifact exists and was compiled from the current pkl
+                files, sklearn otherwise)
+            dtype: Scoring precision for the compiled scorer ('float64' or 'float32')
+            version: Registry version to load (defaults to the current one);
+                the flat files in model_dir are used when no registry exists,
+                and a warning is printed when they differ from the current one
+        """
+        if scorer not in ('auto', 'compiled', 'sklearn'):
+            raise ValueError(f"scorer must be 'auto', 'compiled' or 'sklearn', got {scorer!r}")
         self.model_dir = Path(model_dir)
+        self.scorer_mode = scorer
+        self.dtype = dtype
+        self.version = version
+        self.model_version = None
+        self.backend = None
         self.model = None
         self.scaler = None
+        self.scorer = None
         self.feature_names = None
         self.predictions = None
+        self.aggregates = None
+        self.simulation = None
         
     def load_model(self):
         """Load trained model and scaler"""
@@ -25,13 +71,60 @@ class IndianMarketPredictor:
         print("LOADING TRAINED MODEL")
         print("="*60)
         
-        self.model = joblib.load(self.model_dir / 'logistic_regression_model.pkl')
-        self.scaler = joblib.load(self.model_dir / 'feature_scaler.pkl')
+        artifact_dir = self.model_dir
+        registry = ModelRegistry(self.model_dir)
+        if self.version is not None or registry.exists():
+            artifact_dir = registry.version_dir(self.version)
+            self.model_version = artifact_dir.name
+            if self.version is None:
+                registry.warn_if_flat_differs(self.model_version)
+            self.backend = get_backend(registry.manifest(self.model_version).get('backend', 'logistic'))
+            if self.scorer_mode != 'sklearn' and self.backend.linear:
+                # Memory-mapped weights + JSON manifest from an immutable version
+                self.scorer, _ = registry.load_scorer(self.model_version, dtype=self.dtype)
+                self.feature_names = self.scorer.feature_names
+                
+                print(f"\n✓ Registry model {self.model_version} loaded successfully!")
+                print(f"  Features: {self.feature_names}")
+                print(f"  Precision: {self.scorer.dtype}")
+                return
+        
+        else:
+            self.backend = read_backend(self.model_dir)
+        
+        if self.scorer_mode == 'compiled' and not self.backend.linear:
+            raise ValueError(f"The compiled scorer needs a linear model; {self.model_dir} holds "
+                             f"a {self.backend.label} model (use scorer='auto' or 'sklearn')")
+        
+        compiled_file = artifact_dir / COMPILED_SCORER_FILE
+        if self.scorer_mode != 'sklearn' and self.backend.linear and compiled_file.exists():
+            # NumPy-only path: no unpickling, no sklearn import
+            pkl_files = [artifact_dir / self.backend.model_file, artifact_dir / 'feature_scaler.pkl']
+            self.scorer = CompiledScorer.load_current(compiled_file, pkl_files, dtype=self.dtype)
+            if self.scorer is None:
+                print(f"\n⚠ {compiled_file} was not compiled from the current pkl files; "
+                      f"loading the pkl files instead")
+        if self.scorer is not None:
+            self.feature_names = self.scorer.feature_names
+            
+            print(f"\n✓ Compiled scorer loaded successfully!")
+            print(f"  Features: {self.feature_names}")
+            print(f"  Precision: {self.scorer.dtype}")
+            return
+        
+        self.model = joblib.load(artifact_dir / self.backend.model_file)
+        self.scaler = joblib.load(artifact_dir / 'feature_scaler.pkl')
         
-        with open(self.model_dir / 'feature_names.txt', 'r') as f:
+        with open(artifact_dir / 'feature_names.txt', 'r') as f:
             self.feature_names = [line.strip() for line in f.readlines()]
         
+        if self.scorer_mode == 'compiled':
+            self.scorer = CompiledScorer.compile(
+                self.model, self.scaler, self.feature_names, dtype=self.dtype
+            )
+        
         print(f"\n✓ Model loaded successfully!")
+        print(f"  Model type: {self.backend.label}")
         print(f"  Features: {self.feature_names}")
         
     def predict_indian_market(self, indian_df):
@@ -49,16 +142,11 @@ class IndianMarketPredictor:
         print("="*60)
         
         # Extract features
-        X = indian_df[self.feature_names].copy()
+        X = indian_df[self.feature_names]
         
         print(f"\nIndian dataset shape: {X.shape}")
         
-        # Scale features
-        X_scaled = self.scaler.transform(X)
-        
-        # Make predictions
-        predictions = self.model.predict(X_scaled)
-        probabilities = self.model.predict_proba(X_scaled)[:, 1]
+        predictions, probabilities = self._score(X)
         
         # Add predictions to dataframe
         result_df = indian_df.copy()
@@ -66,6 +154,7 @@ class IndianMarketPredictor:
         result_df['PURCHASE_PROBABILITY'] = probabilities
         
         self.predictions = result_df
+        self.aggregates = None
         
         print(f"\n✓ Predictions completed!")
         print(f"  Total customers: {len(result_df):,}")
@@ -74,6 +163,20 @@ class IndianMarketPredictor:
         
         return result_df
     
+    def _score(self, X):
+        """Return (labels, probabilities) for a feature frame"""
+        if self.scorer is not None:
+            # Scaling, linear model and sigmoid in one fused pass
+            return self.scorer.score(X.to_numpy(dtype=self.scorer.dtype))
+        
+        # Scale features
+        X_scaled = self.scaler.transform(X)
+        
+        # Make predictions
+        predictions = self.model.predict(X_scaled)
+        probabilities = self.model.predict_proba(X_scaled)[:, 1]
+        return predictions, probabilities
+    
     def assess_market_viability(self, target_sales=10000):
         """
         Assess if Indian market can meet sales target
@@ -88,16 +191,29 @@ class IndianMarketPredictor:
         print("MARKET VIABILITY ASSESSMENT")
         print("="*60)
         
-        predicted_purchases = self.predictions['PURCHASE_PREDICTION'].sum()
-        total_customers = len(self.predictions)
-        purchase_rate = self.predictions['PURCHASE_PREDICTION'].mean()
+        return self._report_viability(self.aggregate(), target_sales)
+    
+    def aggregate(self):
+        """
+        Viability and segment aggregates of the current predictions
         
-        # Calculate confidence intervals using probability distribution
-        high_confidence = (self.predictions['PURCHASE_PROBABILITY'] >= 0.7).sum()
-        medium_confidence = ((self.predictions['PURCHASE_PROBABILITY'] >= 0.5) & 
-                            (self.predictions['PURCHASE_PROBABILITY'] < 0.7)).sum()
-        low_confidence = ((self.predictions['PURCHASE_PROBABILITY'] >= 0.3) & 
-                         (self.predictions['PURCHASE_PROBABILITY'] < 0.5)).sum()
+        Computed once per prediction run in a single pass (see
+        market_aggregates.aggregate_predictions) and shared by
+        assess_market_viability, segment_analysis and save_predictions.
+        """
+        if self.aggregates is None:
+            self.aggregates = aggregate_predictions(self.predictions)
+        return self.aggregates
+    
+    def _report_viability(self, aggregates, target_sales):
+        """Build and print the viability assessment from MarketAggregates"""
+        total_customers = aggregates.rows
+        predicted_purchases = aggregates.purchases
+        purchase_rate = aggregates.purchase_rate
+        confidence = aggregates.confidence_counts
+        high_confidence = confidence['high']
+        medium_confidence = confidence['medium']
+        low_confidence = confidence['low']
         
         assessment = {
             'total_customers': total_customers,
@@ -146,80 +262,288 @@ class IndianMarketPredictor:
         
         return assessment
     
+    def simulate_sales(self, target_sales=10000, n_replicates=10000, bootstrap_probabilities=None,
+                       n_workers=1, random_state=42):
+        """
+        Monte Carlo error bars on total purchases
+        
+        Instead of counting hard-thresholded predictions, each replicate
+        draws a Bernoulli purchase per customer from PURCHASE_PROBABILITY
+        (see uncertainty.simulate_purchase_totals). Passing the output of
+        ModelBuilder.bootstrap_probabilities adds model uncertainty on top
+        of outcome uncertainty.
+        
+        Args:
+            target_sales: Minimum required sales
+            n_replicates: Number of simulated markets
+            bootstrap_probabilities: Optional (n_bootstrap, n_customers) matrix
+            n_workers: Worker processes for the simulation
+            random_state: Seed
+            
+        Returns:
+            SimulationResult
+        """
+        print("\n" + "="*60)
+        print("SALES UNCERTAINTY (MONTE CARLO)")
+        print("="*60)
+        
+        probabilities = bootstrap_probabilities
+        if probabilities is None:
+            probabilities = self.predictions['PURCHASE_PROBABILITY'].to_numpy()
+        
+        result = simulate_purchase_totals(
+            probabilities, n_replicates=n_replicates, target_sales=target_sales,
+            n_workers=n_workers, random_state=random_state
+        )
+        self.simulation = result
+        
+        low, high = result.interval(0.9)
+        source = f"{result.n_bootstrap} bootstrap refits" if result.n_bootstrap else "fitted model"
+        print(f"\n📊 SIMULATED SALES ({result.n_replicates:,} replicates, {source}):")
+        print(f"  Expected sales: {result.expected_sales:,.0f} cars/year")
+        print(f"  Mean ± std: {result.mean:,.0f} ± {result.std:,.0f}")
+        print(f"  90% interval: {low:,.0f} - {high:,.0f}")
+        print(f"  Median: {result.quantiles.get(0.5, np.median(result.totals)):,.0f}")
+        print(f"  P(sales ≥ {target_sales:,}): {result.prob_target_met:.2%}")
+        print(f"  Simulated in {result.seconds:.2f}s")
+        
+        return result
+    
     def segment_analysis(self):
         """Analyze predictions by customer segments"""
         print("\n" + "="*60)
         print("SEGMENTATION ANALYSIS")
         print("="*60)
         
-        # By Age Group
-        print("\n📊 BY AGE GROUP:")
-        age_bins = [0, 30, 40, 50, 60, 100]
-        age_labels = ['<30', '30-40', '40-50', '50-60', '60+']
-        self.predictions['AGE_GROUP'] = pd.cut(
-            self.predictions['CURR_AGE'], bins=age_bins, labels=age_labels
-        )
-        
-        age_analysis = self.predictions.groupby('AGE_GROUP').agg({
-            'PURCHASE_PREDICTION': ['count', 'sum', 'mean']
-        }).round(4)
-        print(age_analysis)
-        
-        # By Gender
-        print("\n📊 BY GENDER:")
-        gender_analysis = self.predictions.groupby('GENDER').agg({
-            'PURCHASE_PREDICTION': ['count', 'sum', 'mean']
-        }).round(4)
-        print(gender_analysis)
-        
-        # By Maintenance Segment
-        print("\n📊 BY MAINTENANCE SEGMENT:")
-        segment_analysis = self.predictions.groupby('AGE_CAR_SEGMENT').agg({
-            'PURCHASE_PREDICTION': ['count', 'sum', 'mean']
-        }).round(4)
-        print(segment_analysis)
-        
-        # By Income Quartile
-        print("\n📊 BY INCOME QUARTILE:")
-        self.predictions['INCOME_QUARTILE'] = pd.qcut(
-            self.predictions['ANN_INCOME'], q=4, labels=['Q1 (Low)', 'Q2', 'Q3', 'Q4 (High)']
-        )
-        income_analysis = self.predictions.groupby('INCOME_QUARTILE').agg({
-            'PURCHASE_PREDICTION': ['count', 'sum', 'mean']
-        }).round(4)
-        print(income_analysis)
+        aggregates = self.aggregate()
+        for title, name in SEGMENT_SECTIONS:
+            print(f"\n📊 BY {title}:")
+            print(aggregates.group_table(name))
     
-    def save_predictions(self, output_dir='data/processed'):
-        """Save predictions to CSV"""
-        output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
+    def save_predictions(self, output_dir='data/processed', fmt=None, tableau_format=EXPORT_FORMAT):
+        """
+        Save predictions, and the Tableau feed of them
         
-        # Save full predictions
-        predictions_file = output_path / 'indian_predictions.csv'
-        self.predictions.to_csv(predictions_file, index=False)
+        Args:
+            output_dir: Directory for the full predictions table
+            fmt: Storage format of the full predictions (see storage.FORMATS;
+                Parquet by default, which keeps the AGE_GROUP/INCOME_QUARTILE
+                categoricals and integer widths)
+            tableau_format: Format of data/tableau/indian_market_predictions
         
-        # Save summary for Tableau
-        tableau_file = Path('data/tableau') / 'indian_market_predictions.csv'
-        tableau_file.parent.mkdir(parents=True, exist_ok=True)
+        Returns:
+            (predictions path, Tableau feed path)
+        """
+        # Save full predictions, labelled with the age group and income quartile
+        income_edges = self.aggregate().income_edges
+        columns = {name: self.predictions[name] for name in self.predictions.columns}
+        for name in ('AGE_GROUP', 'INCOME_QUARTILE'):
+            codes, labels = group_codes(self.predictions, name, income_edges)
+            columns[name] = pd.Categorical.from_codes(codes, categories=list(labels))
+        predictions_file = write_table(
+            pd.DataFrame(columns, index=self.predictions.index),
+            Path(output_dir) / 'indian_predictions', fmt
+        )
         
+        # Save summary for Tableau
         tableau_df = self.predictions[[
             'ID', 'CURR_AGE', 'GENDER', 'ANN_INCOME', 'AGE_CAR', 'AGE_CAR_SEGMENT',
             'PURCHASE_PREDICTION', 'PURCHASE_PROBABILITY'
-        ]].copy()
-        tableau_df.to_csv(tableau_file, index=False)
+        ]]
+        tableau_file = write_table(tableau_df, Path('data/tableau') / 'indian_market_predictions', tableau_format)
         
         print(f"\n✓ Predictions saved to: {predictions_file}")
         print(f"✓ Tableau data saved to: {tableau_file}")
+        return predictions_file, tableau_file
+    
+    def predict_file(self, source, output_dir='data/processed', tableau_dir='data/tableau',
+                     chunk_size=100000, target_sales=10000, output_format='csv',
+                     income_sample_size=100000, random_state=42):
+        """
+        Out-of-core scoring for prospect files larger than memory
+        
+        Reads a processed or raw (DT_MAINT not yet converted) CSV/Parquet
+        file in chunks, builds features when needed, scores each chunk and
+        appends it to the predictions and Tableau files. Each chunk is reduced
+        with aggregate_predictions and merged into a running total, so
+        memory is bounded by chunk_size and no per-row results are kept.
+        
+        Income quartiles need global quantiles; they are computed from a
+        uniform reservoir sample of income_sample_size rows (exact when the
+        file has no more rows than that). Because quartiles are not known
+        while streaming, the predictions file has AGE_GROUP but no
+        INCOME_QUARTILE column.
+        
+        Args:
+            source: Processed or raw Indian .csv/.parquet file
+            output_dir: Directory for indian_predictions.<format>
+            tableau_dir: Directory for indian_market_predictions.<format>
+            chunk_size: Rows per chunk
+            target_sales: Minimum required sales
+            output_format: 'csv' or 'parquet'
+            income_sample_size: Reservoir size for the income quartiles
+            random_state: Seed for the reservoir sample
+            
+        Returns:
+            dict with rows, chunks, the viability assessment and the segment tables
+        """
+        if output_format not in ('csv', 'parquet'):
+            raise ValueError(f"output_format must be 'csv' or 'parquet', got {output_format!r}")
+        if self.feature_names is None:
+            self.load_model()
+        
+        source_columns = table_columns(source)
+        raw = not set(self.feature_names).issubset(source_columns)
+        fe = FeatureEngineer(verbose=False) if raw else None
+        
+        # The writers pin dtypes on the first chunk; AGE_CAR is int64 there
+        # unless a date is missing, so decide it for the whole file up front
+        dtypes = {}
+        age_source = 'DT_MAINT' if raw else 'AGE_CAR'
+        if age_source in source_columns:
+            missing = has_missing(source, age_source, chunk_size=chunk_size)
+            dtypes['AGE_CAR'] = 'float64' if missing else 'int64'
+        
+        print("\n" + "="*60)
+        print("STREAMING INDIAN MARKET PREDICTION")
+        print("="*60)
+        print(f"  Source: {source} ({'raw' if raw else 'processed'})")
+        print(f"  Chunk size: {chunk_size:,} rows")
+        
+        predictions_file = Path(output_dir) / f'indian_predictions.{output_format}'
+        tableau_file = Path(tableau_dir) / f'indian_market_predictions.{output_format}'
+        
+        rng = np.random.default_rng(random_state)
+        income_sample = np.empty(income_sample_size, dtype='float64')
+        purchase_sample = np.empty(income_sample_size, dtype='int64')
+        sampled = 0
+        
+        streamed_groups = ('AGE_GROUP', 'GENDER', 'AGE_CAR_SEGMENT')
+        aggregates = None
+        chunks = 0
+        
+        with ChunkWriter(predictions_file, dtypes=dtypes) as writer, \
+                ChunkWriter(tableau_file, dtypes=dtypes) as tableau_writer:
+            for chunk in iter_table_chunks(source, chunk_size=chunk_size,
+                                           schema=INDIAN_SCHEMA if raw else None):
+                if raw:
+                    chunk = fe.build_features(chunk, date_column='DT_MAINT')
+                
+                labels, probabilities = self._score(chunk[self.feature_names])
+                labels = np.asarray(labels).astype(np.int64, copy=False)
+                age_codes, age_labels = group_codes(chunk, 'AGE_GROUP')
+                
+                columns = {name: chunk[name] for name in chunk.columns}
+                columns['PURCHASE_PREDICTION'] = labels
+                columns['PURCHASE_PROBABILITY'] = probabilities
+                columns['AGE_GROUP'] = pd.Categorical.from_codes(age_codes, categories=list(age_labels))
+                scored = pd.DataFrame(columns, index=chunk.index)
+                writer.write(scored)
+                tableau_writer.write(scored[TABLEAU_COLUMNS])
+                
+                part = aggregate_predictions(scored, groups=streamed_groups)
+                aggregates = part if aggregates is None else aggregates.merge(part)
+                
+                sampled = self._reservoir_update(
+                    rng, sampled, income_sample, purchase_sample,
+                    chunk['ANN_INCOME'].to_numpy(dtype='float64'), labels
+                )
+                chunks += 1
+        
+        if aggregates is None:
+            aggregates = MarketAggregates()
+        
+        print(f"\n✓ Predictions completed!")
+        print(f"  Total customers: {aggregates.rows:,} in {chunks} chunks")
+        print(f"  Predicted purchases: {aggregates.purchases:,}")
+        print(f"  Predicted purchase rate: {aggregates.purchase_rate:.2%}")
+        
+        print("\n" + "="*60)
+        print("MARKET VIABILITY ASSESSMENT")
+        print("="*60)
+        assessment = self._report_viability(aggregates, target_sales)
+        
+        print("\n" + "="*60)
+        print("SEGMENTATION ANALYSIS")
+        print("="*60)
+        tables = {name: aggregates.group_table(name) for name in aggregates.groups}
+        
+        sample_rows = min(sampled, income_sample_size)
+        if sample_rows:
+            sample = pd.DataFrame({
+                'ANN_INCOME': income_sample[:sample_rows],
+                'PURCHASE_PREDICTION': purchase_sample[:sample_rows],
+            })
+            income = aggregate_predictions(sample, groups=('INCOME_QUARTILE',))
+            tables['INCOME_QUARTILE'] = income.group_table('INCOME_QUARTILE')
+        
+        for title, name in SEGMENT_SECTIONS:
+            if name not in tables:
+                continue
+            print(f"\n📊 BY {title}:")
+            if name == 'INCOME_QUARTILE' and sampled > income_sample_size:
+                print(f"  (estimated from a {income_sample_size:,}-row sample of {sampled:,})")
+            print(tables[name])
+        
+        print(f"\n✓ Predictions saved to: {predictions_file}")
+        print(f"✓ Tableau data saved to: {tableau_file}")
+        
+        return {'rows': aggregates.rows, 'chunks': chunks, 'assessment': assessment, 'segments': tables}
+    
+    @staticmethod
+    def _reservoir_update(rng, seen, income_sample, purchase_sample, income, labels):
+        """
+        Vectorized reservoir sampling (Algorithm R) of (income, label) pairs
+        
+        Returns:
+            Number of rows seen so far
+        """
+        size = len(income_sample)
+        fill = max(0, min(size - seen, len(income)))
+        income_sample[seen:seen + fill] = income[:fill]
+        purchase_sample[seen:seen + fill] = labels[:fill]
+        if fill < len(income):
+            # Row number t (0-based) replaces a random slot with probability size / (t + 1)
+            positions = seen + np.arange(fill, len(income))
+            slots = rng.integers(0, positions + 1)
+            keep = slots < size
+            income_sample[slots[keep]] = income[fill:][keep]
+            purchase_sample[slots[keep]] = labels[fill:][keep]
+        return seen + len(income)
 
 
-def main():
+def main(argv=None):
     """Main execution function"""
+    parser = argparse.ArgumentParser(description='ABG Motors Indian market prediction')
+    parser.add_argument('--stream', metavar='SOURCE',
+                        help='Score a raw or processed CSV/Parquet file in chunks '
+                             'instead of loading it into memory')
+    parser.add_argument('--chunk-size', type=int, default=100000)
+    parser.add_argument('--format', choices=('csv', 'parquet'), default='csv',
+                        help='Output format for --stream')
+    parser.add_argument('--target-sales', type=int, default=10000)
+    args = parser.parse_args(argv)
+    
     print("="*60)
     print("ABG MOTORS - INDIAN MARKET PREDICTION MODULE")
     print("="*60)
     
-    # Load processed Indian data
-    indian_df = pd.read_csv('data/processed/indian_processed.csv')
+    if args.stream:
+        predictor = IndianMarketPredictor(model_dir='models')
+        predictor.load_model()
+        summary = predictor.predict_file(
+            args.stream, chunk_size=args.chunk_size,
+            target_sales=args.target_sales, output_format=args.format
+        )
+        
+        print("\n" + "="*60)
+        print("INDIAN MARKET PREDICTION COMPLETED!")
+        print("="*60)
+        
+        return predictor, summary['assessment']
+    
+    # Load processed Indian data (whichever format feature engineering wrote)
+    indian_df = read_table('data/processed/indian_processed')
     
     # Initialize predictor
     predictor = IndianMarketPredictor(model_dir='models')
@@ -231,7 +555,7 @@ def main():
     predictions = predictor.predict_indian_market(indian_df)
     
     # Assess market viability
-    assessment = predictor.assess_market_viability(target_sales=10000)
+    assessment = predictor.assess_market_viability(target_sales=args.target_sales)
     
     # Segment analysis
     predictor.segment_analysis()
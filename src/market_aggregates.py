@@ -0,0 +1,194 @@
+"""
+Market Aggregates Module for ABG Motors Market Entry Analysis
+Single-pass, mergeable aggregation of scored prospects for viability and segment reporting
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from feature_config import AGE_CAR_THRESHOLDS
+
+
+AGE_BINS = (0, 30, 40, 50, 60, 100)
+AGE_LABELS = ('<30', '30-40', '40-50', '50-60', '60+')
+INCOME_LABELS = ('Q1 (Low)', 'Q2', 'Q3', 'Q4 (High)')
+GENDER_LABELS = ('F', 'M')
+
+# PURCHASE_PROBABILITY band edges: low [0.3, 0.5), medium [0.5, 0.7), high >= 0.7
+CONFIDENCE_EDGES = (0.3, 0.5, 0.7)
+CONFIDENCE_BANDS = ('below_low', 'low', 'medium', 'high')
+
+GROUPS = ('AGE_GROUP', 'GENDER', 'AGE_CAR_SEGMENT', 'INCOME_QUARTILE')
+
+
+@dataclass
+class GroupAggregate:
+    """Row count and predicted purchases per level of one grouping"""
+    labels: tuple
+    counts: np.ndarray
+    sums: np.ndarray
+
+    @property
+    def means(self):
+        return np.divide(self.sums, self.counts, out=np.full(len(self.counts), np.nan),
+                         where=self.counts > 0)
+
+    def merge(self, other):
+        if tuple(self.labels) != tuple(other.labels):
+            raise ValueError(f"Cannot merge groups with labels {self.labels} and {other.labels}")
+        return GroupAggregate(self.labels, self.counts + other.counts, self.sums + other.sums)
+
+
+@dataclass
+class MarketAggregates:
+    """
+    Structured result of aggregate_predictions
+
+    Every field is a count or a sum, so aggregates of disjoint chunks or
+    worker partitions combine exactly with merge().
+    """
+    rows: int = 0
+    purchases: int = 0
+    band_counts: np.ndarray = field(default_factory=lambda: np.zeros(len(CONFIDENCE_BANDS), dtype=np.int64))
+    groups: dict = field(default_factory=dict)
+    income_edges: tuple = None
+
+    @property
+    def purchase_rate(self):
+        return self.purchases / self.rows if self.rows else 0.0
+
+    @property
+    def confidence_counts(self):
+        """Buyers per confidence band, keyed like CONFIDENCE_BANDS"""
+        return {band: int(count) for band, count in zip(CONFIDENCE_BANDS, self.band_counts)}
+
+    def merge(self, other):
+        """Combine with the aggregates of a disjoint set of rows"""
+        if set(self.groups) != set(other.groups):
+            raise ValueError(f"Cannot merge aggregates over {sorted(self.groups)} and {sorted(other.groups)}")
+        if self.income_edges != other.income_edges:
+            raise ValueError("Cannot merge income quartiles computed with different edges; "
+                             "pass the same income_edges to every partition")
+        return MarketAggregates(
+            rows=self.rows + other.rows,
+            purchases=self.purchases + other.purchases,
+            band_counts=self.band_counts + other.band_counts,
+            groups={name: group.merge(other.groups[name]) for name, group in self.groups.items()},
+            income_edges=self.income_edges,
+        )
+
+    @classmethod
+    def merge_all(cls, parts):
+        parts = list(parts)
+        if not parts:
+            return cls()
+        merged = parts[0]
+        for part in parts[1:]:
+            merged = merged.merge(part)
+        return merged
+
+    def group_table(self, name):
+        """count/sum/mean table for one grouping, shaped like groupby(...).agg([...]).round(4)"""
+        group = self.groups[name]
+        table = pd.DataFrame({
+            ('PURCHASE_PREDICTION', 'count'): group.counts,
+            ('PURCHASE_PREDICTION', 'sum'): group.sums,
+            ('PURCHASE_PREDICTION', 'mean'): group.means,
+        }, index=pd.Index(list(group.labels), name=name))
+        return table.round(4)
+
+
+def income_quartile_edges(income):
+    """Quartile bin edges as pd.qcut(income, q=4) computes them"""
+    income = np.asarray(income, dtype='float64')
+    return tuple(float(edge) for edge in np.nanquantile(income, [0, 0.25, 0.5, 0.75, 1]))
+
+
+def group_codes(df, name, income_edges=None, age_car_thresholds=AGE_CAR_THRESHOLDS):
+    """
+    Integer codes and labels for one grouping; -1 marks rows outside every level
+
+    AGE_GROUP and INCOME_QUARTILE use right-closed bins like pd.cut/pd.qcut
+    (the lowest income edge is included, as qcut does).
+    """
+    if name == 'AGE_GROUP':
+        age = df['CURR_AGE'].to_numpy(dtype='float64', na_value=np.nan)
+        codes = np.searchsorted(AGE_BINS, age, side='left') - 1
+        codes[(codes >= len(AGE_LABELS)) | np.isnan(age)] = -1
+        return codes, AGE_LABELS
+
+    if name == 'GENDER':
+        codes = pd.Categorical(df['GENDER'], categories=GENDER_LABELS).codes
+        return codes.astype(np.intp), GENDER_LABELS
+
+    if name == 'AGE_CAR_SEGMENT':
+        labels = tuple(range(1, len(age_car_thresholds) + 2))
+        codes = df['AGE_CAR_SEGMENT'].to_numpy().astype(np.intp) - 1
+        codes[(codes < 0) | (codes >= len(labels))] = -1
+        return codes, labels
+
+    if name == 'INCOME_QUARTILE':
+        income = df['ANN_INCOME'].to_numpy(dtype='float64', na_value=np.nan)
+        codes = np.searchsorted(income_edges, income, side='left') - 1
+        codes[income == income_edges[0]] = 0
+        codes[(codes >= len(INCOME_LABELS)) | np.isnan(income)] = -1
+        return codes, INCOME_LABELS
+
+    raise ValueError(f"Unknown grouping {name!r}; expected one of {GROUPS}")
+
+
+def aggregate_predictions(df, groups=GROUPS, income_edges=None, age_car_thresholds=AGE_CAR_THRESHOLDS):
+    """
+    Compute every viability and segment statistic in one vectorized pass
+
+    Each grouping is reduced to integer codes once, and the per-level row
+    counts and predicted purchases come from two bincounts over those codes;
+    confidence bands are a searchsorted of PURCHASE_PROBABILITY against the
+    band edges followed by one bincount (NaN or infinite probabilities are
+    not counted in any band). No columns are added to df.
+
+    Income quartiles depend on the whole population. For chunked or
+    partitioned use, compute income_quartile_edges once (or from a sample)
+    and pass the same edges to every partition so the results can be merged.
+
+    Args:
+        df: Scored DataFrame with PURCHASE_PREDICTION, the columns the
+            requested groups need and (for the band counts) PURCHASE_PROBABILITY
+        groups: Groupings to compute, any of GROUPS
+        income_edges: INCOME_QUARTILE bin edges (defaults to the quartiles of df)
+        age_car_thresholds: AGE_CAR segment boundaries (sets the segment levels)
+
+    Returns:
+        MarketAggregates
+    """
+    labels = df['PURCHASE_PREDICTION'].to_numpy().astype(np.int64)
+    result = MarketAggregates(rows=len(df), purchases=int(labels.sum()))
+
+    if 'PURCHASE_PROBABILITY' in df:
+        probabilities = df['PURCHASE_PROBABILITY'].to_numpy(dtype='float64', na_value=np.nan)
+        # searchsorted places NaN after every edge, i.e. in the 'high' band
+        probabilities = probabilities[np.isfinite(probabilities)]
+        bands = np.searchsorted(CONFIDENCE_EDGES, probabilities, side='right')
+        result.band_counts = np.bincount(bands, minlength=len(CONFIDENCE_BANDS)).astype(np.int64)
+
+    if 'INCOME_QUARTILE' in groups:
+        if income_edges is None:
+            income_edges = income_quartile_edges(df['ANN_INCOME']) if len(df) else None
+        result.income_edges = tuple(income_edges) if income_edges is not None else None
+
+    for name in groups:
+        if name == 'INCOME_QUARTILE' and result.income_edges is None:
+            codes, levels = np.zeros(0, dtype=np.intp), INCOME_LABELS
+            valid = np.zeros(0, dtype=bool)
+        else:
+            codes, levels = group_codes(df, name, result.income_edges, age_car_thresholds)
+            valid = codes >= 0
+        result.groups[name] = GroupAggregate(
+            labels=levels,
+            counts=np.bincount(codes[valid], minlength=len(levels)).astype(np.int64),
+            sums=np.bincount(codes[valid], weights=labels[valid], minlength=len(levels)).astype(np.int64),
+        )
+
+    return result
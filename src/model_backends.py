@@ -0,0 +1,160 @@
+"""
+Model Backends Module for ABG Motors Market Entry Analysis
+Interchangeable classifiers (logistic regression, random forest, XGBoost) for ModelBuilder
+"""
+
+import importlib
+import os
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+BACKEND_FILE = 'model_backend.txt'
+
+
+@dataclass(frozen=True)
+class ModelBackend:
+    """
+    One trainable model family
+
+    Attributes:
+        name: Registry/CLI name
+        label: Human-readable name for reports
+        model_file: Pickle file name in the model directory
+        linear: Exposes coef_/intercept_ (compiled scorer, coefficient report)
+        estimator: Dotted path of the estimator class, imported on first
+            use so that looking up a backend (e.g. while loading a compiled
+            model) never imports sklearn or xgboost
+        default_params: Parameters used by train_model/compare_backends
+        param_grid: Default tuning grid
+    """
+    name: str
+    label: str
+    model_file: str
+    linear: bool
+    estimator: str
+    default_params: dict = field(default_factory=dict)
+    param_grid: dict = field(default_factory=dict)
+
+    def estimator_class(self):
+        module, name = self.estimator.rsplit('.', 1)
+        try:
+            return getattr(importlib.import_module(module), name)
+        except ImportError as exc:
+            package = module.split('.')[0]
+            raise ImportError(f"The {self.name!r} backend needs the {package} package "
+                              f"(pip install {package})") from exc
+
+    def build(self, random_state=42, **params):
+        """Unfitted estimator with the default parameters overridden by params"""
+        return self.estimator_class()(**{**self.default_params, 'random_state': random_state, **params})
+
+    def available(self):
+        try:
+            self.estimator_class()
+        except ImportError:
+            return False
+        return True
+
+
+BACKENDS = {
+    'logistic': ModelBackend(
+        name='logistic',
+        label='Logistic Regression',
+        model_file='logistic_regression_model.pkl',
+        linear=True,
+        estimator='sklearn.linear_model.LogisticRegression',
+        default_params={'C': 1.0, 'max_iter': 1000, 'solver': 'lbfgs'},
+        param_grid={'C': [0.01, 0.1, 1.0, 10.0, 100.0], 'penalty': ['l2'], 'solver': ['lbfgs']},
+    ),
+    'random_forest': ModelBackend(
+        name='random_forest',
+        label='Random Forest',
+        model_file='random_forest_model.pkl',
+        linear=False,
+        estimator='sklearn.ensemble.RandomForestClassifier',
+        default_params={'n_estimators': 200, 'min_samples_leaf': 20, 'n_jobs': -1},
+        param_grid={'max_depth': [6, 10, None], 'min_samples_leaf': [10, 50]},
+    ),
+    'xgboost': ModelBackend(
+        name='xgboost',
+        label='XGBoost (hist)',
+        model_file='xgboost_model.pkl',
+        linear=False,
+        estimator='xgboost.XGBClassifier',
+        # Histogram tree method, every core
+        default_params={'n_estimators': 300, 'learning_rate': 0.05, 'max_depth': 4,
+                        'tree_method': 'hist', 'n_jobs': os.cpu_count() or 1,
+                        'eval_metric': 'logloss'},
+        param_grid={'max_depth': [3, 4, 6], 'learning_rate': [0.05, 0.1]},
+    ),
+}
+
+
+def get_backend(name):
+    """Look up a backend by name (or pass a ModelBackend through)"""
+    if isinstance(name, ModelBackend):
+        return name
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown model backend {name!r}; expected one of {tuple(BACKENDS)}") from None
+
+
+def read_backend(model_dir):
+    """Backend recorded next to flat model artifacts (logistic when absent)"""
+    try:
+        with open(os.path.join(model_dir, BACKEND_FILE)) as f:
+            return get_backend(f.read().strip())
+    except FileNotFoundError:
+        return BACKENDS['logistic']
+
+
+def _best_of(repeats, func):
+    best = np.inf
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def compare_backends(X_train, y_train, X_val, y_val, backends=tuple(BACKENDS),
+                     random_state=42, n_repeats=3):
+    """
+    Training and inference throughput of each backend on the same split
+
+    Every backend is trained once with its default parameters; inference
+    is the best of n_repeats predict_proba calls over X_val. Backends whose
+    package is not installed are skipped.
+
+    Returns:
+        DataFrame with one row per backend: fit seconds, training and
+        inference rows per second, validation ROC-AUC
+    """
+    import pandas as pd
+    from cross_validation import rank_roc_auc
+
+    rows = []
+    for name in backends:
+        backend = get_backend(name)
+        if not backend.available():
+            continue
+        model = backend.build(random_state)
+
+        started = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - started
+
+        predict_seconds, probabilities = _best_of(n_repeats, lambda: model.predict_proba(X_val)[:, 1])
+        rows.append({
+            'backend': backend.name,
+            'fit_seconds': fit_seconds,
+            'train_rows_per_s': len(X_train) / fit_seconds,
+            'predict_ms': predict_seconds * 1000,
+            'predict_rows_per_s': len(X_val) / predict_seconds,
+            'roc_auc': rank_roc_auc(np.asarray(y_val) == 1, probabilities),
+        })
+    return pd.DataFrame(rows)
@@ -3,27 +3,52 @@ Model Builder Module for ABG Motors Market Entry Analysis
 Builds and trains classification model to predict car purchases
 """
 
+import argparse
+import time
+import warnings
+
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
+from sklearn.model_selection import train_test_split, GridSearchCV
 from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import (
-    accuracy_score, precision_score, recall_score, f1_score, 
-    roc_auc_score, confusion_matrix, classification_report, roc_curve
-)
+from sklearn.pipeline import Pipeline
+from sklearn.base import clone
+from sklearn.metrics import confusion_matrix, classification_report
 import joblib
+from joblib import Parallel, delayed
 from pathlib import Path
-import warnings
+
+from compiled_scorer import CompiledScorer, COMPILED_SCORER_FILE
+from hyperparameter_search import LogisticRegressionSearch, SearchResult
+from cross_validation import stratified_folds, binary_metrics, cross_validate_pipeline
+from incremental_training import IncrementalTrainer
+from model_registry import ModelRegistry, training_data_hash
+from model_backends import BACKENDS, BACKEND_FILE, get_backend, compare_backends
+from storage import read_table
+
 warnings.filterwarnings('ignore')
 
 
+def _bootstrap_refit(estimator, X, y, X_score, seed):
+    """Refit a clone of estimator on one bootstrap resample and score X_score"""
+    rows = np.random.default_rng(seed).integers(0, len(X), len(X))
+    model = clone(estimator).fit(X.iloc[rows], y.iloc[rows])
+    return model.predict_proba(X_score)[:, 1]
+
+
 class ModelBuilder:
     """Build and train classification model for purchase prediction"""
     
-    def __init__(self, random_state=42):
+    def __init__(self, random_state=42, backend='logistic'):
+        """
+        Args:
+            random_state: Seed for splits and models
+            backend: Model family - 'logistic', 'random_forest' or 'xgboost'
+                (see model_backends.BACKENDS)
+        """
         self.random_state = random_state
+        self.backend = get_backend(backend)
         self.model = None
         self.scaler = None
         self.feature_names = None
@@ -31,6 +56,14 @@ class ModelBuilder:
         self.X_val = None
         self.y_train = None
         self.y_val = None
+        self.X_train_raw = None
+        self.X_val_raw = None
+        self.folds = None
+        self.search = None
+        self.search_result = None
+        self.incremental = None
+        self.metrics = None
+        self.model_version = None
         
     def prepare_data(self, df, feature_columns, target_column='PURCHASE', test_size=0.3):
         """
@@ -80,6 +113,12 @@ class ModelBuilder:
         self.y_train = y_train.reset_index(drop=True)
         self.y_val = y_val.reset_index(drop=True)
         
+        # Unscaled copies for per-fold scaling, and one set of fold indices
+        # shared by tuning and cross-validation
+        self.X_train_raw = X_train.reset_index(drop=True)
+        self.X_val_raw = X_val.reset_index(drop=True)
+        self.folds = stratified_folds(self.y_train, n_splits=5)
+        
         return self.X_train, self.X_val, self.y_train, self.y_val
     
     def train_logistic_regression(self, C=1.0):
@@ -111,9 +150,98 @@ class ModelBuilder:
         
         return self.model
     
-    def tune_hyperparameters(self):
+    def train_model(self, **params):
+        """
+        Train the configured backend on the prepared training set
+        
+        Args:
+            **params: Estimator parameters overriding the backend defaults
+            
+        Returns:
+            Trained model
+        """
+        if self.backend.name == 'logistic':
+            return self.train_logistic_regression(**params)
+        
+        print("\n" + "="*60)
+        print(f"TRAINING {self.backend.label.upper()} MODEL")
+        print("="*60)
+        
+        self.model = self.backend.build(self.random_state, **params)
+        started = time.perf_counter()
+        self.model.fit(self.X_train, self.y_train)
+        
+        print(f"\n✓ Model trained successfully in {time.perf_counter() - started:.2f}s!")
+        print(f"  Model type: {self.backend.label}")
+        
+        return self.model
+    
+    def train_incremental(self, source, feature_columns, target_column='PURCHASE', C=0.01,
+                          solver='lbfgs', chunk_size=100000, max_epochs=100,
+                          validation_fraction=0.0):
+        """
+        Train out of core on a CSV/Parquet file that need not fit in memory
+        
+        The scaler is fitted with running mean/variance and the model with
+        streamed L-BFGS (same objective as train_logistic_regression) or
+        SGD partial_fit epochs; see incremental_training.IncrementalTrainer.
+        Sets model, scaler and feature_names, so save_model writes the usual
+        artifacts for IndianMarketPredictor.load_model. Logistic backend only.
+        
+        Args:
+            source: Processed or raw training file with target_column
+            feature_columns: List of feature column names
+            target_column: Target variable name
+            C: Regularization parameter
+            solver: 'lbfgs' or 'sgd'
+            chunk_size: Rows per chunk
+            max_epochs: Maximum passes over the data
+            validation_fraction: Share of rows held out for a streaming evaluation
+            
+        Returns:
+            Trained model
+        """
+        if self.backend.name != 'logistic':
+            raise ValueError(f"Incremental training supports the logistic backend, not {self.backend.name!r}")
+        
+        print("\n" + "="*60)
+        print("INCREMENTAL (OUT-OF-CORE) TRAINING")
+        print("="*60)
+        print(f"  Source: {source}")
+        print(f"  Solver: {solver}, C={C}, chunk size {chunk_size:,}")
+        
+        trainer = IncrementalTrainer(
+            feature_columns, target_column=target_column, solver=solver, C=C,
+            chunk_size=chunk_size, max_epochs=max_epochs,
+            validation_fraction=validation_fraction, random_state=self.random_state
+        ).fit(source)
+        
+        self.model = trainer.model
+        self.scaler = trainer.scaler
+        self.feature_names = list(feature_columns)
+        self.incremental = trainer
+        
+        return self.model
+    
+    def tune_hyperparameters(self, param_grid=None, strategy='grid', n_jobs=1, cache_dir=None):
         """
-        Perform hyperparameter tuning using GridSearchCV
+        Perform hyperparameter tuning with a cached, warm-started search
+        
+        Searches the unscaled training set on the shared stratified folds
+        with ROC-AUC scoring, fitting StandardScaler inside each fold as
+        cross_validate does, so no fold sees scaling statistics from its own
+        held-out rows; see hyperparameter_search.LogisticRegressionSearch
+        for how fits are shared and cached. Tree backends are tuned with
+        GridSearchCV (or HalvingGridSearchCV) over a scaler + model pipeline
+        on the same folds. The best parameters are refitted on the scaled
+        training set used by evaluate_model.
+        
+        Args:
+            param_grid: Parameter grid (defaults to the backend's grid; for
+                logistic regression C in 0.01..100 with l2/lbfgs)
+            strategy: 'grid' or 'halving' (successive halving for wide grids)
+            n_jobs: Parallel fold tasks (1 runs in-process, fastest for this data size)
+            cache_dir: Optional directory to persist fold fits across runs
         
         Returns:
             Best model
@@ -122,30 +250,105 @@ class ModelBuilder:
         print("HYPERPARAMETER TUNING")
         print("="*60)
         
-        param_grid = {
-            'C': [0.01, 0.1, 1.0, 10.0, 100.0],
-            'penalty': ['l2'],
-            'solver': ['lbfgs']
-        }
-        
-        grid_search = GridSearchCV(
-            LogisticRegression(random_state=self.random_state, max_iter=1000),
-            param_grid,
-            cv=5,
-            scoring='roc_auc',
-            n_jobs=-1,
-            verbose=1
-        )
+        if param_grid is None:
+            param_grid = self.backend.param_grid
+        
+        if self.backend.name != 'logistic':
+            return self._tune_backend(param_grid, strategy, n_jobs)
         
-        grid_search.fit(self.X_train, self.y_train)
+        if self.search is None or self.search.cache_dir != (Path(cache_dir) if cache_dir else None):
+            self.search = LogisticRegressionSearch(
+                param_grid, cv=5, scoring='roc_auc', strategy=strategy,
+                n_jobs=n_jobs, cache_dir=cache_dir, random_state=self.random_state, scale=True
+            )
+        else:
+            # Keep the in-memory fold cache from earlier searches
+            self.search.param_grid = param_grid
+            self.search.strategy = strategy
+            self.search.n_jobs = n_jobs
+        
+        result = self.search.fit(self.X_train_raw, self.y_train, folds=self.folds)
+        self.search_result = result
+        
+        print(f"\nSearched {len(result.results)} candidate evaluations ({strategy}): "
+              f"{result.fits} fits, {result.cache_hits} cached, {result.seconds:.2f}s")
+        print(f"\n✓ Best parameters: {result.best_params}")
+        print(f"  Best CV ROC-AUC: {result.best_score:.4f}")
+        
+        self.model = result.best_estimator
+        
+        return self.model
+    
+    def _tune_backend(self, param_grid, strategy, n_jobs):
+        """sklearn search over a non-logistic backend, scaled per shared fold"""
+        pipeline = Pipeline([('scaler', StandardScaler()), ('model', self.backend.build(self.random_state))])
+        grid = {f'model__{name}': values for name, values in param_grid.items()}
+        if strategy == 'halving':
+            from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+            from sklearn.model_selection import HalvingGridSearchCV
+            search = HalvingGridSearchCV(pipeline, grid, cv=self.folds, scoring='roc_auc',
+                                         n_jobs=n_jobs, random_state=self.random_state, refit=False)
+        elif strategy == 'grid':
+            search = GridSearchCV(pipeline, grid, cv=self.folds, scoring='roc_auc', n_jobs=n_jobs, refit=False)
+        else:
+            raise ValueError(f"strategy must be 'grid' or 'halving', got {strategy!r}")
+        
+        started = time.perf_counter()
+        search.fit(self.X_train_raw, self.y_train)
+        results = pd.DataFrame(search.cv_results_)
+        best_params = {name.removeprefix('model__'): value for name, value in search.best_params_.items()}
+        
+        # Refit on the training set scaled by self.scaler, as evaluate_model expects
+        best_estimator = self.backend.build(self.random_state, **best_params).fit(self.X_train, self.y_train)
+        
+        self.search = search
+        self.search_result = SearchResult(
+            strategy=strategy,
+            best_params=best_params,
+            best_score=float(search.best_score_),
+            results=results,
+            fits=len(results) * len(self.folds),
+            seconds=time.perf_counter() - started,
+            best_estimator=best_estimator,
+        )
+        result = self.search_result
         
-        print(f"\n✓ Best parameters: {grid_search.best_params_}")
-        print(f"  Best CV ROC-AUC: {grid_search.best_score_:.4f}")
+        print(f"\nSearched {len(result.results)} {self.backend.label} candidates ({strategy}): "
+              f"{result.fits} fits, {result.seconds:.2f}s")
+        print(f"\n✓ Best parameters: {result.best_params}")
+        print(f"  Best CV ROC-AUC: {result.best_score:.4f}")
         
-        self.model = grid_search.best_estimator_
+        self.model = result.best_estimator
         
         return self.model
     
+    def compare_backends(self, backends=None, n_repeats=3):
+        """
+        Training and inference throughput of every installed backend
+        
+        Each backend is fitted with its default parameters on the prepared
+        training set and scored on the validation set; see
+        model_backends.compare_backends.
+        
+        Returns:
+            DataFrame with fit time, rows/s for training and inference and ROC-AUC
+        """
+        print("\n" + "="*60)
+        print("MODEL BACKEND COMPARISON")
+        print("="*60)
+        
+        kwargs = {} if backends is None else {'backends': backends}
+        comparison = compare_backends(self.X_train, self.y_train, self.X_val, self.y_val,
+                                      random_state=self.random_state, n_repeats=n_repeats, **kwargs)
+        
+        print(f"\n⚡ Throughput (train {len(self.X_train):,} rows, score {len(self.X_val):,} rows):")
+        for row in comparison.itertuples(index=False):
+            print(f"  {row.backend:<14} fit {row.fit_seconds:7.3f}s ({row.train_rows_per_s:>12,.0f} rows/s)  "
+                  f"predict {row.predict_ms:8.2f}ms ({row.predict_rows_per_s:>14,.0f} rows/s)  "
+                  f"ROC-AUC {row.roc_auc:.4f}")
+        
+        return comparison
+    
     def evaluate_model(self):
         """
         Evaluate model performance on validation set
@@ -162,13 +365,8 @@ class ModelBuilder:
         y_pred_proba = self.model.predict_proba(self.X_val)[:, 1]
         
         # Calculate metrics
-        metrics = {
-            'accuracy': accuracy_score(self.y_val, y_pred),
-            'precision': precision_score(self.y_val, y_pred),
-            'recall': recall_score(self.y_val, y_pred),
-            'f1_score': f1_score(self.y_val, y_pred),
-            'roc_auc': roc_auc_score(self.y_val, y_pred_proba)
-        }
+        metrics = binary_metrics(self.y_val, y_pred, y_pred_proba)
+        self.metrics = metrics
         
         # Display metrics
         print("\n📊 VALIDATION SET PERFORMANCE:")
@@ -199,6 +397,9 @@ class ModelBuilder:
         Returns:
             DataFrame with coefficient interpretations
         """
+        if not hasattr(self.model, 'coef_'):
+            return self.get_feature_importances()
+        
         print("\n" + "="*60)
         print("MODEL COEFFICIENT INTERPRETATION")
         print("="*60)
@@ -247,61 +448,173 @@ class ModelBuilder:
         
         return coefficients
     
+    def get_feature_importances(self):
+        """
+        Feature importances of a tree backend
+        
+        Returns:
+            DataFrame with Feature and Importance, most important first
+        """
+        print("\n" + "="*60)
+        print("MODEL FEATURE IMPORTANCES")
+        print("="*60)
+        
+        importances = pd.DataFrame({
+            'Feature': self.feature_names,
+            'Importance': np.asarray(self.model.feature_importances_, dtype='float64'),
+        }).sort_values('Importance', ascending=False)
+        
+        print(f"\n📊 FEATURE IMPORTANCES ({self.backend.label}):")
+        print(importances.to_string(index=False))
+        
+        return importances
+    
     def cross_validate(self, cv=5):
         """
-        Perform cross-validation
+        Perform leak-free cross-validation on the training set
+        
+        Reuses the tuning fold indices and fits StandardScaler + the tuned
+        model inside each fold on unscaled data, so held-out rows never
+        influence the scaling. The validation set stays untouched for
+        evaluate_model. All metrics come from one prediction pass per fold.
         
         Args:
-            cv: Number of folds
+            cv: Number of folds (the shared tuning folds when it matches)
             
         Returns:
-            Cross-validation scores
+            CVReport with per-fold metrics and fit/score timings
         """
         print("\n" + "="*60)
         print(f"CROSS-VALIDATION ({cv}-FOLD)")
         print("="*60)
         
-        # Combine train and validation for CV
-        X_full = pd.concat([self.X_train, self.X_val])
-        y_full = pd.concat([self.y_train, self.y_val])
+        folds = self.folds if self.folds is not None and len(self.folds) == cv else \
+            stratified_folds(self.y_train, n_splits=cv)
+        report = cross_validate_pipeline(self.model, self.X_train_raw, self.y_train, folds)
         
-        cv_scores = cross_val_score(
-            self.model, X_full, y_full, cv=cv, scoring='roc_auc', n_jobs=-1
-        )
+        print(f"\n📊 Cross-Validation Scores (scaler fitted per fold):")
+        for row in report.folds.itertuples(index=False):
+            print(f"  Fold {row.fold}: ROC-AUC {row.roc_auc:.4f}, Accuracy {row.accuracy:.4f}, "
+                  f"F1 {row.f1_score:.4f} (fit {row.fit_time*1000:.1f}ms, score {row.score_time*1000:.1f}ms)")
         
-        print(f"\n📊 Cross-Validation ROC-AUC Scores:")
-        for i, score in enumerate(cv_scores, 1):
-            print(f"  Fold {i}: {score:.4f}")
+        scores = report.scores
+        print(f"\n  Mean: {scores.mean():.4f}")
+        print(f"  Std:  {scores.std():.4f}")
+        print(f"  Total: {report.seconds:.2f}s")
         
-        print(f"\n  Mean: {cv_scores.mean():.4f}")
-        print(f"  Std:  {cv_scores.std():.4f}")
+        return report
+    
+    def bootstrap_probabilities(self, X_score, n_bootstrap=20, n_jobs=-1):
+        """
+        Purchase probabilities under bootstrap refits of the model
+        
+        Each refit trains a clone of the tuned model on a resample (with
+        replacement) of the training set and scores X_score, capturing how
+        much the probabilities move with the training sample. The fitted
+        scaler is reused for every refit.
         
-        return cv_scores
+        Args:
+            X_score: Unscaled feature frame to score (e.g. Indian features)
+            n_bootstrap: Number of refits
+            n_jobs: Parallel refits (joblib semantics, -1 uses every core)
+            
+        Returns:
+            Array of shape (n_bootstrap, len(X_score)), usable as the
+            probabilities argument of uncertainty.simulate_purchase_totals
+        """
+        print("\n" + "="*60)
+        print(f"BOOTSTRAP REFITS ({n_bootstrap})")
+        print("="*60)
+        
+        X_scaled = self.scaler.transform(X_score[self.feature_names])
+        seeds = np.random.SeedSequence(self.random_state).spawn(n_bootstrap)
+        probabilities = Parallel(n_jobs=n_jobs)(
+            delayed(_bootstrap_refit)(self.model, self.X_train, self.y_train, X_scaled, seed)
+            for seed in seeds
+        )
+        probabilities = np.vstack(probabilities)
+        
+        totals = probabilities.sum(axis=1)
+        print(f"\n✓ Expected purchases across refits: {totals.mean():,.0f} "
+              f"(min {totals.min():,.0f}, max {totals.max():,.0f})")
+        
+        return probabilities
     
-    def save_model(self, model_dir='models'):
-        """Save trained model and scaler"""
+    def training_data_hash(self):
+        """Hash of the data the current model was trained on, if known"""
+        if self.incremental is not None and self.model is self.incremental.model:
+            return self.incremental.data_hash
+        if self.X_train_raw is not None:
+            return training_data_hash(self.X_train_raw, self.y_train)
+        return None
+    
+    def save_model(self, model_dir='models', register=True):
+        """
+        Save trained model and scaler
+        
+        Writes the flat artifacts in model_dir and, with register=True,
+        publishes an immutable version to the model registry under
+        model_dir/registry and makes it current (see model_registry).
+        """
         model_path = Path(model_dir)
         model_path.mkdir(parents=True, exist_ok=True)
         
-        joblib.dump(self.model, model_path / 'logistic_regression_model.pkl')
+        joblib.dump(self.model, model_path / self.backend.model_file)
         joblib.dump(self.scaler, model_path / 'feature_scaler.pkl')
         
         # Save feature names
         with open(model_path / 'feature_names.txt', 'w') as f:
             f.write('\n'.join(self.feature_names))
         
+        # Which model file IndianMarketPredictor.load_model should read
+        with open(model_path / BACKEND_FILE, 'w') as f:
+            f.write(self.backend.name)
+        
+        if self.backend.linear:
+            # NumPy-only scoring artifact with the scaler folded into the weights
+            CompiledScorer.compile(self.model, self.scaler, self.feature_names).save(
+                model_path / COMPILED_SCORER_FILE,
+                source_files=[model_path / self.backend.model_file, model_path / 'feature_scaler.pkl']
+            )
+        else:
+            # A compiled scorer from an earlier linear model must not shadow this one
+            (model_path / COMPILED_SCORER_FILE).unlink(missing_ok=True)
+        
         print(f"\n✓ Model saved to: {model_path}")
+        
+        if register:
+            params = {name: value for name, value in self.model.get_params().items()
+                      if isinstance(value, (bool, int, float, str, type(None)))}
+            self.model_version = ModelRegistry(model_path).publish(
+                self.model, self.scaler, self.feature_names, backend=self.backend,
+                data_hash=self.training_data_hash(), params=params, metrics=self.metrics
+            )
+            print(f"  Registry version: {self.model_version} (current)")
 
 
-def main():
+def main(argv=None):
     """Main execution function"""
+    parser = argparse.ArgumentParser(description='ABG Motors model building')
+    parser.add_argument('--stream', metavar='SOURCE',
+                        help='Train out of core on a raw or processed CSV/Parquet file '
+                             'instead of loading it into memory')
+    parser.add_argument('--chunk-size', type=int, default=100000)
+    parser.add_argument('--solver', choices=('lbfgs', 'sgd'), default='lbfgs',
+                        help='Optimizer for --stream')
+    parser.add_argument('--C', type=float, default=0.01, help='Regularization for --stream')
+    parser.add_argument('--max-epochs', type=int, default=100)
+    parser.add_argument('--holdout', type=float, default=0.0,
+                        help='Share of rows held out for evaluation with --stream')
+    parser.add_argument('--backend', choices=tuple(BACKENDS), default='logistic',
+                        help='Model family to train, tune and save')
+    parser.add_argument('--compare', action='store_true',
+                        help='Report training/inference throughput of every installed backend')
+    args = parser.parse_args(argv)
+    
     print("="*60)
     print("ABG MOTORS - MODEL BUILDING MODULE")
     print("="*60)
     
-    # Load processed data
-    japanese_df = pd.read_csv('data/processed/japanese_processed.csv')
-    
     # Define features
     feature_columns = [
         'CURR_AGE',
@@ -314,13 +627,34 @@ def main():
     ]
     
     # Initialize model builder
-    builder = ModelBuilder(random_state=42)
+    builder = ModelBuilder(random_state=42, backend=args.backend)
+    
+    if args.stream:
+        builder.train_incremental(
+            args.stream, feature_columns, target_column='PURCHASE', C=args.C,
+            solver=args.solver, chunk_size=args.chunk_size, max_epochs=args.max_epochs,
+            validation_fraction=args.holdout
+        )
+        coefficients = builder.get_coefficient_interpretation()
+        builder.save_model()
+        
+        print("\n" + "="*60)
+        print("MODEL BUILDING COMPLETED SUCCESSFULLY!")
+        print("="*60)
+        
+        return builder, builder.incremental.validation, coefficients
+    
+    # Load processed data
+    japanese_df = read_table('data/processed/japanese_processed')
     
     # Prepare data
     X_train, X_val, y_train, y_val = builder.prepare_data(
         japanese_df, feature_columns, target_column='PURCHASE', test_size=0.3
     )
     
+    if args.compare:
+        builder.compare_backends()
+    
     # Train model with hyperparameter tuning
     model = builder.tune_hyperparameters()
     
@@ -328,7 +662,7 @@ def main():
     metrics = builder.evaluate_model()
     
     # Cross-validation
-    cv_scores = builder.cross_validate(cv=5)
+    cv_report = builder.cross_validate(cv=5)
     
     # Interpret coefficients
     coefficients = builder.get_coefficient_interpretation()
@@ -0,0 +1,314 @@
+"""
+Model Registry Module for ABG Motors Market Entry Analysis
+Immutable versioned model artifacts with an atomic current-version pointer
+"""
+
+import argparse
+import filecmp
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from compiled_scorer import CompiledScorer, COMPILED_SCORER_FILE
+from model_backends import BACKEND_FILE, get_backend, read_backend
+
+
+REGISTRY_DIR = 'registry'
+CURRENT_FILE = 'CURRENT'
+MANIFEST_FILE = 'manifest.json'
+WEIGHTS_FILE = 'weights.npy'
+
+
+def training_data_hash(X, y):
+    """SHA-256 of the training features and target, in row order"""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(X, dtype='float64').tobytes())
+    digest.update(np.ascontiguousarray(y).tobytes())
+    digest.update(str(np.shape(X)).encode())
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """
+    Versioned store for the scaler + logistic regression under models/registry
+
+    Layout:
+
+        registry/
+            CURRENT            name of the active version (swapped with os.replace)
+            v0001/
+                manifest.json  coefficients, scaler mean/scale, feature order,
+                               classes, training data hash, parameters, metrics
+                weights.npy    folded weights followed by the bias (float64),
+                               memory-mapped by load_scorer (linear backends)
+                compiled_scorer.npz, <backend model file>.pkl,
+                feature_scaler.pkl, feature_names.txt
+
+    A version is written into a temporary directory and renamed into place,
+    so readers never see a partial version; files are then made read-only.
+    Activating a version (publish, activate, rollback) rewrites CURRENT via
+    a temporary file and os.replace, which is atomic: a concurrent reader
+    resolves either the old or the new version, never a mix. Loading through
+    load_scorer needs only json and NumPy - no unpickling, no sklearn import.
+    """
+
+    def __init__(self, model_dir='models'):
+        self.model_dir = Path(model_dir)
+        self.root = self.model_dir / REGISTRY_DIR
+
+    def exists(self):
+        return (self.root / CURRENT_FILE).exists()
+
+    def versions(self):
+        """Published versions, oldest first"""
+        if not self.root.exists():
+            return []
+        return sorted((path.name for path in self.root.iterdir()
+                       if path.is_dir() and path.name.startswith('v') and path.name[1:].isdigit()),
+                      key=lambda name: int(name[1:]))
+
+    def current(self):
+        """Name of the active version, or None if nothing is published"""
+        try:
+            return (self.root / CURRENT_FILE).read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def version_dir(self, version=None):
+        version = version or self.current()
+        if version is None:
+            raise FileNotFoundError(f"No model published in {self.root}")
+        path = self.root / version
+        if not path.is_dir():
+            raise FileNotFoundError(f"Model version {version!r} not found in {self.root}")
+        return path
+
+    def manifest(self, version=None):
+        with open(self.version_dir(version) / MANIFEST_FILE) as f:
+            return json.load(f)
+
+    def publish(self, model, scaler, feature_names, backend='logistic', data_hash=None,
+                params=None, metrics=None, activate=True):
+        """
+        Write a new immutable version and (by default) make it current
+
+        Publishing a model identical to the newest version (same weights
+        or pickled model, scaler, features and data hash) reuses that
+        version instead of adding a duplicate.
+
+        Args:
+            model: Fitted binary classifier; linear backends (coef_/intercept_)
+                also get the memory-mappable weights
+            scaler: Fitted StandardScaler, or None
+            feature_names: Feature order used at training time
+            backend: Backend name or ModelBackend (see model_backends)
+            data_hash: Training data hash (see training_data_hash)
+            params: Optional dict of training parameters for the manifest
+            metrics: Optional dict of validation metrics for the manifest
+            activate: Point CURRENT at the new version
+
+        Returns:
+            Version name
+        """
+        import joblib
+
+        backend = get_backend(backend)
+        model_bytes = io.BytesIO()
+        joblib.dump(model, model_bytes)
+        manifest = {
+            'backend': backend.name,
+            'model_file': backend.model_file,
+            'feature_names': list(feature_names),
+            'classes': np.asarray(model.classes_).tolist(),
+            'scaler_mean': None if scaler is None else np.asarray(scaler.mean_, dtype='float64').tolist(),
+            'scaler_scale': None if scaler is None else np.asarray(scaler.scale_, dtype='float64').tolist(),
+            'training_data_hash': data_hash,
+            'model_type': type(model).__name__,
+            'params': params or {},
+        }
+        scorer = None
+        if backend.linear:
+            scorer = CompiledScorer.compile(model, scaler, feature_names)
+            manifest['coefficients'] = np.asarray(model.coef_, dtype='float64')[0].tolist()
+            manifest['intercept'] = float(np.asarray(model.intercept_)[0])
+        else:
+            manifest['model_sha256'] = hashlib.sha256(model_bytes.getvalue()).hexdigest()
+        digest = hashlib.sha256(json.dumps(manifest, sort_keys=True).encode()).hexdigest()
+
+        existing = self.versions()
+        if existing and self.manifest(existing[-1]).get('digest') == digest:
+            version = existing[-1]
+        else:
+            manifest.update({
+                'digest': digest,
+                'metrics': metrics or {},
+                'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'weights_file': WEIGHTS_FILE if backend.linear else None,
+            })
+            version = self._write_version(manifest, scorer, model_bytes.getvalue(), scaler, feature_names)
+
+        if activate:
+            self.activate(version)
+        return version
+
+    def _write_version(self, manifest, scorer, model_bytes, scaler, feature_names):
+        import joblib
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix='.staging-', dir=self.root))
+        try:
+            (staging / manifest['model_file']).write_bytes(model_bytes)
+            joblib.dump(scaler, staging / 'feature_scaler.pkl')
+            if scorer is not None:
+                np.save(staging / WEIGHTS_FILE, np.append(scorer.weights, scorer.bias).astype('float64'))
+                scorer.save(staging / COMPILED_SCORER_FILE,
+                            source_files=[staging / manifest['model_file'], staging / 'feature_scaler.pkl'])
+            (staging / 'feature_names.txt').write_text('\n'.join(feature_names))
+
+            while True:
+                versions = self.versions()
+                version = f"v{int(versions[-1][1:]) + 1 if versions else 1:04d}"
+                manifest['version'] = version
+                with open(staging / MANIFEST_FILE, 'w') as f:
+                    json.dump(manifest, f, indent=2)
+                try:
+                    # Fails if a concurrent publisher took this number first
+                    os.rename(staging, self.root / version)
+                    break
+                except OSError:
+                    if not (self.root / version).exists():
+                        raise
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        for path in (self.root / version).iterdir():
+            path.chmod(0o444)
+        (self.root / version).chmod(0o755)
+        return version
+
+    def activate(self, version):
+        """Atomically point CURRENT at an existing version"""
+        self.version_dir(version)
+        fd, tmp = tempfile.mkstemp(prefix='.CURRENT-', dir=self.root)
+        with os.fdopen(fd, 'w') as f:
+            f.write(version + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, self.root / CURRENT_FILE)
+
+    def rollback(self, to=None):
+        """
+        Reactivate an earlier version
+
+        Args:
+            to: Version to activate; defaults to the newest version older
+                than the current one
+
+        Returns:
+            The version now current
+        """
+        if to is None:
+            current = self.current()
+            older = [v for v in self.versions() if current is None or int(v[1:]) < int(current[1:])]
+            if not older:
+                raise ValueError(f"No version older than {current} to roll back to")
+            to = older[-1]
+        self.activate(to)
+        return to
+
+    def flat_differences(self, version=None):
+        """
+        Flat artifacts in model_dir that disagree with a registered version
+
+        save_model(register=False), or any other update of the flat files,
+        leaves them ahead of CURRENT; loaders use this to warn that they are
+        serving the registered version instead.
+
+        Returns:
+            List of differing file names (empty when the flat files match or
+            are absent)
+        """
+        path = self.version_dir(version)
+        manifest = self.manifest(path.name)
+        flat_backend = read_backend(self.model_dir)
+        if (self.model_dir / BACKEND_FILE).exists() and flat_backend.name != manifest.get('backend', 'logistic'):
+            return [BACKEND_FILE]
+        names = [manifest['model_file'], 'feature_scaler.pkl', 'feature_names.txt']
+        if manifest.get('weights_file'):
+            names.append(COMPILED_SCORER_FILE)
+        return [name for name in names
+                if (self.model_dir / name).exists() and (path / name).exists()
+                and not filecmp.cmp(self.model_dir / name, path / name, shallow=False)]
+
+    def warn_if_flat_differs(self, version=None):
+        """Print a warning when the flat artifacts are not the version being loaded"""
+        differences = self.flat_differences(version)
+        if differences:
+            version = self.version_dir(version).name
+            print(f"\n⚠ Warning: {', '.join(differences)} in {self.model_dir} differ from registry "
+                  f"version {version}, which is the one loaded.")
+            print("  Re-save with save_model(register=True) to publish them "
+                  "(expected after a deliberate rollback).")
+        return differences
+
+    def load_scorer(self, version=None, dtype='float64'):
+        """
+        CompiledScorer for a version with its weights memory-mapped
+
+        Returns:
+            (CompiledScorer, manifest dict)
+        """
+        path = self.version_dir(version)
+        with open(path / MANIFEST_FILE) as f:
+            manifest = json.load(f)
+        if not manifest.get('weights_file'):
+            raise ValueError(f"Version {path.name} holds a {manifest.get('backend')} model, "
+                             f"which has no compiled linear weights; load {manifest['model_file']} instead")
+        packed = np.load(path / manifest.get('weights_file', WEIGHTS_FILE), mmap_mode='r')
+        weights = packed[:-1] if np.dtype(dtype) == packed.dtype else packed[:-1].astype(dtype)
+        scorer = CompiledScorer(weights, float(packed[-1]), manifest['feature_names'],
+                                classes=manifest['classes'], dtype=dtype)
+        return scorer, manifest
+
+
+def main(argv=None):
+    """List, activate or roll back registry versions"""
+    parser = argparse.ArgumentParser(description='ABG Motors model registry')
+    parser.add_argument('--model-dir', default='models')
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument('--activate', metavar='VERSION', help='Make VERSION current')
+    action.add_argument('--rollback', action='store_true',
+                        help='Reactivate the version before the current one')
+    args = parser.parse_args(argv)
+
+    registry = ModelRegistry(args.model_dir)
+    if args.activate:
+        registry.activate(args.activate)
+    elif args.rollback:
+        registry.rollback()
+
+    current = registry.current()
+    print("="*60)
+    print("MODEL REGISTRY")
+    print("="*60)
+    for version in registry.versions():
+        manifest = registry.manifest(version)
+        auc = manifest.get('metrics', {}).get('roc_auc')
+        marker = '*' if version == current else ' '
+        print(f" {marker} {version}  {manifest.get('backend', 'logistic'):<13} {manifest.get('created_at', '')}  "
+              f"data {str(manifest.get('training_data_hash'))[:12]}  "
+              f"ROC-AUC {auc if auc is None else f'{auc:.4f}'}")
+    return registry
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Streaming ODS Reader Module for ABG Motors Market Entry Analysis
+Reads spreadsheet rows incrementally from content.xml without building the full DOM
+"""
+
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pandas as pd
+
+
+TABLE_NS = 'urn:oasis:names:tc:opendocument:xmlns:table:1.0'
+OFFICE_NS = 'urn:oasis:names:tc:opendocument:xmlns:office:1.0'
+
+TABLE = f'{{{TABLE_NS}}}table'
+TABLE_ROW = f'{{{TABLE_NS}}}table-row'
+TABLE_CELL = f'{{{TABLE_NS}}}table-cell'
+COVERED_CELL = f'{{{TABLE_NS}}}covered-table-cell'
+TABLE_NAME = f'{{{TABLE_NS}}}name'
+ROWS_REPEATED = f'{{{TABLE_NS}}}number-rows-repeated'
+COLUMNS_REPEATED = f'{{{TABLE_NS}}}number-columns-repeated'
+VALUE_TYPE = f'{{{OFFICE_NS}}}value-type'
+VALUE = f'{{{OFFICE_NS}}}value'
+DATE_VALUE = f'{{{OFFICE_NS}}}date-value'
+TIME_VALUE = f'{{{OFFICE_NS}}}time-value'
+BOOLEAN_VALUE = f'{{{OFFICE_NS}}}boolean-value'
+
+
+class ODSStreamReader:
+    """
+    Stream rows from an ODS sheet as DataFrame chunks
+
+    content.xml is parsed with ElementTree.iterparse and every row element is
+    discarded as soon as it has been converted, so memory stays proportional
+    to chunk_size rather than to the sheet. Repeated rows/cells are expanded
+    only up to the header width, and trailing blank rows (LibreOffice pads
+    sheets to ~1M rows) are never materialised.
+    """
+
+    def __init__(self, filepath, sheet_name=0, chunk_size=50000):
+        """
+        Args:
+            filepath: Path to the ODS file
+            sheet_name: Sheet index or name to read
+            chunk_size: Number of data rows per yielded DataFrame
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+        self.filepath = Path(filepath)
+        self.sheet_name = sheet_name
+        self.chunk_size = chunk_size
+        self.columns = None
+        self.rows_read = 0
+
+    def iter_chunks(self):
+        """
+        Yield the sheet as DataFrames of at most chunk_size rows
+
+        The first non-empty row is used as the header, matching
+        pd.read_excel(header=0).
+        """
+        self.columns = None
+        self.rows_read = 0
+        buffer = []
+
+        for row in self._iter_rows():
+            if self.columns is None:
+                self.columns = self._header(row)
+                continue
+
+            buffer.append(self._fit(row))
+            if len(buffer) >= self.chunk_size:
+                yield self._to_frame(buffer)
+                buffer = []
+
+        if self.columns is None:
+            raise ValueError(f"Sheet {self.sheet_name!r} not found or empty in {self.filepath}")
+
+        if buffer or self.rows_read == 0:
+            yield self._to_frame(buffer)
+
+    def read(self):
+        """Read the whole sheet into a single DataFrame"""
+        return pd.concat(self.iter_chunks(), ignore_index=True)
+
+    def _iter_rows(self):
+        """Yield each non-empty row of the selected sheet as a list of values"""
+        with zipfile.ZipFile(self.filepath) as archive:
+            with archive.open('content.xml') as content:
+                stack = []
+                table_index = -1
+                in_sheet = False
+                pending_blank = 0
+                row_cells = None
+
+                for event, elem in ET.iterparse(content, events=('start', 'end')):
+                    if event == 'start':
+                        stack.append(elem)
+                        if elem.tag == TABLE:
+                            table_index += 1
+                            in_sheet = self._is_selected(table_index, elem.get(TABLE_NAME))
+                        elif elem.tag == TABLE_ROW and in_sheet:
+                            row_cells = []
+                        continue
+
+                    stack.pop()
+
+                    if not in_sheet:
+                        if elem.tag == TABLE_ROW or elem.tag == TABLE:
+                            self._discard(elem, stack)
+                        continue
+
+                    if elem.tag in (TABLE_CELL, COVERED_CELL):
+                        repeat = int(elem.get(COLUMNS_REPEATED, 1))
+                        value = self._cell_value(elem)
+                        # Blank padding cells can repeat thousands of times; keep one
+                        if value is None and self.columns is not None:
+                            repeat = min(repeat, max(len(self.columns) - len(row_cells), 0))
+                        row_cells.extend([value] * repeat)
+                        elem.clear()
+
+                    elif elem.tag == TABLE_ROW:
+                        repeat = int(elem.get(ROWS_REPEATED, 1))
+                        cells = self._trim(row_cells)
+                        self._discard(elem, stack)
+                        row_cells = None
+
+                        if not cells:
+                            # Only emit blank rows that sit between data rows
+                            pending_blank += repeat
+                            continue
+
+                        if self.columns is not None:
+                            for _ in range(pending_blank):
+                                yield []
+                        pending_blank = 0
+
+                        for _ in range(repeat):
+                            yield list(cells)
+
+                    elif elem.tag == TABLE:
+                        return
+
+    def _is_selected(self, index, name):
+        if isinstance(self.sheet_name, int):
+            return index == self.sheet_name
+        return name == self.sheet_name
+
+    @staticmethod
+    def _discard(elem, stack):
+        """Drop a processed element so the partial tree does not grow"""
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+
+    @staticmethod
+    def _trim(cells):
+        end = len(cells)
+        while end and cells[end - 1] is None:
+            end -= 1
+        return cells[:end]
+
+    @staticmethod
+    def _cell_value(elem):
+        """Convert a cell element to a Python value the way pandas' odf reader does"""
+        value_type = elem.get(VALUE_TYPE)
+
+        if value_type is None:
+            text = '\n'.join(''.join(p.itertext()) for p in elem)
+            return text or None
+        if value_type in ('float', 'percentage', 'currency'):
+            value = float(elem.get(VALUE))
+            return int(value) if value.is_integer() else value
+        if value_type == 'boolean':
+            return elem.get(BOOLEAN_VALUE) == 'true'
+        if value_type == 'date':
+            return pd.Timestamp(elem.get(DATE_VALUE))
+        if value_type == 'time':
+            return pd.Timedelta(elem.get(TIME_VALUE))
+        return '\n'.join(''.join(p.itertext()) for p in elem)
+
+    def _header(self, row):
+        return [str(name) for name in row]
+
+    def _fit(self, row):
+        width = len(self.columns)
+        if len(row) < width:
+            row.extend([None] * (width - len(row)))
+        return row[:width]
+
+    def _to_frame(self, rows):
+        df = pd.DataFrame(rows, columns=self.columns)
+        df.index = pd.RangeIndex(self.rows_read, self.rows_read + len(df))
+        self.rows_read += len(df)
+        return df
@@ -0,0 +1,226 @@
+"""
+Parallel Feature Engineering Module for ABG Motors Market Entry Analysis
+Runs FeatureEngineer logic across a process pool over memory-mapped arrays
+"""
+
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from feature_engineering import FeatureEngineer, AGE_CAR_THRESHOLDS
+
+
+def _open_array(scratch_dir, spec, mode='r+'):
+    name, dtype, length = spec
+    return np.memmap(os.path.join(scratch_dir, name), dtype=dtype, mode=mode, shape=(length,))
+
+
+def _process_partition(task):
+    """
+    Worker: rebuild a partition from the memory-mapped inputs, run
+    FeatureEngineer.build_features on it and write the derived columns into
+    the memory-mapped outputs at the same row offsets.
+
+    Only array names, offsets and the (small) category tables are pickled;
+    row data never crosses the process boundary.
+    """
+    (scratch_dir, start, stop, inputs, outputs, gender_categories,
+     date_uniques, age_car_thresholds) = task
+
+    partition = {}
+    gender_codes = _open_array(scratch_dir, inputs['GENDER'], mode='r')[start:stop]
+    partition['GENDER'] = pd.Categorical.from_codes(gender_codes, categories=gender_categories)
+
+    if 'DT_MAINT' in inputs:
+        date_codes = _open_array(scratch_dir, inputs['DT_MAINT'], mode='r')[start:stop]
+        dates = date_uniques.take(date_codes)
+        dates[date_codes < 0] = None
+        partition['DT_MAINT'] = dates
+        date_column = 'DT_MAINT'
+    else:
+        partition['AGE_CAR'] = _open_array(scratch_dir, inputs['AGE_CAR'], mode='r')[start:stop]
+        date_column = None
+
+    fe = FeatureEngineer(age_car_thresholds=age_car_thresholds, verbose=False)
+    result = fe.build_features(pd.DataFrame(partition), date_column=date_column)
+
+    for column, spec in outputs.items():
+        target = _open_array(scratch_dir, spec)
+        values = result[column].to_numpy()
+        if np.issubdtype(values.dtype, np.datetime64):
+            values = values.astype('datetime64[ns]').view('int64')
+        target[start:stop] = values
+        target.flush()
+
+    return start, stop
+
+
+class ParallelFeatureEngineer:
+    """
+    Multi-process counterpart of FeatureEngineer.prepare_*_features
+
+    The columns the transforms depend on (GENDER, DT_MAINT or AGE_CAR) are
+    factorized to integer codes and written to memory-mapped files in a
+    scratch directory. Workers process contiguous row partitions and write
+    derived columns straight into memory-mapped output arrays, so results
+    are already in input order when the pool finishes. Pass-through columns
+    (ID, CURR_AGE, ...) never leave the parent process.
+    """
+
+    def __init__(self, n_workers=None, partitions_per_worker=2,
+                 age_car_thresholds=AGE_CAR_THRESHOLDS, scratch_dir=None):
+        """
+        Args:
+            n_workers: Worker processes (defaults to os.cpu_count())
+            partitions_per_worker: Partitions per worker, for load balancing
+            age_car_thresholds: AGE_CAR segment boundaries in days
+            scratch_dir: Directory for the memory-mapped arrays (defaults to
+                /dev/shm when available, so the maps live in RAM)
+        """
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.partitions_per_worker = partitions_per_worker
+        self.age_car_thresholds = age_car_thresholds
+        if scratch_dir is None and os.path.isdir('/dev/shm'):
+            scratch_dir = '/dev/shm'
+        self.scratch_dir = scratch_dir
+        self.fe = FeatureEngineer(age_car_thresholds=age_car_thresholds, verbose=False)
+
+    def prepare_japanese_features(self, df):
+        """Parallel equivalent of FeatureEngineer.prepare_japanese_features"""
+        return self.build_features(df, date_column=None)
+
+    def prepare_indian_features(self, df):
+        """Parallel equivalent of FeatureEngineer.prepare_indian_features"""
+        return self.build_features(df, date_column='DT_MAINT')
+
+    def build_features(self, df, date_column=None, n_workers=None):
+        """
+        Build the same columns as FeatureEngineer.build_features in parallel
+
+        Args:
+            df: Raw Japanese or Indian DataFrame
+            date_column: 'DT_MAINT' for Indian data, None for Japanese
+            n_workers: Override the configured worker count
+
+        Returns:
+            DataFrame identical to FeatureEngineer.build_features(df, date_column)
+        """
+        n_workers = n_workers or self.n_workers
+        n_rows = len(df)
+        if n_rows == 0:
+            return self.fe.build_features(df, date_column=date_column)
+        n_segments = len(self.fe.age_car_thresholds) + 1
+
+        output_dtypes = {}
+        if date_column is not None:
+            output_dtypes[date_column] = 'int64'  # datetime64[ns] viewed as int64
+            # float64 so unparseable dates keep NaN; narrowed back below when none are missing
+            output_dtypes['AGE_CAR'] = 'float64'
+        output_dtypes['AGE_CAR_SEGMENT'] = 'int8'
+        output_dtypes['GENDER_M'] = 'int8'
+        output_dtypes['GENDER_F'] = 'int8'
+        for i in range(1, n_segments + 1):
+            output_dtypes[f'SEGMENT_{i}'] = 'bool'
+
+        with tempfile.TemporaryDirectory(prefix='abg_features_', dir=self.scratch_dir) as scratch:
+            inputs = {}
+            gender = df['GENDER'].astype('category')
+            inputs['GENDER'] = self._write_array(scratch, 'GENDER', gender.cat.codes.to_numpy())
+            gender_categories = gender.cat.categories
+
+            date_uniques = None
+            if date_column is not None:
+                date_codes, date_uniques = pd.factorize(df[date_column])
+                date_uniques = np.asarray(date_uniques, dtype=object)
+                inputs[date_column] = self._write_array(scratch, date_column, date_codes.astype(np.int32))
+            else:
+                inputs['AGE_CAR'] = self._write_array(scratch, 'AGE_CAR', df['AGE_CAR'].to_numpy())
+
+            outputs = {}
+            for column, dtype in output_dtypes.items():
+                spec = (f'out_{column}', dtype, n_rows)
+                _open_array(scratch, spec, mode='w+').flush()
+                outputs[column] = spec
+
+            tasks = [
+                (scratch, start, stop, inputs, outputs, gender_categories,
+                 date_uniques, tuple(self.fe.age_car_thresholds))
+                for start, stop in self._partitions(n_rows, n_workers)
+            ]
+
+            if n_workers == 1:
+                for task in tasks:
+                    _process_partition(task)
+            else:
+                with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                    list(pool.map(_process_partition, tasks))
+
+            derived = {}
+            for column, spec in outputs.items():
+                values = np.array(_open_array(scratch, spec, mode='r'))
+                if column == date_column:
+                    values = values.view('datetime64[ns]')
+                elif column == 'AGE_CAR' and not np.isnan(values).any():
+                    # build_features only yields float64 AGE_CAR when a date is missing
+                    values = values.astype('int64')
+                derived[column] = values
+
+        columns = {name: df[name] for name in df.columns}
+        columns.update(derived)
+        if date_column is not None:
+            columns[date_column] = pd.Series(derived[date_column], index=df.index, name=date_column)
+        return pd.DataFrame(columns, index=df.index)
+
+    def benchmark_scaling(self, df, date_column=None, max_workers=None, repeats=1):
+        """
+        Measure speedup and parallel efficiency from 1 to max_workers
+
+        Efficiency is speedup / workers, where speedup is relative to the
+        single-worker run of the same partitioned code path.
+
+        Args:
+            df: Raw DataFrame
+            date_column: 'DT_MAINT' for Indian data, None for Japanese
+            max_workers: Largest worker count to try (defaults to n_workers)
+            repeats: Runs per worker count; the fastest is kept
+
+        Returns:
+            DataFrame with workers, seconds, speedup and efficiency
+        """
+        max_workers = max_workers or self.n_workers
+        rows = []
+        for workers in range(1, max_workers + 1):
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                self.build_features(df, date_column=date_column, n_workers=workers)
+                timings.append(time.perf_counter() - start)
+            rows.append({'workers': workers, 'seconds': min(timings)})
+
+        results = pd.DataFrame(rows)
+        results['speedup'] = results['seconds'].iloc[0] / results['seconds']
+        results['efficiency'] = results['speedup'] / results['workers']
+
+        print("\n📊 PARALLEL FEATURE ENGINEERING SCALING:")
+        print(f"  Rows: {len(df):,}")
+        print(results.round(3).to_string(index=False))
+
+        return results
+
+    def _partitions(self, n_rows, n_workers):
+        n_parts = max(1, min(n_rows, n_workers * self.partitions_per_worker))
+        bounds = np.linspace(0, n_rows, n_parts + 1).astype(int)
+        return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+    @staticmethod
+    def _write_array(scratch_dir, name, values):
+        values = np.ascontiguousarray(values)
+        spec = (f'in_{name}', values.dtype.str, len(values))
+        target = _open_array(scratch_dir, spec, mode='w+')
+        target[:] = values
+        target.flush()
+        return spec
@@ -0,0 +1,328 @@
+"""
+Pipeline DAG Module for ABG Motors Market Entry Analysis
+Dependency-ordered step execution with fingerprint caching and parallel branches
+"""
+
+import hashlib
+import inspect
+import io
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import joblib
+
+
+STATE_FILE = 'state.json'
+
+
+@dataclass
+class Step:
+    """
+    One pipeline step
+
+    func is called with the results of its dependencies as keyword
+    arguments (named after the dependency steps) plus params, and returns
+    the step's in-memory result.
+
+    Attributes:
+        name: Unique step name (also the keyword downstream steps receive)
+        func: Callable producing the step result
+        deps: Names of the steps whose results func needs
+        after: Steps that must finish first (e.g. they write a file this
+            step reads) but whose results are not passed to func
+        inputs: Files the step reads that no dependency produces (raw data)
+        outputs: Files the step writes; a cached step re-runs if any is
+            missing or was modified since it was written
+        code: Modules whose source defines the step's code version
+        params: Extra keyword arguments, part of the fingerprint
+        title: Banner text (defaults to the name)
+    """
+    name: str
+    func: object
+    deps: tuple = ()
+    after: tuple = ()
+    inputs: tuple = ()
+    outputs: tuple = ()
+    code: tuple = ()
+    params: dict = field(default_factory=dict)
+    title: str = None
+
+
+@dataclass
+class StepRun:
+    """How a step was resolved in one pipeline run"""
+    name: str
+    status: str
+    fingerprint: str
+    seconds: float = 0.0
+
+
+def file_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class _ThreadOutput(io.TextIOBase):
+    """sys.stdout stand-in that sends each worker thread's prints to its own buffer"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+class StepResults(Mapping):
+    """Step results by name; results of cached steps are unpickled on first access"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self._values = {}
+        self._cached = set()
+
+    def __getitem__(self, name):
+        if name not in self._values and name in self._cached:
+            self._values[name] = joblib.load(self.cache_dir / f'{name}.pkl')
+        return self._values[name]
+
+    def __iter__(self):
+        return iter(list(self._values) + sorted(self._cached - set(self._values)))
+
+    def __len__(self):
+        return len(self._values.keys() | self._cached)
+
+
+class PipelineDAG:
+    """
+    Run steps in dependency order, skipping those whose fingerprint is unchanged
+
+    A step's fingerprint hashes its name, params, code version (source of
+    func and of its code modules), the content of its input files and the
+    fingerprints and output files of its dependencies, so any upstream
+    change invalidates everything downstream of it. A step is skipped when the fingerprint
+    matches the last successful run, its outputs are still the files it
+    wrote and its pickled result is present; the result is then loaded
+    only if a step that does run (or the caller) asks for it.
+
+    Steps whose dependencies are done run concurrently on a thread pool.
+    Threads only overlap work that releases the GIL (file I/O, NumPy, most
+    of pandas' C paths); a step dominated by pure-Python work must hand it
+    to a process itself to run in parallel (DataLoader(parse_in_process=True)
+    does this for the ODS parsers, feature_workers for feature building).
+    Each running step's prints are buffered and emitted as one block when
+    it finishes, so parallel output never interleaves.
+    """
+
+    def __init__(self, steps, cache_dir='.pipeline_cache', n_workers=None, force=False):
+        """
+        Args:
+            steps: Steps in a valid execution order for n_workers=1
+            cache_dir: Directory for the state file and pickled results
+            n_workers: Concurrent steps (defaults to the CPU count)
+            force: Run every step regardless of the cache
+        """
+        self.steps = {step.name: step for step in steps}
+        if len(self.steps) != len(steps):
+            raise ValueError("Step names must be unique")
+        for step in steps:
+            unknown = set(step.deps + step.after) - set(self.steps)
+            if unknown:
+                raise ValueError(f"Step {step.name!r} depends on unknown steps {sorted(unknown)}")
+        self.order = [step.name for step in steps]
+        self._check_acyclic()
+        self.cache_dir = Path(cache_dir)
+        self.n_workers = max(1, n_workers or os.cpu_count() or 1)
+        self.force = force
+        self.runs = {}
+        self._hashes = {}
+        self._output_lock = threading.Lock()
+
+    def _check_acyclic(self):
+        visiting, done = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through step {name!r}")
+            visiting.add(name)
+            for dep in self.steps[name].deps + self.steps[name].after:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.order:
+            visit(name)
+
+    def _file_hash(self, path):
+        """Content hash, reused within a run while size and mtime are unchanged"""
+        stat = os.stat(path)
+        key = (str(path), stat.st_size, stat.st_mtime_ns)
+        if key not in self._hashes:
+            self._hashes[key] = file_hash(path)
+        return self._hashes[key]
+
+    def code_version(self, step):
+        digest = hashlib.sha256()
+        digest.update(inspect.getsource(step.func).encode())
+        for module in step.code:
+            digest.update(Path(inspect.getsourcefile(module)).read_bytes())
+        return digest.hexdigest()
+
+    def fingerprint(self, step):
+        payload = {
+            'step': step.name,
+            'code': self.code_version(step),
+            'params': repr(sorted(step.params.items())),
+            'inputs': {str(path): self._file_hash(path) if Path(path).exists() else None
+                       for path in step.inputs},
+            # Dependencies' output files too, for steps that read them from disk
+            'deps': {dep: [self.runs[dep].fingerprint,
+                           {str(path): self._file_hash(path) if Path(path).exists() else None
+                            for path in self.steps[dep].outputs}]
+                     for dep in step.deps + step.after},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _read_state(self):
+        try:
+            with open(self.cache_dir / STATE_FILE) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_state(self, state):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_dir / (STATE_FILE + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.cache_dir / STATE_FILE)
+
+    def _is_fresh(self, step, fingerprint, entry):
+        if self.force or not entry or entry.get('fingerprint') != fingerprint:
+            return False
+        if not (self.cache_dir / f'{step.name}.pkl').exists():
+            return False
+        recorded = entry.get('outputs', {})
+        for path in step.outputs:
+            if not Path(path).exists() or self._file_hash(path) != recorded.get(str(path)):
+                return False
+        return True
+
+    def _execute(self, step, results, capture):
+        if capture:
+            sys.stdout.local.buffer = io.StringIO()
+        self._banner(step, '')
+        started = time.perf_counter()
+        try:
+            kwargs = {dep: results[dep] for dep in step.deps}
+            value = step.func(**kwargs, **step.params)
+            joblib.dump(value, self.cache_dir / f'{step.name}.pkl')
+            return value, time.perf_counter() - started, None
+        except BaseException as exc:
+            return None, time.perf_counter() - started, exc
+        finally:
+            if capture:
+                output = sys.stdout.local.buffer.getvalue()
+                sys.stdout.local.buffer = None
+                with self._output_lock:
+                    sys.stdout.stream.write(output)
+
+    def _banner(self, step, status):
+        number = self.order.index(step.name) + 1
+        print("\n" + "="*70)
+        print(f"STEP {number}/{len(self.order)}: {(step.title or step.name).upper()}{status}")
+        print("="*70)
+
+    def run(self):
+        """
+        Execute the pipeline
+
+        Returns:
+            StepResults mapping step name -> result
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        state = self._read_state()
+        results = StepResults(self.cache_dir)
+        self.runs = {}
+        pending = list(self.order)
+        running = {}
+        capture = self.n_workers > 1
+        stdout = sys.stdout
+        if capture:
+            sys.stdout = _ThreadOutput(stdout)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.n_workers) as pool:
+                while pending or running:
+                    # Resolve every step whose dependencies are done, in declaration order
+                    for name in list(pending):
+                        step = self.steps[name]
+                        if not all(dep in self.runs for dep in step.deps + step.after):
+                            continue
+                        if len(running) >= self.n_workers:
+                            break
+                        pending.remove(name)
+                        fingerprint = self.fingerprint(step)
+                        if self._is_fresh(step, fingerprint, state.get(name)):
+                            with self._output_lock:
+                                self._banner(step, ' (cached)')
+                                print("\n⏭ Inputs and code unchanged - reusing the previous result")
+                            results._cached.add(name)
+                            self.runs[name] = StepRun(name, 'cached', fingerprint)
+                            continue
+                        future = pool.submit(self._execute, step, results, capture)
+                        running[future] = (step, fingerprint)
+                        if not capture:
+                            # Sequential mode: finish this step before looking further
+                            break
+
+                    if not running:
+                        continue
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        step, fingerprint = running.pop(future)
+                        value, seconds, error = future.result()
+                        if error is not None:
+                            state.pop(step.name, None)
+                            self._write_state(state)
+                            raise error
+                        results._values[step.name] = value
+                        results._cached.discard(step.name)
+                        self.runs[step.name] = StepRun(step.name, 'ran', fingerprint, seconds)
+                        state[step.name] = {
+                            'fingerprint': fingerprint,
+                            'outputs': {str(path): self._file_hash(path)
+                                        for path in step.outputs if Path(path).exists()},
+                            'seconds': round(seconds, 3),
+                        }
+                        self._write_state(state)
+        finally:
+            sys.stdout = stdout
+
+        return results
+
+    def report(self):
+        """Print how each step was resolved and how long it took"""
+        print("\n⏱ PIPELINE STEPS:")
+        for name in self.order:
+            run = self.runs.get(name)
+            if run is None:
+                continue
+            timing = f"{run.seconds:6.2f}s" if run.status == 'ran' else '  cached'
+            print(f"  {name:<20} {timing}")
@@ -0,0 +1,77 @@
+"""
+Profiling Module for ABG Motors Market Entry Analysis
+Per-stage wall time, peak memory and allocation counts via tracemalloc
+"""
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+
+class StageProfiler:
+    """
+    Record time and Python/NumPy heap usage for named pipeline stages
+
+    Memory is measured with tracemalloc, which sees NumPy buffers as well as
+    Python objects (Arrow-backed string buffers are not traced). Peak is the
+    highest traced memory reached while the stage ran, relative to the start
+    of the stage; allocations counts the memory blocks newly allocated
+    during the stage that are still alive at its end.
+
+    A disabled profiler records nothing and adds no overhead, so callers can
+    always wrap their stages in profiler.stage(...).
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.stages = []
+        self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name):
+        """Context manager measuring one stage"""
+        if not self.enabled:
+            yield
+            return
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+        before = tracemalloc.take_snapshot()
+        start_current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            end_current, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            new_blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename')
+                             if stat.count_diff > 0)
+            self.stages.append({
+                'stage': name,
+                'seconds': elapsed,
+                'peak_mb': (peak - start_current) / 1024 ** 2,
+                'net_mb': (end_current - start_current) / 1024 ** 2,
+                'allocations': new_blocks,
+            })
+
+    def stop(self):
+        """Stop tracemalloc if this profiler started it"""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def report(self):
+        """Return the recorded stages as a DataFrame"""
+        return pd.DataFrame(self.stages, columns=['stage', 'seconds', 'peak_mb', 'net_mb', 'allocations'])
+
+    def print_report(self, title='STAGE PROFILE'):
+        if not self.stages:
+            return
+        print(f"\n📊 {title}:")
+        print(self.report().round(4).to_string(index=False))
@@ -0,0 +1,90 @@
+"""
+Dataset Schema Module for ABG Motors Market Entry Analysis
+Declares compact column dtypes for the raw datasets and enforces them on load
+"""
+
+import pandas as pd
+import numpy as np
+
+
+def _string_dtype():
+    """Arrow-backed strings when pyarrow is installed, plain objects otherwise"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return 'object'
+    return 'string[pyarrow]'
+
+
+STRING_DTYPE = _string_dtype()
+GENDER_DTYPE = pd.CategoricalDtype(categories=['F', 'M'])
+
+JAPANESE_SCHEMA = {
+    'ID': STRING_DTYPE,
+    'CURR_AGE': 'int16',
+    'GENDER': GENDER_DTYPE,
+    'ANN_INCOME': 'int32',
+    'AGE_CAR': 'int16',
+    'PURCHASE': 'int8',
+}
+
+INDIAN_SCHEMA = {
+    'ID': STRING_DTYPE,
+    'CURR_AGE': 'int16',
+    'GENDER': GENDER_DTYPE,
+    'ANN_INCOME': 'int32',
+    'DT_MAINT': STRING_DTYPE,
+}
+
+
+def apply_schema(df, schema):
+    """
+    Cast DataFrame columns to the declared compact dtypes
+
+    Integer columns are range-checked before downcasting so values never
+    wrap silently; columns with missing values use the matching nullable
+    integer dtype. Categorical columns with fixed categories reject
+    unexpected labels instead of turning them into NaN.
+
+    Args:
+        df: Raw DataFrame
+        schema: Mapping of column name to target dtype
+
+    Returns:
+        DataFrame with schema columns cast (other columns untouched)
+
+    Raises:
+        ValueError: If a column cannot be represented by its declared dtype
+    """
+    casts = {}
+
+    for column, dtype in schema.items():
+        if column not in df.columns:
+            continue
+        series = df[column]
+
+        if isinstance(dtype, str) and dtype.startswith('int'):
+            info = np.iinfo(dtype)
+            low, high = series.min(), series.max()
+            if series.notna().any() and (low < info.min or high > info.max):
+                raise ValueError(
+                    f"Column {column} range [{low}, {high}] does not fit declared dtype {dtype}"
+                )
+            if series.isna().any():
+                dtype = dtype.capitalize()
+
+        elif isinstance(dtype, pd.CategoricalDtype) and dtype.categories is not None:
+            unexpected = set(series.dropna().unique()) - set(dtype.categories)
+            if unexpected:
+                raise ValueError(
+                    f"Column {column} has values outside declared categories: {sorted(unexpected)}"
+                )
+
+        casts[column] = dtype
+
+    return df.astype(casts)
+
+
+def memory_mb(df):
+    """Deep memory usage of a DataFrame in megabytes"""
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
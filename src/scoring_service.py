@@ -0,0 +1,377 @@
+"""
+Online Scoring Service Module for ABG Motors Market Entry Analysis
+Long-lived HTTP service returning purchase probabilities for single prospects
+"""
+
+import argparse
+import bisect
+import json
+import math
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+
+from compiled_scorer import CompiledScorer, COMPILED_SCORER_FILE
+from model_registry import ModelRegistry
+from model_backends import read_backend
+from feature_config import (
+    AGE_CAR_THRESHOLDS, REFERENCE_DATE, FAST_PATH_FORMATS, EXCEL_EPOCH, EXCEL_SERIAL_RANGE
+)
+
+
+REQUIRED_FIELDS = ('CURR_AGE', 'GENDER', 'ANN_INCOME')
+
+
+@lru_cache(maxsize=65536)
+def parse_maintenance_date(value):
+    """
+    Parse a DT_MAINT string in the same order as MaintenanceDateParser
+
+    Fixed fast-path formats first, then pandas' format='mixed' inference as
+    the slow path, then Excel serial numbers for digit strings pandas
+    rejects (e.g. '43210'; '2018' stays 2018-01-01), so every string the
+    batch parser accepts gets the same date here. pandas is only imported
+    when a value reaches the slow path. Maintenance dates repeat heavily,
+    so parsed values are memoised.
+    """
+    value = value.strip()
+    for _, fmt in FAST_PATH_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+
+    import pandas as pd
+    try:
+        parsed = pd.to_datetime(value, format='mixed')
+    except (ValueError, OverflowError):
+        parsed = pd.NaT
+    if parsed is pd.NaT:
+        try:
+            serial = float(value)
+        except ValueError:
+            serial = None
+        low, high = EXCEL_SERIAL_RANGE
+        if serial is not None and low <= serial <= high:
+            return EXCEL_EPOCH + timedelta(days=serial)
+        raise ValueError(f"Unrecognised DT_MAINT value: {value!r}")
+    if parsed.tzinfo is not None:
+        # The batch parser keeps the UTC wall time of aware values
+        parsed = parsed.tz_convert(None)
+    return parsed.to_pydatetime()
+
+
+class ProspectScorer:
+    """
+    Score raw prospect records without pandas
+
+    Applies the FeatureEngineer transforms to one record in plain Python
+    (DT_MAINT -> AGE_CAR against the reference date, negatives clipped to 0,
+    AGE_CAR -> segment with the same right-closed thresholds, GENDER -> GENDER_M)
+    and scores with the compiled logistic model loaded once from models/.
+    """
+
+    def __init__(self, model_dir='models', age_car_thresholds=AGE_CAR_THRESHOLDS,
+                 reference_date=REFERENCE_DATE):
+        registry = ModelRegistry(model_dir)
+        model_file = Path(model_dir) / COMPILED_SCORER_FILE
+        if registry.exists():
+            self.scorer, manifest = registry.load_scorer()
+            self.model_version = manifest['version']
+            registry.warn_if_flat_differs(self.model_version)
+        elif model_file.exists():
+            backend = read_backend(model_dir)
+            pkl_files = [Path(model_dir) / backend.model_file, Path(model_dir) / 'feature_scaler.pkl']
+            self.scorer = CompiledScorer.load_current(model_file, pkl_files)
+            if self.scorer is None:
+                # Retrained since the npz was written: fold the current pkl files instead
+                import joblib
+                print(f"⚠ {model_file} was not compiled from the current pkl files; compiling them")
+                with open(Path(model_dir) / 'feature_names.txt') as f:
+                    feature_names = [line.strip() for line in f]
+                self.scorer = CompiledScorer.compile(
+                    joblib.load(pkl_files[0]), joblib.load(pkl_files[1]), feature_names
+                )
+            self.model_version = None
+        else:
+            raise FileNotFoundError(
+                f"{model_file} not found - run src/model_builder.py to export the compiled scorer"
+            )
+        self.feature_names = self.scorer.feature_names
+        self.thresholds = sorted(age_car_thresholds)
+        self.reference_date = reference_date
+        # Plain floats: for one row a Python dot product beats NumPy call overhead
+        self._weights = [float(w) for w in self.scorer.weights]
+        self._bias = float(self.scorer.bias)
+        self._classes = [int(c) for c in self.scorer.classes]
+
+    def features(self, record):
+        """
+        Build the model feature vector for one raw record
+
+        Args:
+            record: dict with CURR_AGE, GENDER, ANN_INCOME and either
+                DT_MAINT or AGE_CAR
+
+        Returns:
+            (feature list in model order, AGE_CAR, AGE_CAR_SEGMENT)
+        """
+        missing = [name for name in REQUIRED_FIELDS if name not in record]
+        if 'DT_MAINT' not in record and 'AGE_CAR' not in record:
+            missing.append('DT_MAINT')
+        if missing:
+            raise ValueError(f"Missing fields: {missing}")
+
+        gender = record['GENDER']
+        if gender not in ('M', 'F'):
+            raise ValueError(f"GENDER must be 'M' or 'F', got {gender!r}")
+
+        numbers = {name: float(record[name]) for name in ('CURR_AGE', 'ANN_INCOME', 'AGE_CAR') if name in record}
+        non_finite = [name for name, value in numbers.items() if not math.isfinite(value)]
+        if non_finite:
+            raise ValueError(f"Fields must be finite numbers: {non_finite}")
+
+        if 'AGE_CAR' in record:
+            age_car = int(numbers['AGE_CAR'])
+        else:
+            age_car = (self.reference_date - parse_maintenance_date(str(record['DT_MAINT']))).days
+            # Maintenance after the reference date counts as very recent
+            age_car = max(age_car, 0)
+
+        segment = bisect.bisect_right(self.thresholds, age_car) + 1
+
+        values = {
+            'CURR_AGE': numbers['CURR_AGE'],
+            'ANN_INCOME': numbers['ANN_INCOME'],
+            'AGE_CAR': float(age_car),
+            'GENDER_M': 1.0 if gender == 'M' else 0.0,
+            'GENDER_F': 1.0 if gender == 'F' else 0.0,
+        }
+        for i in range(1, len(self.thresholds) + 2):
+            values[f'SEGMENT_{i}'] = 1.0 if segment == i else 0.0
+
+        return [values[name] for name in self.feature_names], age_car, segment
+
+    def _result(self, probability, age_car, segment):
+        return {
+            'purchase_probability': probability,
+            'purchase_prediction': self._classes[1] if probability > 0.5 else self._classes[0],
+            'age_car': age_car,
+            'age_car_segment': segment,
+        }
+
+    def score_one(self, record):
+        """Score a single record in pure Python"""
+        x, age_car, segment = self.features(record)
+        z = self._bias
+        for weight, value in zip(self._weights, x):
+            z += weight * value
+        probability = 1 / (1 + math.exp(-z)) if z >= 0 else math.exp(z) / (1 + math.exp(z))
+        return self._result(probability, age_car, segment)
+
+    def score_vectors(self, rows):
+        """Score prepared (features, age_car, segment) tuples in one matmul"""
+        X = np.array([row[0] for row in rows], dtype='float64')
+        probabilities = self.scorer.predict_proba(X)
+        return [self._result(float(p), row[1], row[2]) for p, row in zip(probabilities, rows)]
+
+    def score_many(self, records):
+        """Score a list of records with one vectorized pass"""
+        return self.score_vectors([self.features(record) for record in records])
+
+    def benchmark(self, records, repeats=1000):
+        """
+        In-process single-record latency percentiles
+
+        Returns:
+            dict with p50/p99/max latency in microseconds
+        """
+        timings = []
+        for i in range(repeats):
+            record = records[i % len(records)]
+            start = time.perf_counter()
+            self.score_one(record)
+            timings.append((time.perf_counter() - start) * 1e6)
+        timings = np.array(timings)
+        return {
+            'p50_us': float(np.percentile(timings, 50)),
+            'p99_us': float(np.percentile(timings, 99)),
+            'max_us': float(timings.max()),
+        }
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent scoring requests into batches
+
+    A single worker thread blocks for the first queued request, then drains
+    whatever else is already waiting (up to max_batch) and scores it with one
+    matmul. With max_wait_ms=0 a lone request is never delayed; under
+    concurrent load batches form naturally. A positive max_wait_ms trades a
+    little latency for larger batches.
+    """
+
+    def __init__(self, scorer, max_batch=64, max_wait_ms=0.0):
+        self.scorer = scorer
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.requests = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, record):
+        """Queue one record; features are built in the caller's thread"""
+        future = Future()
+        self._queue.put((self.scorer.features(record), future))
+        return future
+
+    def score(self, record, timeout=5.0):
+        return self.submit(record).result(timeout=timeout)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    @property
+    def mean_batch_size(self):
+        return self.requests / self.batches if self.batches else 0.0
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                try:
+                    remaining = deadline - time.perf_counter()
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+
+            try:
+                results = self.scorer.score_vectors([features for features, _ in batch])
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+            else:
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            self.batches += 1
+            self.requests += len(batch)
+
+
+class ScoringRequestHandler(BaseHTTPRequestHandler):
+    """
+    POST /score   body: one record object, or a list of records
+    GET  /health  liveness and batching statistics
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path != '/health':
+            self._send(404, {'error': 'not found'})
+            return
+        batcher = self.server.batcher
+        self._send(200, {
+            'status': 'ok',
+            'features': self.server.scorer.feature_names,
+            'model_version': self.server.scorer.model_version,
+            'requests': batcher.requests,
+            'mean_batch_size': batcher.mean_batch_size,
+        })
+
+    def do_POST(self):
+        if self.path != '/score':
+            self._send(404, {'error': 'not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length))
+            if isinstance(payload, list):
+                result = self.server.scorer.score_many(payload)
+            else:
+                result = self.server.batcher.score(payload)
+        except (ValueError, TypeError, KeyError) as exc:
+            self._send(400, {'error': str(exc)})
+            return
+        except TimeoutError:
+            self._send(503, {'error': 'scoring timed out'})
+            return
+        except Exception as exc:
+            self._send(500, {'error': f'{type(exc).__name__}: {exc}'})
+            return
+        self._send(200, result)
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Per-request access logs would dominate latency
+        pass
+
+
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default listen backlog of 5 resets connections under bursts
+    request_queue_size = 128
+
+
+def create_server(host='127.0.0.1', port=8080, model_dir='models', max_batch=64, max_wait_ms=0.0):
+    """Build a ready-to-run scoring server (model loaded once, here)"""
+    server = ScoringServer((host, port), ScoringRequestHandler)
+    server.scorer = ProspectScorer(model_dir=model_dir)
+    server.batcher = MicroBatcher(server.scorer, max_batch=max_batch, max_wait_ms=max_wait_ms)
+    return server
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='ABG Motors online purchase scoring service')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--model-dir', default='models')
+    parser.add_argument('--max-batch', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, args.model_dir, args.max_batch, args.max_wait_ms)
+
+    print("="*60)
+    print("ABG MOTORS - ONLINE SCORING SERVICE")
+    print("="*60)
+    print(f"  Listening on http://{args.host}:{args.port}")
+    print(f"  Features: {server.scorer.feature_names}")
+    print("  POST /score  {\"CURR_AGE\": 45, \"GENDER\": \"M\", \"ANN_INCOME\": 1200000, \"DT_MAINT\": \"4/20/2018\"}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.batcher.close()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+Storage Module for ABG Motors Market Entry Analysis
+Pluggable table storage (Parquet, Feather, Arrow IPC, CSV) with preserved dtypes
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class StorageFormat:
+    """
+    One on-disk table format
+
+    Attributes:
+        name: Format name used by the pipeline and CLIs
+        suffix: File extension
+        columnar: Binary Arrow-based format that keeps the pandas dtypes
+            (categoricals, int8/int16, Arrow strings); CSV re-infers them
+        compression: Codec used when writing (None for uncompressed)
+    """
+    name: str
+    suffix: str
+    columnar: bool
+    compression: str = None
+
+
+FORMATS = {
+    # zstd pages: smallest files, still fast to decode
+    'parquet': StorageFormat('parquet', '.parquet', True, 'zstd'),
+    # Feather v2 with lz4 buffers: cheapest compressed round-trip
+    'feather': StorageFormat('feather', '.feather', True, 'lz4'),
+    # Uncompressed Arrow IPC file, memory-mapped on read
+    'arrow': StorageFormat('arrow', '.arrow', True, None),
+    'csv': StorageFormat('csv', '.csv', False, None),
+}
+
+SUFFIXES = {fmt.suffix: fmt for fmt in FORMATS.values()}
+
+# Intermediates are columnar when pyarrow is installed; CSV stays the export format
+EXPORT_FORMAT = 'csv'
+
+
+def is_available():
+    """Columnar formats require pyarrow; everything falls back to CSV without it"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+DEFAULT_FORMAT = 'parquet' if is_available() else 'csv'
+
+
+def get_format(name=None):
+    """Look up a format by name (None gives DEFAULT_FORMAT)"""
+    if isinstance(name, StorageFormat):
+        return name
+    try:
+        fmt = FORMATS[name or DEFAULT_FORMAT]
+    except KeyError:
+        raise ValueError(f"Unknown storage format {name!r}; expected one of {tuple(FORMATS)}") from None
+    if fmt.columnar and not is_available():
+        raise ImportError(f"The {fmt.name!r} format needs pyarrow (pip install pyarrow)")
+    return fmt
+
+
+def table_path(path, fmt=None):
+    """path with the extension of fmt (any known table extension is replaced)"""
+    path = Path(path)
+    if path.suffix in SUFFIXES:
+        path = path.with_suffix('')
+    return path.with_name(path.name + get_format(fmt).suffix)
+
+
+def _marker_path(path):
+    """Hidden file next to a table recording which formats hold its latest data"""
+    path = Path(path)
+    if path.suffix in SUFFIXES:
+        path = path.with_suffix('')
+    return path.with_name(f'.{path.name}.table.json')
+
+
+class ContentHash:
+    """
+    Fingerprint of a table's columns and row values
+
+    Rows are hashed with pandas' hash_pandas_object, which depends on the
+    values rather than on how they are chunked or categorized, so a table
+    written in chunks hashes the same as when written in one piece.
+    """
+
+    def __init__(self, columns):
+        self._digest = hashlib.sha256(json.dumps([str(c) for c in columns]).encode())
+
+    def update(self, df):
+        self._digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+        return self
+
+    def hexdigest(self):
+        return self._digest.hexdigest()
+
+
+def record_write(path, fmt, fingerprint):
+    """
+    Record that path now holds the table with this fingerprint in fmt
+
+    Formats recorded earlier with the same fingerprint (the same data in
+    another format, e.g. the --csv copy) stay current; every other format
+    becomes stale and find_table no longer returns it.
+    """
+    marker = _marker_path(path)
+    recorded = _read_marker(marker)
+    formats = recorded.get('formats', []) if recorded.get('fingerprint') == fingerprint else []
+    state = {'fingerprint': fingerprint, 'formats': list(dict.fromkeys(formats + [get_format(fmt).name]))}
+    tmp = marker.with_name(marker.name + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp, marker)
+
+
+def _read_marker(marker):
+    try:
+        with open(marker) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def find_table(path, fmt=None):
+    """
+    Existing file for a table path, whatever format it was written in
+
+    An exact path is returned as-is, and fmt restricts the lookup to one
+    format. Otherwise only formats holding the latest write are considered
+    (see record_write), so a table left over from an earlier run in another
+    format never shadows a newer one; files with no record (e.g. tracked
+    CSVs) are all candidates. Among the candidates columnar files take
+    precedence over CSV, and the most recently written columnar file wins.
+
+    Raises:
+        FileNotFoundError: No file for the table exists
+    """
+    path = Path(path)
+    if path.suffix in SUFFIXES and path.exists():
+        return path
+    formats = [get_format(fmt)] if fmt is not None else list(FORMATS.values())
+    candidates = [table_path(path, candidate) for candidate in formats]
+    existing = [candidate for candidate in candidates if candidate.exists()]
+    if not existing:
+        raise FileNotFoundError(f"No table found for {path} (tried {', '.join(c.suffix for c in candidates)})")
+    recorded = _read_marker(_marker_path(path)).get('formats', [])
+    current = [candidate for candidate in existing if SUFFIXES[candidate.suffix].name in recorded]
+    if current:
+        existing = current
+    columnar = [candidate for candidate in existing if SUFFIXES[candidate.suffix].columnar]
+    if not columnar:
+        return existing[0]
+    return max(columnar, key=lambda candidate: candidate.stat().st_mtime_ns)
+
+
+def _write(df, path, fmt):
+    if fmt.name == 'csv':
+        df.to_csv(path, index=False)
+        return
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if fmt.name == 'parquet':
+        pq.write_table(table, path, compression=fmt.compression)
+    else:
+        # Feather v2 is the Arrow IPC file format, optionally with compressed buffers
+        feather.write_feather(table, path, compression=fmt.compression or 'uncompressed')
+
+
+def write_table(df, path, fmt=None):
+    """
+    Write a DataFrame (without its index) in the given format
+
+    The file is written next to its destination and renamed into place,
+    so readers never see a partial table. The write is recorded (see
+    record_write), so copies of older data in other formats stop being
+    found by find_table.
+
+    Args:
+        df: DataFrame to store
+        path: Destination; its extension is replaced by the format's
+        fmt: Format name (defaults to DEFAULT_FORMAT)
+
+    Returns:
+        Path of the written file
+    """
+    fmt = get_format(fmt)
+    path = table_path(path, fmt)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f'.{path.name}-', dir=path.parent)
+    os.close(fd)
+    try:
+        _write(df, tmp, fmt)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    record_write(path, fmt, ContentHash(df.columns).update(df).hexdigest())
+    return path
+
+
+def read_table(path, columns=None, fmt=None):
+    """
+    Read a table written by write_table (or any CSV/Parquet/Feather file)
+
+    Args:
+        path: File, or table path without a specific extension (see find_table)
+        columns: Optional subset of columns to read
+        fmt: Only read this format (default: see find_table)
+
+    Returns:
+        pd.DataFrame with the stored dtypes (CSV dtypes are inferred)
+    """
+    path = find_table(path, fmt)
+    fmt = SUFFIXES[path.suffix]
+    if fmt.name == 'csv':
+        return pd.read_csv(path, usecols=columns)
+    if fmt.name == 'parquet':
+        return pd.read_parquet(path, columns=columns)
+
+    import pyarrow.feather as feather
+    # Uncompressed IPC buffers are read straight from the page cache
+    return feather.read_table(path, columns=columns, memory_map=fmt.compression is None).to_pandas()
+
+
+def _best_of(repeats, func):
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def benchmark_formats(df, formats=None, n_repeats=3, directory=None):
+    """
+    Write time, read time, file size and dtype round-trip of each format
+
+    Args:
+        df: Table to store
+        formats: Format names (defaults to every format pyarrow allows)
+        n_repeats: Timings are the best of this many runs
+        directory: Scratch directory (a temporary one by default)
+
+    Returns:
+        DataFrame with one row per format
+    """
+    if formats is None:
+        formats = [name for name, fmt in FORMATS.items() if is_available() or not fmt.columnar]
+    rows = []
+    with tempfile.TemporaryDirectory(dir=directory) as scratch:
+        for name in formats:
+            path = Path(scratch) / 'table'
+            write_seconds, written = _best_of(n_repeats, lambda: write_table(df, path, name))
+            read_seconds, restored = _best_of(n_repeats, lambda: read_table(written))
+            size = written.stat().st_size
+            rows.append({
+                'format': name,
+                'compression': get_format(name).compression or '-',
+                'write_ms': write_seconds * 1000,
+                'read_ms': read_seconds * 1000,
+                'size_kb': size / 1024,
+                'ratio_vs_memory': size / df.memory_usage(deep=True).sum(),
+                'dtypes_preserved': restored.dtypes.astype(str).tolist() == df.dtypes.astype(str).tolist(),
+            })
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    """Benchmark the storage formats on the pipeline's intermediate tables"""
+    parser = argparse.ArgumentParser(description='ABG Motors table storage benchmark')
+    parser.add_argument('tables', nargs='*', default=[
+        'data/processed/japanese_raw', 'data/processed/japanese_processed',
+        'data/processed/indian_raw', 'data/processed/indian_predictions',
+    ], help='Tables to benchmark (any stored format, extension optional)')
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print("="*60)
+    print("ABG MOTORS - STORAGE FORMAT BENCHMARK")
+    print("="*60)
+
+    results = {}
+    for table in args.tables:
+        try:
+            df = read_table(table)
+        except FileNotFoundError as exc:
+            print(f"\n⚠ {exc}")
+            continue
+        results[table] = benchmark_formats(df, n_repeats=args.repeats)
+        print(f"\n📦 {Path(table).stem} ({len(df):,} rows, {df.shape[1]} columns):")
+        print(results[table].to_string(index=False, float_format=lambda x: f"{x:,.2f}"))
+    return results
+
+
+if __name__ == "__main__":
+    main()
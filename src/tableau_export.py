@@ -3,18 +3,87 @@ Tableau Export Module for ABG Motors Market Entry Analysis
 Prepares data for Tableau visualization
 """
 
+import argparse
+from contextlib import nullcontext
+
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
+from hyper_extract import HYPER_SUFFIX, HyperExtractWriter, write_hyper, is_available as hyper_available
+from storage import EXPORT_FORMAT, FORMATS, read_table, write_table
+
+
+# Table paths without extension: read in whichever format was written last
+JAPANESE_PROCESSED_FILE = 'data/processed/japanese_processed'
+INDIAN_PREDICTIONS_FILE = 'data/processed/indian_predictions'
+TABLEAU_DIR = Path('data/tableau')
+# Storage formats plus typed Hyper extracts (see hyper_extract)
+TABLEAU_FORMATS = tuple(FORMATS) + ('hyper',)
+
+# Dashboard dimensions, levels in display order
+SEGMENT_LABELS = {
+    1: 'Segment 1 (<200 days)',
+    2: 'Segment 2 (200-360 days)',
+    3: 'Segment 3 (360-500 days)',
+    4: 'Segment 4 (>500 days)'
+}
+AGE_GROUP_BINS = [0, 30, 40, 50, 60, 100]
+AGE_GROUP_LABELS = ['<30', '30-40', '40-50', '50-60', '60+']
+INCOME_QUARTILE_LABELS = ['Q1 (Low)', 'Q2', 'Q3', 'Q4 (High)']
+CONFIDENCE_BINS = [0, 0.3, 0.5, 0.7, 1.0]
+CONFIDENCE_LABELS = ['Low (<30%)', 'Medium (30-50%)', 'High (50-70%)', 'Very High (>70%)']
+
+# Market cube: dimensions (GROUPING_ID bit order, most significant first) and their levels
+CUBE_DIMENSIONS = {
+    'AGE_GROUP': AGE_GROUP_LABELS,
+    'INCOME_QUARTILE': INCOME_QUARTILE_LABELS,
+    'SEGMENT_LABEL': list(SEGMENT_LABELS.values()),
+    'GENDER': ['F', 'M'],
+    'CONFIDENCE_CATEGORY': CONFIDENCE_LABELS,
+}
+ROLLUP_LABEL = 'All'
+
+
+def _frame(df, path):
+    """The frame handed over by the pipeline, or the table on disk when run standalone"""
+    return read_table(path) if df is None else df
+
+
+def _save_feed(df, name, fmt, hyper_writer=None):
+    """
+    Write a feed in fmt, or in each format of a tuple; returns the written paths
+    
+    Hyper extracts go through hyper_writer, the HyperExtractWriter shared by
+    the export batch; without one a Hyper process is started for this feed.
+    """
+    paths = []
+    for each in ((fmt,) if isinstance(fmt, str) else fmt):
+        if each == 'hyper':
+            if hyper_writer is None:
+                paths.append(write_hyper(df, TABLEAU_DIR / name))
+            else:
+                paths.append(hyper_writer.write(df, TABLEAU_DIR / name))
+        else:
+            paths.append(write_table(df, TABLEAU_DIR / name, each))
+    return paths
+
 
-def prepare_japanese_tableau_data():
-    """Prepare Japanese dataset for Tableau"""
+def prepare_japanese_tableau_data(df=None, fmt=EXPORT_FORMAT, hyper_writer=None):
+    """
+    Prepare Japanese dataset for Tableau
+    
+    Args:
+        df: Processed Japanese DataFrame already in memory (read from
+            data/processed/japanese_processed when None)
+        fmt: Output format, or a tuple of formats (see TABLEAU_FORMATS)
+        hyper_writer: Shared HyperExtractWriter for 'hyper' (see _save_feed)
+    """
     print("="*60)
     print("PREPARING JAPANESE DATA FOR TABLEAU")
     print("="*60)
     
-    df = pd.read_csv('data/processed/japanese_processed.csv')
+    df = _frame(df, JAPANESE_PROCESSED_FILE)
     
     # Select relevant columns
     tableau_df = df[[
@@ -24,44 +93,45 @@ def prepare_japanese_tableau_data():
     
     # Add descriptive labels
     tableau_df['COUNTRY'] = 'Japan'
-    tableau_df['SEGMENT_LABEL'] = tableau_df['AGE_CAR_SEGMENT'].map({
-        1: 'Segment 1 (<200 days)',
-        2: 'Segment 2 (200-360 days)',
-        3: 'Segment 3 (360-500 days)',
-        4: 'Segment 4 (>500 days)'
-    })
+    tableau_df['SEGMENT_LABEL'] = tableau_df['AGE_CAR_SEGMENT'].map(SEGMENT_LABELS)
     
     # Age groups
     tableau_df['AGE_GROUP'] = pd.cut(
         tableau_df['CURR_AGE'],
-        bins=[0, 30, 40, 50, 60, 100],
-        labels=['<30', '30-40', '40-50', '50-60', '60+']
+        bins=AGE_GROUP_BINS,
+        labels=AGE_GROUP_LABELS
     )
     
     # Income quartiles
     tableau_df['INCOME_QUARTILE'] = pd.qcut(
         tableau_df['ANN_INCOME'],
         q=4,
-        labels=['Q1 (Low)', 'Q2', 'Q3', 'Q4 (High)']
+        labels=INCOME_QUARTILE_LABELS
     )
     
-    output_file = Path('data/tableau') / 'japanese_market.csv'
-    output_file.parent.mkdir(parents=True, exist_ok=True)
-    tableau_df.to_csv(output_file, index=False)
+    output_files = _save_feed(tableau_df, 'japanese_market', fmt, hyper_writer)
     
-    print(f"✓ Japanese Tableau data saved: {output_file}")
+    print(f"✓ Japanese Tableau data saved: {', '.join(map(str, output_files))}")
     print(f"  Records: {len(tableau_df):,}")
     
     return tableau_df
 
 
-def prepare_indian_tableau_data():
-    """Prepare Indian dataset with predictions for Tableau"""
+def prepare_indian_tableau_data(df=None, fmt=EXPORT_FORMAT, hyper_writer=None):
+    """
+    Prepare Indian dataset with predictions for Tableau
+    
+    Args:
+        df: Indian predictions DataFrame already in memory (read from
+            data/processed/indian_predictions when None)
+        fmt: Output format, or a tuple of formats (see TABLEAU_FORMATS)
+        hyper_writer: Shared HyperExtractWriter for 'hyper' (see _save_feed)
+    """
     print("\n" + "="*60)
     print("PREPARING INDIAN DATA FOR TABLEAU")
     print("="*60)
     
-    df = pd.read_csv('data/processed/indian_predictions.csv')
+    df = _frame(df, INDIAN_PREDICTIONS_FILE)
     
     # Select relevant columns
     tableau_df = df[[
@@ -71,53 +141,55 @@ def prepare_indian_tableau_data():
     
     # Add descriptive labels
     tableau_df['COUNTRY'] = 'India'
-    tableau_df['SEGMENT_LABEL'] = tableau_df['AGE_CAR_SEGMENT'].map({
-        1: 'Segment 1 (<200 days)',
-        2: 'Segment 2 (200-360 days)',
-        3: 'Segment 3 (360-500 days)',
-        4: 'Segment 4 (>500 days)'
-    })
+    tableau_df['SEGMENT_LABEL'] = tableau_df['AGE_CAR_SEGMENT'].map(SEGMENT_LABELS)
     
     # Age groups
     tableau_df['AGE_GROUP'] = pd.cut(
         tableau_df['CURR_AGE'],
-        bins=[0, 30, 40, 50, 60, 100],
-        labels=['<30', '30-40', '40-50', '50-60', '60+']
+        bins=AGE_GROUP_BINS,
+        labels=AGE_GROUP_LABELS
     )
     
     # Income quartiles
     tableau_df['INCOME_QUARTILE'] = pd.qcut(
         tableau_df['ANN_INCOME'],
         q=4,
-        labels=['Q1 (Low)', 'Q2', 'Q3', 'Q4 (High)']
+        labels=INCOME_QUARTILE_LABELS
     )
     
     # Confidence categories
     tableau_df['CONFIDENCE_CATEGORY'] = pd.cut(
         tableau_df['PURCHASE_PROBABILITY'],
-        bins=[0, 0.3, 0.5, 0.7, 1.0],
-        labels=['Low (<30%)', 'Medium (30-50%)', 'High (50-70%)', 'Very High (>70%)']
+        bins=CONFIDENCE_BINS,
+        labels=CONFIDENCE_LABELS
     )
     
-    output_file = Path('data/tableau') / 'indian_market.csv'
-    tableau_df.to_csv(output_file, index=False)
+    output_files = _save_feed(tableau_df, 'indian_market', fmt, hyper_writer)
     
-    print(f"✓ Indian Tableau data saved: {output_file}")
+    print(f"✓ Indian Tableau data saved: {', '.join(map(str, output_files))}")
     print(f"  Records: {len(tableau_df):,}")
     print(f"  Predicted Purchases: {tableau_df['PURCHASE_PREDICTION'].sum():,}")
     
     return tableau_df
 
 
-def create_summary_statistics():
-    """Create summary statistics for dashboard"""
+def create_summary_statistics(japanese_df=None, indian_df=None, fmt=EXPORT_FORMAT, hyper_writer=None):
+    """
+    Create summary statistics for dashboard
+    
+    Args:
+        japanese_df: Processed Japanese DataFrame (read from disk when None)
+        indian_df: Indian predictions DataFrame (read from disk when None)
+        fmt: Output format, or a tuple of formats (see TABLEAU_FORMATS)
+        hyper_writer: Shared HyperExtractWriter for 'hyper' (see _save_feed)
+    """
     print("\n" + "="*60)
     print("CREATING SUMMARY STATISTICS")
     print("="*60)
     
     # Load data
-    japanese_df = pd.read_csv('data/processed/japanese_processed.csv')
-    indian_df = pd.read_csv('data/processed/indian_predictions.csv')
+    japanese_df = _frame(japanese_df, JAPANESE_PROCESSED_FILE)
+    indian_df = _frame(indian_df, INDIAN_PREDICTIONS_FILE)
     
     summary = {
         'Metric': [
@@ -148,36 +220,174 @@ def create_summary_statistics():
     
     summary_df = pd.DataFrame(summary)
     
-    output_file = Path('data/tableau') / 'market_comparison_summary.csv'
-    summary_df.to_csv(output_file, index=False)
+    # Counts and formatted rates share a column: store it as text (same CSV bytes)
+    output_files = _save_feed(summary_df.astype(str), 'market_comparison_summary', fmt, hyper_writer)
     
-    print(f"✓ Summary statistics saved: {output_file}")
+    print(f"✓ Summary statistics saved: {', '.join(map(str, output_files))}")
     print("\n" + summary_df.to_string(index=False))
     
     return summary_df
 
 
-def main():
+def build_cube(df, purchase_column, probability_column=None, dimensions=CUBE_DIMENSIONS):
+    """
+    Aggregate a feed over every combination of its dimensions (CUBE grouping sets)
+    
+    The rows are reduced in one vectorized pass: each dimension becomes
+    integer codes, the codes combine into one cell index, and bincounts
+    give the customer count, purchase sum and probability sum of every
+    finest-grained cell. Each grouping set is then a sum of that small
+    dense array over the rolled-up axes, so no grouping re-reads the rows.
+    
+    Dimensions the frame lacks (CONFIDENCE_CATEGORY for Japan) are always
+    rolled up. Rows outside every level (e.g. a probability of exactly 0,
+    which pd.cut leaves unbinned) form an empty-label level, so every
+    grouping set adds up to the full row count.
+    
+    Args:
+        df: Tableau feed (prepare_*_tableau_data output)
+        purchase_column: 0/1 column summed as PURCHASES
+        probability_column: Optional column averaged as MEAN_PROBABILITY
+        dimensions: Dimension -> levels, in GROUPING_ID bit order
+    
+    Returns:
+        DataFrame with one row per non-empty cell of every grouping set:
+        the dimension labels (ROLLUP_LABEL where rolled up), GROUPING_ID
+        (bit set per rolled-up dimension, as SQL GROUPING_ID), CUSTOMERS,
+        PURCHASES, PURCHASE_RATE and MEAN_PROBABILITY
+    """
+    present = [name for name in dimensions if name in df]
+    codes, levels = [], []
+    for name in present:
+        labels = list(dimensions[name])
+        dim_codes = pd.Categorical(df[name], categories=labels).codes.astype(np.intp)
+        if (dim_codes < 0).any():
+            dim_codes[dim_codes < 0] = len(labels)
+            labels.append(None)
+        codes.append(dim_codes)
+        levels.append(np.asarray(labels, dtype=object))
+    
+    shape = tuple(len(labels) for labels in levels)
+    size = int(np.prod(shape))
+    cells = np.ravel_multi_index(codes, shape) if present else np.zeros(len(df), dtype=np.intp)
+    counts = np.bincount(cells, minlength=size).reshape(shape)
+    purchases = np.bincount(cells, weights=df[purchase_column].to_numpy(dtype='float64'),
+                            minlength=size).reshape(shape)
+    probabilities = None
+    if probability_column is not None:
+        probabilities = np.bincount(cells, weights=df[probability_column].to_numpy(dtype='float64'),
+                                    minlength=size).reshape(shape)
+    
+    names = list(dimensions)
+    absent_bits = sum(1 << (len(names) - 1 - i) for i, name in enumerate(names) if name not in df)
+    frames = []
+    # Finest grouping first, grand total last
+    for rolled in np.ndindex(*(2,) * len(present)):
+        axes = tuple(axis for axis, flag in enumerate(rolled) if flag)
+        # keepdims: rolled-up axes have length 1, so cells index every axis alike
+        cell_counts = counts.sum(axis=axes, keepdims=True)
+        cell_index = np.nonzero(cell_counts)
+        
+        frame = {}
+        for name in names:
+            axis = present.index(name) if name in present else None
+            if axis is not None and not rolled[axis]:
+                frame[name] = levels[axis][cell_index[axis]]
+            else:
+                frame[name] = ROLLUP_LABEL
+        frame['GROUPING_ID'] = absent_bits + sum(
+            1 << (len(names) - 1 - names.index(present[axis])) for axis in axes
+        )
+        customers = cell_counts[cell_index]
+        purchase_sums = purchases.sum(axis=axes, keepdims=True)[cell_index]
+        frame['CUSTOMERS'] = customers.astype(np.int64)
+        frame['PURCHASES'] = np.rint(purchase_sums).astype(np.int64)
+        frame['PURCHASE_RATE'] = purchase_sums / customers
+        frame['MEAN_PROBABILITY'] = (probabilities.sum(axis=axes, keepdims=True)[cell_index] / customers
+                                     if probabilities is not None else np.nan)
+        frames.append(pd.DataFrame(frame))
+    
+    return pd.concat(frames, ignore_index=True)
+
+
+def create_market_cube(japanese_tableau=None, indian_tableau=None, fmt=EXPORT_FORMAT, hyper_writer=None):
+    """
+    Pre-aggregated market cube for the dashboards
+    
+    One compact table with counts, purchases, purchase rate and mean
+    probability for every combination of AGE_GROUP, INCOME_QUARTILE,
+    SEGMENT_LABEL, GENDER and CONFIDENCE_CATEGORY, per country, so the
+    dashboards filter on GROUPING_ID instead of aggregating customer rows.
+    Japan counts actual purchases, India predicted ones; the countries
+    are never rolled together.
+    
+    Args:
+        japanese_tableau: prepare_japanese_tableau_data output (read from
+            data/tableau/japanese_market when None)
+        indian_tableau: prepare_indian_tableau_data output (read from
+            data/tableau/indian_market when None)
+        fmt: Output format, or a tuple of formats (see TABLEAU_FORMATS)
+        hyper_writer: Shared HyperExtractWriter for 'hyper' (see _save_feed)
+    """
+    print("\n" + "="*60)
+    print("BUILDING MARKET CUBE")
+    print("="*60)
+    
+    japanese_tableau = _frame(japanese_tableau, TABLEAU_DIR / 'japanese_market')
+    indian_tableau = _frame(indian_tableau, TABLEAU_DIR / 'indian_market')
+    
+    cube = pd.concat([
+        build_cube(japanese_tableau, 'PURCHASE').assign(COUNTRY='Japan'),
+        build_cube(indian_tableau, 'PURCHASE_PREDICTION', 'PURCHASE_PROBABILITY').assign(COUNTRY='India'),
+    ], ignore_index=True)
+    cube = cube[['COUNTRY'] + [column for column in cube.columns if column != 'COUNTRY']]
+    
+    output_files = _save_feed(cube, 'market_cube', fmt, hyper_writer)
+    
+    print(f"✓ Market cube saved: {', '.join(map(str, output_files))}")
+    print(f"  Cells: {len(cube):,} across {cube['GROUPING_ID'].nunique()} grouping sets, "
+          f"from {len(japanese_tableau) + len(indian_tableau):,} customer rows")
+    
+    return cube
+
+
+def main(argv=None):
     """Main execution function"""
+    parser = argparse.ArgumentParser(description='ABG Motors Tableau export')
+    parser.add_argument('--format', choices=TABLEAU_FORMATS, nargs='+', default=[EXPORT_FORMAT],
+                        help='Format(s) of the Tableau feeds (hyper needs tableauhyperapi)')
+    args = parser.parse_args(argv)
+    formats = tuple(args.format)
+    if 'hyper' in formats and not hyper_available():
+        parser.error("--format hyper needs the tableauhyperapi package (pip install tableauhyperapi)")
+    
     print("="*60)
     print("ABG MOTORS - TABLEAU EXPORT MODULE")
     print("="*60)
     
-    # Prepare datasets
-    japanese_tableau = prepare_japanese_tableau_data()
-    indian_tableau = prepare_indian_tableau_data()
-    summary = create_summary_statistics()
+    # Prepare datasets (read once, shared by the exports and the summary)
+    japanese_df = read_table(JAPANESE_PROCESSED_FILE)
+    indian_df = read_table(INDIAN_PREDICTIONS_FILE)
+    # One Hyper process for the whole batch of extracts
+    with HyperExtractWriter() if 'hyper' in formats else nullcontext() as hyper_writer:
+        japanese_tableau = prepare_japanese_tableau_data(japanese_df, formats, hyper_writer)
+        indian_tableau = prepare_indian_tableau_data(indian_df, formats, hyper_writer)
+        summary = create_summary_statistics(japanese_df, indian_df, formats, hyper_writer)
+        cube = create_market_cube(japanese_tableau, indian_tableau, formats, hyper_writer)
     
     print("\n" + "="*60)
     print("TABLEAU EXPORT COMPLETED!")
     print("="*60)
     print("\n📊 Files ready for Tableau:")
-    print("  • data/tableau/japanese_market.csv")
-    print("  • data/tableau/indian_market.csv")
-    print("  • data/tableau/market_comparison_summary.csv")
+    for fmt in formats:
+        suffix = HYPER_SUFFIX if fmt == 'hyper' else FORMATS[fmt].suffix
+        print(f"  • data/tableau/japanese_market{suffix}")
+        print(f"  • data/tableau/indian_market{suffix}")
+        print(f"  • data/tableau/market_comparison_summary{suffix}")
+        print(f"  • data/tableau/market_cube{suffix}")
     
-    return japanese_tableau, indian_tableau, summary
+    return japanese_tableau, indian_tableau, summary, cube
 
 
 if __name__ == "__main__":
-    japanese_data, indian_data, summary = main()
+    japanese_data, indian_data, summary, cube = main()
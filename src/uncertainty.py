@@ -0,0 +1,176 @@
+"""
+Sales Uncertainty Module for ABG Motors Market Entry Analysis
+Vectorized Monte Carlo simulation of total purchases from predicted probabilities
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+DEFAULT_QUANTILES = (0.025, 0.05, 0.25, 0.5, 0.75, 0.95, 0.975)
+
+# Per-process copy of the thresholds, set once by the pool initializer
+_WORKER_THRESHOLDS = None
+
+
+@dataclass
+class SimulationResult:
+    """Distribution of simulated total purchases"""
+    totals: np.ndarray
+    target_sales: int
+    expected_sales: float
+    n_customers: int
+    n_bootstrap: int = 0
+    seconds: float = 0.0
+    quantiles: dict = field(default_factory=dict)
+
+    @property
+    def n_replicates(self):
+        return len(self.totals)
+
+    @property
+    def mean(self):
+        return float(self.totals.mean())
+
+    @property
+    def std(self):
+        return float(self.totals.std(ddof=1)) if len(self.totals) > 1 else 0.0
+
+    @property
+    def prob_target_met(self):
+        """Share of replicates with total sales >= target_sales"""
+        return float((self.totals >= self.target_sales).mean())
+
+    def interval(self, level=0.9):
+        """Central interval of simulated totals at the given coverage"""
+        tail = (1 - level) / 2
+        low, high = np.quantile(self.totals, [tail, 1 - tail])
+        return float(low), float(high)
+
+
+def purchase_thresholds(probabilities):
+    """
+    Integer form of the probabilities for raw-bit Bernoulli draws
+
+    A uniform 32-bit word u gives a purchase when u < floor(p * 2**32),
+    which has probability within 2**-32 of p. p = 1 cannot be expressed
+    as a uint32 threshold, so those customers are returned as a per-row
+    count of certain purchases instead.
+
+    Returns:
+        (uint32 thresholds of shape (n_rows, n_customers), int64 certain counts per row)
+
+    Raises:
+        ValueError: A probability is NaN, infinite or outside [0, 1]
+            (casting it to uint32 would give an undefined threshold)
+    """
+    probabilities = np.atleast_2d(np.asarray(probabilities, dtype='float64'))
+    invalid = ~((probabilities >= 0) & (probabilities <= 1))
+    if invalid.any():
+        raise ValueError(f"Purchase probabilities must be finite and in [0, 1]; "
+                         f"{int(invalid.sum()):,} are not (e.g. {probabilities[invalid][0]!r})")
+    certain = probabilities == 1
+    scaled = np.floor(probabilities * 2.0**32)
+    thresholds = np.where(certain, 0, scaled).astype(np.uint32)
+    return thresholds, certain.sum(axis=1).astype(np.int64)
+
+
+def _simulate_block(thresholds, certain, seed, start, stop):
+    """
+    Simulated totals for replicates [start, stop)
+
+    Replicate r draws one Bernoulli outcome per customer from row
+    r % n_rows of the threshold matrix (one row unless bootstrapped). The
+    block's random words come straight from the bit generator (two uint32
+    per raw uint64), skipping the conversion to floating point.
+    """
+    n_rows, n_customers = thresholds.shape
+    n_block = stop - start
+    words = np.random.PCG64(seed).random_raw((n_block * n_customers + 1) // 2)
+    uniforms = words.view(np.uint32)[:n_block * n_customers].reshape(n_block, n_customers)
+
+    totals = np.empty(n_block, dtype=np.int64)
+    replicate_rows = np.arange(start, stop) % n_rows
+    for row in np.unique(replicate_rows):
+        selected = replicate_rows == row
+        block = uniforms if n_rows == 1 else uniforms[selected]
+        totals[selected] = np.count_nonzero(block < thresholds[row], axis=1) + certain[row]
+    return totals
+
+
+def _init_worker(thresholds, certain):
+    global _WORKER_THRESHOLDS
+    _WORKER_THRESHOLDS = (thresholds, certain)
+
+
+def _simulate_block_worker(task):
+    seed, start, stop = task
+    return start, _simulate_block(*_WORKER_THRESHOLDS, seed, start, stop)
+
+
+def simulate_purchase_totals(probabilities, n_replicates=10000, target_sales=10000,
+                             quantiles=DEFAULT_QUANTILES, n_workers=1,
+                             max_block_mb=64, random_state=42):
+    """
+    Monte Carlo distribution of total purchases
+
+    Each replicate draws an independent Bernoulli(p_i) purchase for every
+    customer and sums them. Replicates are generated in blocks so that one
+    block of 32-bit random words stays under max_block_mb; blocks are
+    vectorized (one random fill, one comparison, one count per block) and
+    can be spread over a process pool. Every block has its own child seed
+    from np.random.SeedSequence(random_state), so results do not depend on
+    n_workers.
+
+    Args:
+        probabilities: PURCHASE_PROBABILITY per customer (finite, in [0, 1];
+            anything else raises ValueError), or a 2-D array of
+            shape (n_bootstrap, n_customers) from bootstrap refits;
+            replicates cycle through its rows
+        n_replicates: Number of simulated markets
+        target_sales: Sales target for P(sales >= target)
+        quantiles: Quantiles of the total to report
+        n_workers: Worker processes (1 runs in-process)
+        max_block_mb: Memory cap for one block of uniforms
+        random_state: Seed
+
+    Returns:
+        SimulationResult
+    """
+    started = time.perf_counter()
+    probabilities = np.asarray(probabilities, dtype='float64')
+    n_bootstrap = len(probabilities) if probabilities.ndim == 2 else 0
+    thresholds, certain = purchase_thresholds(probabilities)
+    n_customers = thresholds.shape[1]
+    if n_replicates < 1 or n_customers == 0:
+        raise ValueError("Need at least one replicate and one customer to simulate")
+
+    block = max(1, int(max_block_mb * 2**20 // (4 * n_customers)))
+    bounds = list(range(0, n_replicates, block)) + [n_replicates]
+    seeds = np.random.SeedSequence(random_state).spawn(len(bounds) - 1)
+    tasks = [(seed, start, stop) for seed, start, stop in zip(seeds, bounds[:-1], bounds[1:])]
+
+    totals = np.empty(n_replicates, dtype=np.int64)
+    n_workers = min(n_workers or os.cpu_count() or 1, len(tasks))
+    if n_workers == 1:
+        for seed, start, stop in tasks:
+            totals[start:stop] = _simulate_block(thresholds, certain, seed, start, stop)
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                 initargs=(thresholds, certain)) as pool:
+            for start, block_totals in pool.map(_simulate_block_worker, tasks):
+                totals[start:start + len(block_totals)] = block_totals
+
+    return SimulationResult(
+        totals=totals,
+        target_sales=target_sales,
+        expected_sales=float(probabilities.sum(axis=-1).mean()),
+        n_customers=n_customers,
+        n_bootstrap=n_bootstrap,
+        seconds=time.perf_counter() - started,
+        quantiles={q: float(v) for q, v in zip(quantiles, np.quantile(totals, quantiles))},
+    )
@@ -0,0 +1,183 @@
+"""
+Dataset Validation Module for ABG Motors Market Entry Analysis
+Single-pass profiling of loaded datasets with off/fast/full validation levels
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+
+VALIDATION_LEVELS = ('off', 'fast', 'full')
+
+
+@dataclass
+class ColumnProfile:
+    """Profile of a single column"""
+    name: str
+    dtype: str
+    null_count: int
+    cardinality: int
+    min: object = None
+    max: object = None
+    mean: float = None
+
+
+@dataclass
+class ValidationReport:
+    """Structured result of validating a dataset"""
+    dataset: str
+    rows: int
+    columns: dict = field(default_factory=dict)
+    target_column: str = None
+    target_rate: float = None
+
+    @property
+    def total_nulls(self):
+        return sum(profile.null_count for profile in self.columns.values())
+
+    def to_frame(self):
+        """Return the column profiles as a DataFrame (one row per column)"""
+        return pd.DataFrame([vars(profile) for profile in self.columns.values()]).set_index('name')
+
+    def summary(self):
+        """One-line human-readable summary"""
+        text = f"{self.dataset}: {self.rows:,} rows, {len(self.columns)} columns, {self.total_nulls} nulls"
+        if self.target_rate is not None:
+            text += f", {self.target_column} rate {self.target_rate:.2%}"
+        return text
+
+
+def profile_dataset(df, dataset='dataset', target_column=None):
+    """
+    Profile a DataFrame in one vectorized pass
+
+    Numeric columns are stacked into a single float64 matrix so null counts,
+    min, max, mean and cardinality come from one set of column-wise
+    reductions (cardinality from one sort of the matrix, NaN sorting last).
+    Categorical cardinality is read from the category codes; other columns
+    fall back to Series.nunique.
+
+    Args:
+        df: DataFrame to profile
+        dataset: Name used in the report
+        target_column: Optional binary target whose positive rate is reported
+
+    Returns:
+        ValidationReport
+    """
+    report = ValidationReport(dataset=dataset, rows=len(df))
+
+    numeric_columns = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])
+                       and not pd.api.types.is_bool_dtype(df[c])]
+
+    if numeric_columns and len(df):
+        matrix = np.column_stack([df[c].to_numpy(dtype='float64', na_value=np.nan)
+                                  for c in numeric_columns])
+        nan_mask = np.isnan(matrix)
+        null_counts = nan_mask.sum(axis=0)
+        valid_counts = len(df) - null_counts
+        filled = np.where(nan_mask, 0.0, matrix)
+        sums = filled.sum(axis=0)
+        mins = np.where(nan_mask, np.inf, matrix).min(axis=0)
+        maxs = np.where(nan_mask, -np.inf, matrix).max(axis=0)
+        # Distinct values: 1 + value changes between neighbours among the sorted valid rows
+        ordered = np.sort(matrix, axis=0)
+        in_valid = np.arange(1, len(df))[:, None] < valid_counts[None, :]
+        cardinalities = ((ordered[1:] != ordered[:-1]) & in_valid).sum(axis=0) + (valid_counts > 0)
+
+        for i, column in enumerate(numeric_columns):
+            has_values = valid_counts[i] > 0
+            report.columns[column] = ColumnProfile(
+                name=column,
+                dtype=str(df[column].dtype),
+                null_count=int(null_counts[i]),
+                cardinality=int(cardinalities[i]),
+                min=mins[i].item() if has_values else None,
+                max=maxs[i].item() if has_values else None,
+                mean=(sums[i] / valid_counts[i]).item() if has_values else None,
+            )
+
+    for column in df.columns:
+        if column in report.columns:
+            continue
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            null_count = int((codes < 0).sum())
+            cardinality = int((np.bincount(codes[codes >= 0],
+                                           minlength=len(series.cat.categories)) > 0).sum())
+        else:
+            null_count = int(series.isna().sum())
+            cardinality = int(series.nunique(dropna=True))
+        report.columns[column] = ColumnProfile(
+            name=column, dtype=str(series.dtype), null_count=null_count, cardinality=cardinality
+        )
+
+    # Keep the profiles in the dataset's column order
+    report.columns = {column: report.columns[column] for column in df.columns}
+
+    if target_column is not None and target_column in report.columns:
+        report.target_column = target_column
+        report.target_rate = report.columns[target_column].mean
+
+    return report
+
+
+def validate_dataset(df, level='fast', dataset='dataset', target_column=None):
+    """
+    Validate a dataset at the requested level
+
+    Args:
+        df: DataFrame to validate
+        level: 'off' (skip), 'fast' (profile only) or 'full' (profile and
+            print the detailed diagnostics)
+        dataset: Name used in the report
+        target_column: Optional binary target column
+
+    Returns:
+        ValidationReport, or None when level is 'off'
+    """
+    if level not in VALIDATION_LEVELS:
+        raise ValueError(f"validation level must be one of {VALIDATION_LEVELS}, got {level!r}")
+    if level == 'off':
+        return None
+
+    report = profile_dataset(df, dataset=dataset, target_column=target_column)
+
+    if level == 'full':
+        print_full_diagnostics(df, report)
+
+    return report
+
+
+def print_full_diagnostics(df, report):
+    """Print the detailed validation output for interactive runs"""
+    print("\n" + "="*60)
+    print(f"{report.dataset.upper()} DATASET VALIDATION")
+    print("="*60)
+
+    profiles = report.to_frame()
+
+    print(f"\nMissing Values:")
+    print(profiles['null_count'].rename_axis(None))
+
+    print(f"\nData Types:")
+    print(df.dtypes)
+
+    print(f"\nBasic Statistics:")
+    print(df.describe())
+
+    if report.target_column is not None:
+        print(f"\nTarget Variable ({report.target_column}) Distribution:")
+        print(df[report.target_column].value_counts())
+        print(f"Purchase Rate: {report.target_rate:.2%}")
+
+    if 'GENDER' in df.columns:
+        print(f"\nGender Distribution:")
+        print(df['GENDER'].value_counts())
+
+    if 'DT_MAINT' in df.columns:
+        print(f"\nDT_MAINT Sample Values:")
+        print(df['DT_MAINT'].head(10))
@@ -0,0 +1,58 @@
+"""
+Tests for the NumPy-only compiled scorer and its staleness check
+"""
+
+import sys
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from compiled_scorer import CompiledScorer  # noqa: E402
+
+
+@pytest.fixture
+def fitted():
+    rng = np.random.default_rng(0)
+    X = np.column_stack([rng.integers(18, 80, 500), rng.normal(1e6, 3e5, 500), rng.integers(0, 2, 500)])
+    y = (X[:, 0] / 80 + X[:, 1] / 2e6 + rng.normal(0, 0.3, 500) > 1).astype(int)
+    scaler = StandardScaler().fit(X)
+    model = LogisticRegression().fit(scaler.transform(X), y)
+    return model, scaler, X
+
+
+def test_matches_sklearn_predict_proba(fitted):
+    model, scaler, X = fitted
+    scorer = CompiledScorer.compile(model, scaler, ['CURR_AGE', 'ANN_INCOME', 'GENDER_M'])
+    expected = model.predict_proba(scaler.transform(X))[:, 1]
+    labels, probabilities = scorer.score(X)
+
+    np.testing.assert_allclose(probabilities, expected, rtol=1e-12, atol=1e-15)
+    np.testing.assert_array_equal(labels, model.predict(scaler.transform(X)))
+    np.testing.assert_allclose(scorer.astype('float32').predict_proba(X), expected, atol=1e-5)
+
+
+def test_load_current_rejects_retrained_pkl_files(fitted, tmp_path):
+    model, scaler, _ = fitted
+    pkl_files = [tmp_path / 'logistic_regression_model.pkl', tmp_path / 'feature_scaler.pkl']
+    joblib.dump(model, pkl_files[0])
+    joblib.dump(scaler, pkl_files[1])
+    npz = tmp_path / 'compiled_scorer.npz'
+    CompiledScorer.compile(model, scaler, ['a', 'b', 'c']).save(npz, source_files=pkl_files)
+
+    # Content, not mtimes: an npz older than its pkl files (fresh clone) still loads
+    for path in pkl_files:
+        path.touch()
+    assert CompiledScorer.load_current(npz, pkl_files) is not None
+
+    model.intercept_ = model.intercept_ + 1
+    joblib.dump(model, pkl_files[0])
+    assert CompiledScorer.load_current(npz, pkl_files) is None
+
+    # An npz deployed without its pkl files is trusted
+    assert CompiledScorer.load_current(npz, [tmp_path / 'missing.pkl']) is not None
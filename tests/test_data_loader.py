@@ -0,0 +1,40 @@
+"""
+Tests for DataLoader parsing and validation
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+pytest.importorskip('odf')
+
+from data_loader import DataLoader  # noqa: E402
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    pd.DataFrame({
+        'ID': ['J1', 'J2', 'J3'], 'CURR_AGE': [34, 51, 27], 'GENDER': ['M', 'F', 'M'],
+        'ANN_INCOME': [420000, 610000, 380000], 'AGE_CAR': [120, 450, 700], 'PURCHASE': [0, 1, 0],
+    }).to_excel(tmp_path / 'japan dataset.ods', engine='odf', index=False)
+    return tmp_path
+
+
+def test_parse_in_process_matches_in_process(data_dir):
+    expected = DataLoader(data_dir, use_cache=False).load_japanese_data()
+    loaded = DataLoader(data_dir, use_cache=False, parse_in_process=True).load_japanese_data()
+    pd.testing.assert_frame_equal(loaded, expected)
+
+
+def test_fast_validation_is_silent_until_asked(data_dir, capsys):
+    loader = DataLoader(data_dir, use_cache=False, validation='fast')
+    loader.load_japanese_data()
+    assert 'Validation' not in capsys.readouterr().out
+    assert loader.japanese_report.rows == 3
+
+    reports = loader.validate(verbose=True)
+    assert capsys.readouterr().out.strip() == f"Validation: {reports['japanese'].summary()}"
@@ -0,0 +1,56 @@
+"""
+Tests for the per-unique DT_MAINT parser against pandas' mixed-format parsing
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from date_parser import MaintenanceDateParser  # noqa: E402
+from scoring_service import parse_maintenance_date  # noqa: E402
+
+
+MIXED_VALUES = [
+    '4/20/2018', '12/31/2017', '2018-04-20', ' 6/8/2018 ', '2018', '20180420', '2017',
+    '12/31/2018 00:00:00', 'April 20, 2018', '2018-04-20 13:45:00', '1/2/2019',
+]
+
+
+def test_matches_pandas_mixed_format():
+    rng = np.random.default_rng(4)
+    values = pd.Series(rng.choice(MIXED_VALUES, 5000), name='DT_MAINT')
+    values[::97] = None
+
+    parsed = MaintenanceDateParser().parse(values)
+    expected = pd.to_datetime(values, format='mixed')
+
+    np.testing.assert_array_equal(parsed.to_numpy('datetime64[ns]'), expected.to_numpy('datetime64[ns]'))
+    assert parsed.name == 'DT_MAINT'
+
+
+def test_digit_strings_pandas_rejects_are_excel_serials():
+    parser = MaintenanceDateParser()
+    parsed = parser.parse(pd.Series(['43210', '2018', 43210, 43210.5]))
+    assert parsed.tolist() == [
+        pd.Timestamp('2018-04-20'), pd.Timestamp('2018-01-01'),
+        pd.Timestamp('2018-04-20'), pd.Timestamp('2018-04-20 12:00'),
+    ]
+    assert parser.report.fast_path_rows['Excel serial'] == 3
+
+
+@pytest.mark.parametrize('value', MIXED_VALUES + ['43210'])
+def test_service_parser_agrees_with_batch_parser(value):
+    batch = MaintenanceDateParser().parse(pd.Series([value])).iloc[0]
+    assert pd.Timestamp(parse_maintenance_date(value)) == batch
+
+
+def test_unparsable_values():
+    with pytest.raises(ValueError, match='Could not parse'):
+        MaintenanceDateParser().parse(pd.Series(['4/20/2018', 'not a date']))
+    coerced = MaintenanceDateParser(errors='coerce').parse(pd.Series(['4/20/2018', 'not a date']))
+    assert coerced.isna().tolist() == [False, True]
@@ -0,0 +1,58 @@
+"""
+Tests for the vectorized AGE_CAR segmentation
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from feature_engineering import FeatureEngineer  # noqa: E402
+
+
+def segment_age_car(days):
+    """The per-row rule create_age_car_segments used to apply"""
+    if days < 200:
+        return 1
+    elif days < 360:
+        return 2
+    elif days < 500:
+        return 3
+    else:
+        return 4
+
+
+@pytest.fixture
+def age_car():
+    rng = np.random.default_rng(2)
+    boundaries = [0, 199, 200, 201, 359, 360, 361, 499, 500, 501, 5000]
+    return pd.Series(np.concatenate([boundaries, rng.integers(0, 1500, 5000)]), name='AGE_CAR')
+
+
+def test_segment_codes_match_apply(age_car):
+    fe = FeatureEngineer(verbose=False)
+    np.testing.assert_array_equal(fe.segment_codes(age_car), age_car.apply(segment_age_car).to_numpy())
+
+    # NaN compares False everywhere, so the old rule put it in the last segment
+    with_nan = age_car.astype('float64')
+    with_nan[:20:3] = np.nan
+    np.testing.assert_array_equal(fe.segment_codes(with_nan), with_nan.apply(segment_age_car).to_numpy())
+
+
+def test_one_hot_matches_get_dummies(age_car):
+    fe = FeatureEngineer(verbose=False)
+    result = fe.create_age_car_segments(age_car.to_frame(), one_hot=True)
+    expected = pd.get_dummies(age_car.apply(segment_age_car), prefix='SEGMENT')
+
+    assert result['AGE_CAR_SEGMENT'].tolist() == age_car.apply(segment_age_car).tolist()
+    for column in expected.columns:
+        np.testing.assert_array_equal(result[column].to_numpy(), expected[column].to_numpy())
+
+
+def test_custom_thresholds_are_sorted():
+    fe = FeatureEngineer(age_car_thresholds=[300, 100], verbose=False)
+    assert fe.segment_codes([50, 100, 250, 300, 400]).tolist() == [1, 2, 2, 3, 3]
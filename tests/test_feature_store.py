@@ -0,0 +1,70 @@
+"""
+Tests for incremental feature recompute through the feature store
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from feature_engineering import FeatureEngineer  # noqa: E402
+from feature_store import FeatureStore  # noqa: E402
+
+
+pytest.importorskip('pyarrow')
+
+
+def make_raw(ids, seed):
+    rng = np.random.default_rng(seed)
+    rows = len(ids)
+    return pd.DataFrame({
+        'ID': ids,
+        'CURR_AGE': rng.integers(18, 80, rows),
+        'GENDER': rng.choice(['M', 'F'], rows),
+        'ANN_INCOME': rng.integers(300_000, 3_000_000, rows),
+        'AGE_CAR': rng.integers(0, 1500, rows),
+        'PURCHASE': rng.integers(0, 2, rows),
+    })
+
+
+def test_delta_matches_full_recompute(tmp_path):
+    store = FeatureStore(tmp_path / 'store')
+    fe = FeatureEngineer(verbose=False, feature_store=store)
+    first = make_raw([f'J{i:04d}' for i in range(400)], seed=0)
+    fe.prepare_japanese_features(first)
+
+    # Change some rows, drop others, append new IDs and reorder
+    second = first.copy()
+    second.loc[10:19, 'AGE_CAR'] += 250
+    second.loc[30:34, 'GENDER'] = second.loc[30:34, 'GENDER'].map({'M': 'F', 'F': 'M'})
+    second = pd.concat([second.drop(index=range(50, 80)),
+                        make_raw([f'J{i:04d}' for i in range(400, 440)], seed=1)])
+    second = second.sample(frac=1, random_state=2).reset_index(drop=True)
+
+    incremental = fe.prepare_japanese_features(second)
+    assert store.last_update == {'market': 'japanese', 'rows': 410, 'reused': 355,
+                                 'new': 40, 'changed': 15, 'deleted': 30}
+
+    expected = FeatureEngineer(verbose=False).prepare_japanese_features(second)
+    pd.testing.assert_frame_equal(incremental, expected)
+
+    # A rerun on the same extract is served entirely from the store
+    pd.testing.assert_frame_equal(fe.prepare_japanese_features(second), expected)
+    assert store.last_update['reused'] == 410
+
+
+def test_config_change_forces_full_recompute(tmp_path):
+    store = FeatureStore(tmp_path / 'store')
+    raw = make_raw([f'J{i:04d}' for i in range(200)], seed=3)
+    FeatureEngineer(verbose=False, feature_store=store).prepare_japanese_features(raw)
+
+    thresholds = [150, 300, 450]
+    incremental = FeatureEngineer(verbose=False, feature_store=store,
+                                  age_car_thresholds=thresholds).prepare_japanese_features(raw)
+    assert store.last_update['reused'] == 0
+    expected = FeatureEngineer(verbose=False, age_car_thresholds=thresholds).prepare_japanese_features(raw)
+    pd.testing.assert_frame_equal(incremental, expected)
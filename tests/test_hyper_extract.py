@@ -0,0 +1,65 @@
+"""
+Round-trip tests for the Hyper extract writer (skipped without tableauhyperapi)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+pytest.importorskip('tableauhyperapi')
+
+from hyper_extract import HyperExtractWriter, table_definition, verify_extract  # noqa: E402
+
+
+@pytest.fixture
+def feed():
+    return pd.DataFrame({
+        'ID': ['A1', 'A2', 'A3'],
+        'CURR_AGE': np.array([25, 41, 67], dtype='int16'),
+        'ANN_INCOME': [1_200_000, 850_000, 2_400_000],
+        'PURCHASE_PROBABILITY': [0.12, np.nan, 0.97],
+        'SEGMENT_1': [True, False, False],
+        'AGE_GROUP': pd.Categorical(['<30', '40-50', None], categories=['<30', '40-50', '60+']),
+        'SEGMENT_LABEL': ['Segment 1 (<200 days)', '', 'Segment 4 (>500 days)'],
+        'DT_MAINT': pd.to_datetime(['2018-04-20', '2019-01-02', '2017-11-30']),
+    })
+
+
+def test_extract_round_trips(feed, tmp_path):
+    with HyperExtractWriter() as writer:
+        path = writer.write(feed, tmp_path / 'feed')
+        assert path.suffix == '.hyper'
+        assert verify_extract(feed, path, writer) == []
+        restored, types = writer.read(path)
+
+    # Empty labels stay empty strings, NA becomes NULL
+    assert restored['SEGMENT_LABEL'].tolist()[1] == ''
+    assert pd.isna(restored['AGE_GROUP'].tolist()[2])
+    assert types['CURR_AGE'] == 'SMALL_INT'
+    assert types['SEGMENT_1'] == 'BOOL'
+
+
+def test_nullability_follows_copy_null_marker(feed):
+    nullable = {column.name.unescaped: column.nullability for column in table_definition(feed).columns}
+    assert str(nullable['SEGMENT_LABEL']) == str(nullable['ID'])
+    assert str(nullable['AGE_GROUP']) != str(nullable['ID'])
+    assert str(nullable['PURCHASE_PROBABILITY']) != str(nullable['ID'])
+
+
+def test_writer_shares_one_process(feed, tmp_path):
+    with HyperExtractWriter() as writer:
+        writer.write(feed, tmp_path / 'first')
+        process = writer._process
+        writer.write(feed, tmp_path / 'second')
+        assert writer._process is process
+    assert writer._process is None
+
+
+def test_writer_requires_context_manager(feed, tmp_path):
+    with pytest.raises(RuntimeError):
+        HyperExtractWriter().write(feed, tmp_path / 'feed')
@@ -0,0 +1,90 @@
+"""
+Tests for the cached, warm-started hyperparameter search
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import GridSearchCV, StratifiedKFold
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from hyperparameter_search import LogisticRegressionSearch  # noqa: E402
+
+
+# The repo grid still passes penalty='l2', deprecated in recent sklearn
+pytestmark = pytest.mark.filterwarnings("ignore:'penalty' was deprecated:FutureWarning")
+
+GRID = {'C': [0.01, 0.1, 1.0, 10.0, 100.0], 'penalty': ['l2'], 'solver': ['lbfgs']}
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(3)
+    rows = 1500
+    X = pd.DataFrame({
+        'CURR_AGE': rng.integers(18, 80, rows).astype('float64'),
+        'ANN_INCOME': rng.normal(1.5e6, 5e5, rows),
+        'GENDER_M': rng.integers(0, 2, rows).astype('float64'),
+    })
+    logit = 0.04 * (X['CURR_AGE'] - 45) + 1.5e-6 * (X['ANN_INCOME'] - 1.5e6) + 0.3 * X['GENDER_M']
+    y = pd.Series((rng.random(rows) < 1 / (1 + np.exp(-logit))).astype(int))
+    return X, y
+
+
+def test_winner_and_coefficients_match_grid_search(data):
+    X, y = data
+    search = LogisticRegressionSearch(GRID, scale=True)
+    result = search.fit(X, y)
+
+    reference = GridSearchCV(
+        make_pipeline(StandardScaler(), LogisticRegression(random_state=42, max_iter=1000)),
+        {f'logisticregression__{name}': values for name, values in GRID.items()},
+        cv=5, scoring='roc_auc',
+    ).fit(X, y)
+
+    assert result.best_params['C'] == reference.best_params_['logisticregression__C']
+    np.testing.assert_allclose(result.results['mean_score'], reference.cv_results_['mean_test_score'],
+                               atol=1e-4)
+    np.testing.assert_allclose(search.best_estimator_.coef_, reference.best_estimator_[-1].coef_,
+                               rtol=1e-6)
+
+
+def test_cold_search_matches_grid_search_exactly(data):
+    X, y = data
+    result = LogisticRegressionSearch(GRID, scale=True, warm_start=False).fit(X, y)
+    reference = GridSearchCV(
+        make_pipeline(StandardScaler(), LogisticRegression(random_state=42, max_iter=1000)),
+        {'logisticregression__C': GRID['C']}, cv=5, scoring='roc_auc',
+    ).fit(X, y)
+    np.testing.assert_allclose(result.results['mean_score'], reference.cv_results_['mean_test_score'],
+                               rtol=1e-12)
+
+
+def test_cache_is_keyed_on_fold_indices(data):
+    X, y = data
+    search = LogisticRegressionSearch(GRID, scale=True)
+    search.fit(X, y)
+    rerun = search.fit(X, y)
+    assert (rerun.cache_hits, rerun.fits) == (25, 0)
+
+    shuffled = list(StratifiedKFold(n_splits=5, shuffle=True, random_state=1).split(X, y))
+    moved = search.fit(X, y, folds=shuffled)
+    assert moved.cache_hits == 0
+    fresh = LogisticRegressionSearch(GRID, scale=True).fit(X, y, folds=shuffled)
+    np.testing.assert_array_equal(moved.results['mean_score'], fresh.results['mean_score'])
+
+
+def test_cache_is_keyed_on_warm_start_chain(data):
+    X, y = data
+    search = LogisticRegressionSearch(GRID, scale=True)
+    search.fit(X, y)
+    # C=1.0 reached through [0.1] rather than [0.01, 0.1] is a different fit
+    search.param_grid = {**GRID, 'C': [0.1, 1.0]}
+    assert search.fit(X, y).cache_hits == 0
@@ -0,0 +1,83 @@
+"""
+Tests for out-of-core training against the in-memory model
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from feature_engineering import FeatureEngineer  # noqa: E402
+from incremental_training import IncrementalTrainer  # noqa: E402
+
+
+FEATURES = ['CURR_AGE', 'ANN_INCOME', 'GENDER_M', 'SEGMENT_1', 'SEGMENT_2', 'SEGMENT_3', 'SEGMENT_4']
+
+
+@pytest.fixture
+def raw_file(tmp_path):
+    rng = np.random.default_rng(5)
+    rows = 2000
+    raw = pd.DataFrame({
+        'ID': [f'J{i:05d}' for i in range(rows)],
+        'CURR_AGE': rng.integers(18, 80, rows),
+        'GENDER': rng.choice(['M', 'F'], rows),
+        'ANN_INCOME': rng.integers(300_000, 3_000_000, rows),
+        'AGE_CAR': rng.integers(0, 1500, rows),
+    })
+    logit = 0.03 * (raw['CURR_AGE'] - 45) + 1e-6 * (raw['ANN_INCOME'] - 1.6e6) - 0.001 * (raw['AGE_CAR'] - 700)
+    raw['PURCHASE'] = (rng.random(rows) < 1 / (1 + np.exp(-logit))).astype(int)
+    path = tmp_path / 'japanese_raw.csv'
+    raw.to_csv(path, index=False)
+    return path
+
+
+def in_memory(path, C, rows=None):
+    features = FeatureEngineer(verbose=False).build_features(pd.read_csv(path))
+    X = features[FEATURES]
+    if rows is not None:
+        features = features[rows]
+    scaler = StandardScaler().fit(features[FEATURES])
+    model = LogisticRegression(C=C, tol=1e-10, max_iter=1000).fit(
+        scaler.transform(features[FEATURES]), features['PURCHASE']
+    )
+    return scaler, model, X
+
+
+def probabilities(scaler, model, X):
+    return model.predict_proba(scaler.transform(X))[:, 1]
+
+
+@pytest.mark.parametrize('C', [0.01, 1.0])
+def test_lbfgs_matches_in_memory_logistic_regression(raw_file, C):
+    trainer = IncrementalTrainer(FEATURES, C=C, chunk_size=300, max_epochs=500, tol=1e-10,
+                                 verbose=False).fit(raw_file)
+    scaler, model, X = in_memory(raw_file, C)
+
+    np.testing.assert_allclose(trainer.scaler.mean_, scaler.mean_, rtol=1e-12)
+    np.testing.assert_allclose(trainer.scaler.scale_, scaler.scale_, rtol=1e-9)
+    # The four segment dummies sum to one, so single coefficients are only
+    # weakly determined; the fitted probabilities are not
+    np.testing.assert_allclose(trainer.model.coef_, model.coef_, atol=1e-5)
+    np.testing.assert_allclose(trainer.model.intercept_, model.intercept_, atol=1e-5)
+    np.testing.assert_allclose(probabilities(trainer.scaler, trainer.model, X),
+                               probabilities(scaler, model, X), atol=1e-7)
+
+
+def test_holdout_rows_are_left_out_of_training(raw_file):
+    trainer = IncrementalTrainer(FEATURES, C=1.0, chunk_size=300, max_epochs=500, tol=1e-10,
+                                 validation_fraction=0.2, verbose=False).fit(raw_file)
+    train = trainer._training_mask(np.arange(2000))
+    scaler, model, X = in_memory(raw_file, 1.0, rows=train)
+
+    assert trainer.n_rows == train.sum()
+    assert trainer.validation['rows'] == (~train).sum()
+    np.testing.assert_allclose(trainer.scaler.mean_, scaler.mean_, rtol=1e-12)
+    np.testing.assert_allclose(probabilities(trainer.scaler, trainer.model, X),
+                               probabilities(scaler, model, X), atol=1e-7)
@@ -0,0 +1,56 @@
+"""
+Tests for out-of-core Indian market scoring
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+
+from feature_engineering import FeatureEngineer  # noqa: E402
+from indian_market_predictor import IndianMarketPredictor  # noqa: E402
+
+
+@pytest.fixture
+def raw_file(tmp_path):
+    rng = np.random.default_rng(7)
+    rows = 300
+    dates = pd.Timestamp('2017-01-01') + pd.to_timedelta(rng.integers(0, 700, rows), unit='D')
+    raw = pd.DataFrame({
+        'ID': [f'P{i:04d}' for i in range(rows)],
+        'CURR_AGE': rng.integers(18, 80, rows),
+        'GENDER': rng.choice(['M', 'F'], rows),
+        'ANN_INCOME': rng.integers(300_000, 3_000_000, rows),
+        'DT_MAINT': [f'{d.month}/{d.day}/{d.year}' for d in dates],
+    })
+    # Only the last chunk has a missing date; the first pins the dtypes
+    raw.loc[250, 'DT_MAINT'] = None
+    path = tmp_path / 'indian_raw.csv'
+    raw.to_csv(path, index=False)
+    return path
+
+
+def test_chunked_matches_in_memory_with_missing_dates(raw_file, tmp_path):
+    predictor = IndianMarketPredictor(model_dir=ROOT / 'models')
+    result = predictor.predict_file(raw_file, output_dir=tmp_path, tableau_dir=tmp_path, chunk_size=100)
+    streamed = pd.read_csv(tmp_path / 'indian_predictions.csv')
+    tableau = pd.read_csv(tmp_path / 'indian_market_predictions.csv')
+
+    features = FeatureEngineer(verbose=False).build_features(
+        pd.read_csv(raw_file), date_column='DT_MAINT'
+    )
+    expected = predictor.predict_indian_market(features)
+
+    assert result['chunks'] == 3
+    assert streamed['AGE_CAR'].isna().sum() == 1
+    np.testing.assert_allclose(streamed['AGE_CAR'], expected['AGE_CAR'].astype('float64'))
+    np.testing.assert_array_equal(streamed['PURCHASE_PREDICTION'], expected['PURCHASE_PREDICTION'])
+    np.testing.assert_allclose(streamed['PURCHASE_PROBABILITY'], expected['PURCHASE_PROBABILITY'],
+                               rtol=1e-12)
+    np.testing.assert_allclose(tableau['PURCHASE_PROBABILITY'], streamed['PURCHASE_PROBABILITY'])
+    assert result['assessment']['predicted_purchases'] == int(expected['PURCHASE_PREDICTION'].sum())
@@ -0,0 +1,74 @@
+"""
+Tests for the single-pass, mergeable market aggregates
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from market_aggregates import (  # noqa: E402
+    AGE_BINS, AGE_LABELS, GROUPS, MarketAggregates, aggregate_predictions, income_quartile_edges
+)
+
+
+@pytest.fixture
+def scored():
+    rng = np.random.default_rng(11)
+    rows = 2000
+    probabilities = rng.random(rows)
+    return pd.DataFrame({
+        'CURR_AGE': rng.integers(18, 95, rows),
+        'GENDER': rng.choice(['M', 'F'], rows),
+        'ANN_INCOME': rng.integers(200_000, 4_000_000, rows),
+        'AGE_CAR_SEGMENT': rng.integers(1, 5, rows),
+        'PURCHASE_PROBABILITY': probabilities,
+        'PURCHASE_PREDICTION': (probabilities > 0.5).astype(int),
+    })
+
+
+def test_merged_chunks_equal_single_pass(scored):
+    edges = income_quartile_edges(scored['ANN_INCOME'])
+    whole = aggregate_predictions(scored, income_edges=edges)
+    merged = MarketAggregates.merge_all(
+        aggregate_predictions(scored.iloc[start:start + 300], income_edges=edges)
+        for start in range(0, len(scored), 300)
+    )
+
+    assert (merged.rows, merged.purchases) == (whole.rows, whole.purchases)
+    np.testing.assert_array_equal(merged.band_counts, whole.band_counts)
+    for name in GROUPS:
+        pd.testing.assert_frame_equal(merged.group_table(name), whole.group_table(name))
+
+
+def test_groups_match_pandas(scored):
+    result = aggregate_predictions(scored)
+    age_group = pd.cut(scored['CURR_AGE'], bins=list(AGE_BINS), labels=list(AGE_LABELS))
+    expected = scored.groupby(age_group, observed=False)['PURCHASE_PREDICTION'].agg(['count', 'sum'])
+    table = result.group_table('AGE_GROUP')['PURCHASE_PREDICTION']
+    np.testing.assert_array_equal(table['count'], expected['count'])
+    np.testing.assert_array_equal(table['sum'], expected['sum'])
+
+    quartile = pd.qcut(scored['ANN_INCOME'], q=4)
+    expected = scored.groupby(quartile, observed=False)['PURCHASE_PREDICTION'].agg(['count', 'sum'])
+    table = result.group_table('INCOME_QUARTILE')['PURCHASE_PREDICTION']
+    np.testing.assert_array_equal(table['count'], expected['count'])
+    np.testing.assert_array_equal(table['sum'], expected['sum'])
+
+
+def test_non_finite_probabilities_fall_in_no_band(scored):
+    scored.loc[:9, 'PURCHASE_PROBABILITY'] = np.nan
+    scored.loc[10:14, 'PURCHASE_PROBABILITY'] = np.inf
+    kept = scored['PURCHASE_PROBABILITY'].to_numpy()[15:]
+
+    counts = aggregate_predictions(scored, groups=()).confidence_counts
+    assert counts == {
+        'below_low': int((kept < 0.3).sum()),
+        'low': int(((kept >= 0.3) & (kept < 0.5)).sum()),
+        'medium': int(((kept >= 0.5) & (kept < 0.7)).sum()),
+        'high': int((kept >= 0.7).sum()),
+    }
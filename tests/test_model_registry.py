@@ -0,0 +1,83 @@
+"""
+Tests for the versioned model registry
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from model_registry import ModelRegistry, training_data_hash  # noqa: E402
+
+
+FEATURES = ['CURR_AGE', 'ANN_INCOME', 'GENDER_M']
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(11)
+    X = np.column_stack([rng.integers(18, 80, 400), rng.normal(1.5e6, 5e5, 400), rng.integers(0, 2, 400)])
+    y = (X[:, 0] / 80 + X[:, 1] / 3e6 + rng.normal(0, 0.3, 400) > 1).astype(int)
+    return X, y
+
+
+def fit(X, y, C):
+    scaler = StandardScaler().fit(X)
+    return LogisticRegression(C=C).fit(scaler.transform(X), y), scaler
+
+
+def test_publish_dedup_and_rollback(data, tmp_path):
+    X, y = data
+    registry = ModelRegistry(tmp_path)
+    data_hash = training_data_hash(X, y)
+    model, scaler = fit(X, y, 1.0)
+
+    assert registry.publish(model, scaler, FEATURES, data_hash=data_hash) == 'v0001'
+    # Same model, scaler, features and data: reuse the version; metrics are not identity
+    assert registry.publish(model, scaler, FEATURES, data_hash=data_hash, metrics={'auc': 0.9}) == 'v0001'
+    assert registry.versions() == ['v0001']
+
+    other, other_scaler = fit(X, y, 0.01)
+    assert registry.publish(other, other_scaler, FEATURES, data_hash=data_hash) == 'v0002'
+    assert registry.current() == 'v0002'
+    # A different training set is a different version even for the same weights
+    assert registry.publish(other, other_scaler, FEATURES, data_hash='other', activate=False) == 'v0003'
+    assert registry.current() == 'v0002'
+
+    assert registry.rollback() == 'v0001'
+    assert registry.current() == 'v0001'
+    with pytest.raises(ValueError):
+        registry.rollback()
+    registry.activate('v0003')
+    assert registry.rollback(to='v0002') == 'v0002'
+    with pytest.raises(FileNotFoundError):
+        registry.activate('v0009')
+    assert registry.versions() == ['v0001', 'v0002', 'v0003']
+
+
+def test_versions_score_like_the_published_model(data, tmp_path):
+    X, y = data
+    registry = ModelRegistry(tmp_path)
+    first = fit(X, y, 1.0)
+    second = fit(X, y, 0.01)
+    registry.publish(*first, FEATURES)
+    registry.publish(*second, FEATURES)
+
+    for version, (model, scaler) in (('v0001', first), ('v0002', second)):
+        scorer, manifest = registry.load_scorer(version)
+        assert manifest['version'] == version
+        np.testing.assert_allclose(scorer.predict_proba(X), model.predict_proba(scaler.transform(X))[:, 1],
+                                   rtol=1e-12)
+
+    registry.rollback()
+    scorer, manifest = registry.load_scorer()
+    assert manifest['version'] == 'v0001'
+    np.testing.assert_allclose(scorer.predict_proba(X), first[0].predict_proba(first[1].transform(X))[:, 1],
+                               rtol=1e-12)
+    # Published versions are immutable
+    assert all(not path.stat().st_mode & 0o222 for path in registry.version_dir('v0001').iterdir())
@@ -0,0 +1,62 @@
+"""
+Tests for format lookup across tables stored in several formats
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+pytest.importorskip('pyarrow')
+
+from chunked_io import ChunkWriter  # noqa: E402
+from storage import find_table, read_table, write_table  # noqa: E402
+
+
+@pytest.fixture
+def tables():
+    old = pd.DataFrame({'ID': ['A', 'B', 'C'], 'AGE_CAR': [120, 340, 610],
+                        'GENDER': pd.Categorical(['M', 'F', 'M'])})
+    return old, old.assign(AGE_CAR=[90, 410, 700])
+
+
+def test_stale_columnar_table_does_not_shadow_newer_csv(tables, tmp_path):
+    old, new = tables
+    write_table(old, tmp_path / 'table', 'parquet')
+    write_table(new, tmp_path / 'table', 'csv')
+
+    assert find_table(tmp_path / 'table').suffix == '.csv'
+    assert read_table(tmp_path / 'table')['AGE_CAR'].tolist() == [90, 410, 700]
+    # An explicit format still reads the older file
+    assert read_table(tmp_path / 'table', fmt='parquet')['AGE_CAR'].tolist() == [120, 340, 610]
+
+
+def test_copies_of_the_same_data_prefer_columnar(tables, tmp_path):
+    _, new = tables
+    write_table(new, tmp_path / 'table', 'parquet')
+    write_table(new, tmp_path / 'table', 'csv')
+    assert find_table(tmp_path / 'table').suffix == '.parquet'
+
+
+def test_chunked_writes_are_recorded(tables, tmp_path):
+    old, new = tables
+    write_table(old, tmp_path / 'table', 'csv')
+    with ChunkWriter(tmp_path / 'table.parquet') as writer:
+        writer.write(new.iloc[:2])
+        writer.write(new.iloc[2:])
+    write_table(new, tmp_path / 'table', 'feather')
+
+    # The chunked Parquet file and the Feather copy hold the same data
+    assert find_table(tmp_path / 'table', 'csv').exists()
+    assert find_table(tmp_path / 'table').suffix in ('.parquet', '.feather')
+    assert read_table(tmp_path / 'table')['AGE_CAR'].tolist() == [90, 410, 700]
+
+
+def test_unrecorded_files_keep_columnar_precedence(tables, tmp_path):
+    old, _ = tables
+    old.to_csv(tmp_path / 'table.csv', index=False)
+    old.to_parquet(tmp_path / 'table.parquet', index=False)
+    assert find_table(tmp_path / 'table').suffix == '.parquet'
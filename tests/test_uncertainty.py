@@ -0,0 +1,52 @@
+"""
+Tests for the vectorized Monte Carlo sales simulation
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from uncertainty import purchase_thresholds, simulate_purchase_totals  # noqa: E402
+
+
+@pytest.fixture
+def probabilities():
+    return np.random.default_rng(5).beta(2, 5, 3000)
+
+
+def test_results_do_not_depend_on_n_workers(probabilities):
+    # A small block size gives several blocks to spread over the workers
+    kwargs = dict(n_replicates=600, target_sales=850, max_block_mb=0.5, random_state=9)
+    serial = simulate_purchase_totals(probabilities, n_workers=1, **kwargs)
+    parallel = simulate_purchase_totals(probabilities, n_workers=3, **kwargs)
+
+    np.testing.assert_array_equal(serial.totals, parallel.totals)
+    assert serial.quantiles == parallel.quantiles
+    assert abs(serial.mean - probabilities.sum()) < 4 * serial.std / np.sqrt(serial.n_replicates)
+
+
+def test_bootstrap_rows_are_deterministic(probabilities):
+    rows = np.vstack([probabilities, probabilities[::-1] * 0.5])
+    first = simulate_purchase_totals(rows, n_replicates=200, max_block_mb=0.5, n_workers=2)
+    second = simulate_purchase_totals(rows, n_replicates=200, max_block_mb=0.5, n_workers=1)
+    np.testing.assert_array_equal(first.totals, second.totals)
+    assert first.n_bootstrap == 2
+
+
+def test_certain_and_impossible_purchases():
+    thresholds, certain = purchase_thresholds([0.0, 1.0, 1.0, 0.5])
+    assert thresholds.tolist() == [[0, 0, 0, 2**31]]
+    assert certain.tolist() == [2]
+    result = simulate_purchase_totals([0.0, 1.0, 1.0], n_replicates=50)
+    assert set(result.totals.tolist()) == {2}
+
+
+@pytest.mark.parametrize('bad', [np.nan, np.inf, -0.1, 1.5])
+def test_rejects_invalid_probabilities(probabilities, bad):
+    probabilities[10] = bad
+    with pytest.raises(ValueError, match='finite and in'):
+        simulate_purchase_totals(probabilities, n_replicates=10)